@@ -8,6 +8,7 @@ Note:
 """
 import numpy as np
 from . import stats
+from . import idtxl_utils as utils
 from .single_process_analysis import SingleProcessAnalysis
 from .estimator import find_estimator
 from .results import ResultsSingleProcessAnalysis
@@ -95,6 +96,17 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 - fdr_correction : bool [optional] - correct results on the
                   network level, see documentation of stats.ais_fdr() for
                   details (default=True)
+                - n_workers : int [optional] - number of worker processes; if
+                  larger than 1, processes are analysed in parallel in a pool
+                  of worker processes, data are passed to workers in shared
+                  memory (default=1); unless set explicitly, the estimator
+                  setting num_threads is set to the no. CPUs divided by
+                  n_workers
+                - checkpoint_dir : str [optional] - directory to which
+                  the result of each process is saved (default=None)
+                - resume : bool [optional] - resume an interrupted
+                  analysis from checkpoint_dir, processes with saved
+                  results are skipped (default=False)
 
             data : Data instance
                 raw data for analysis
@@ -112,6 +124,9 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         # Set defaults for AIS estimation.
         settings.setdefault('verbose', True)
         settings.setdefault('fdr_correction', True)
+        settings.setdefault('n_workers', 1)
+        settings.setdefault('checkpoint_dir', None)
+        settings.setdefault('resume', False)
 
         # Check provided processes for analysis.
         if processes == 'all':
@@ -127,12 +142,14 @@ class ActiveInformationStorage(SingleProcessAnalysis):
             n_nodes=data.n_processes,
             n_realisations=data.n_realisations(),
             normalised=data.normalise)
+        res_targets = self._map_targets(
+            'analyse_single_process', settings, data,
+            [(p,) for p in processes])
         for t in range(len(processes)):
             if settings['verbose']:
                 print('\n####### analysing process {0} of {1}'.format(
                                                 processes[t], processes))
-            res_single = self.analyse_single_process(
-                settings, data, processes[t])
+            res_single = next(res_targets)
             results.combine_results(res_single)
 
         # Get no. realisations actually used for estimation from single target
@@ -194,6 +211,17 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                   by shuffling realisations in time instead of shuffling
                   replications; see documentation of Data.permute_samples() for
                   further settings (default=False)
+                - sequential_perm : bool [optional] - stop permutation tests
+                  as soon as a test is clearly non-significant, the no.
+                  permutations used is reported in the results, see
+                  stats._permutation_test() for further settings
+                  (default=False)
+                - seed : int | numpy.random.SeedSequence [optional] - seed
+                  for reproducible surrogate creation; an independent random
+                  stream is derived from the seed for each process, such that
+                  results do not depend on the order in which processes are
+                  analysed; if None, the global NumPy random state is used
+                  (default=None)
                 - verbose : bool [optional] - toggle console output
                   (default=True)
 
@@ -234,7 +262,8 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 'selected_vars': self._idx_to_lag(self.selected_vars_full),
                 'ais': self.ais,
                 'ais_pval': self.pvalue,
-                'ais_sign': self.sign
+                'ais_sign': self.sign,
+                'ais_n_perm': self._n_perm_achieved.get('mi')
             })
         self._reset()  # remove realisations and min_stats surrogate table
         return results
@@ -247,6 +276,7 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         self.settings.setdefault('add_conditionals', None)
         self.settings.setdefault('tau', 1)
         self.settings.setdefault('local_values', False)
+        self.settings.setdefault('seed', None)
 
         if type(self.settings['max_lag']) is not int or (
                 self.settings['max_lag'] < 0):
@@ -274,6 +304,7 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         except KeyError:
             raise RuntimeError('Please provide an estimator class or name!')
         self._cmi_estimator = EstimatorClass(self.settings)
+        utils.check_precision(self._cmi_estimator, data)
 
         # Initialise class attributes.
         self._min_stats_surr_table = None
@@ -289,6 +320,10 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                                                         data.n_processes))
         self.process = process
 
+        # Derive the random stream for surrogate creation for this process.
+        self._seed_sequence = utils.seed_sequence(self.settings['seed'],
+                                                  self.process)
+
         # Check provided search depths for source and target
         assert(data.n_samples >= self.settings['max_lag'] + 1), (
             'Not enough samples in data ({0}) to allow for the chosen maximum '
@@ -429,11 +464,11 @@ class ActiveInformationStorage(SingleProcessAnalysis):
             candidate_realisations = np.empty(
                 (data.n_realisations(self.current_value) *
                     len(self.selected_vars_sources),
-                    1)).astype(data.data_type)
+                    1), dtype=data.data_type)
             conditional_realisations = np.empty(
                 (data.n_realisations(self.current_value) *
                  len(self.selected_vars_sources),
-                 cond_dim)).astype(data.data_type)
+                 cond_dim), dtype=data.data_type)
             i_1 = 0
             i_2 = data.n_realisations(self.current_value)
             for candidate in self.selected_vars_sources:
@@ -1,8 +1,21 @@
 """Provide data structures for IDTxl analysis."""
+from collections import OrderedDict
+import copy
+import os
+import tempfile
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import sparse
 from . import idtxl_utils as utils
 
 VERBOSE = False
+# Max. number of noise values drawn at once when simulating VAR processes.
+VAR_NOISE_BLOCK_ENTRIES = 2**20
+# Max. fraction of non-zero VAR coefficients for using sparse matrix products.
+VAR_SPARSE_DENSITY = 0.1
+# Directory for memory blocks shared between processes, use a RAM-backed file
+# system if available.
+SHARED_MEMORY_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
 
 
 class Data():
@@ -37,9 +50,56 @@ class Data():
         Realisations are stored as attribute 'data'. This can't be set
         directly, but only via the method 'set_data'
 
+    Note:
+        Realisations retrieved via 'get_realisations' can optionally be
+        cached, such that repeated requests for the same variables do not
+        copy the data again (see 'enable_realisation_cache').
+
+    Note:
+        Data that do not fit into memory can be provided as memory-mapped
+        array (np.memmap or the file name of a .npy file) or as h5py dataset.
+        These data are not loaded into memory, realisations are read from
+        disk when requested. Normalisation statistics are computed in a single
+        pass over the data and normalisation is applied to retrieved
+        realisations, attribute 'data' holds the raw data in this case.
+
+        >>> data = Data('recording.npy', dim_order='psr')
+        >>>
+        >>> f = h5py.File('recording.h5', 'r')
+        >>> data = Data(f['meg'], dim_order='spr')
+
+    Note:
+        Data held in memory can grow by appending samples or replications
+        (see 'append_samples' and 'append_replications'). Appended data are
+        written into a buffer that grows geometrically, such that existing
+        data are not copied on each append. Normalisation statistics are
+        updated incrementally and, after the first append, normalisation is
+        applied to retrieved realisations.
+
+        >>> data = Data(first_trials, dim_order='psr')
+        >>> data.append_replications(new_trials, dim_order='psr')
+
+    Note:
+        A Data object restricted to a subset of processes, samples, or
+        replications can be created via 'subset'. The subset shares data and
+        normalisation statistics with the original object, no data are
+        copied.
+
+    Note:
+        To pass data to worker processes without copying, data can be moved
+        into shared memory via 'share_memory'. When pickled, the Data object
+        then only holds a handle to the shared memory block and unpickled
+        objects attach to the same memory block, such that memory use does
+        not grow with the number of workers.
+
+        >>> data.share_memory()
+        >>> with multiprocessing.Pool(4) as pool:
+        >>>     results = pool.map(analyse, [(data, t) for t in targets])
+
     Args:
-        data : numpy array [optional]
-            1/2/3-dimensional array with raw data
+        data : numpy array | numpy memmap | h5py dataset | str [optional]
+            1/2/3-dimensional array with raw data or name of a .npy file,
+            which is memory-mapped
         dim_order : string [optional]
             order of dimensions, accepts any combination of the characters
             'p', 's', and 'r' for processes, samples, and replications; must
@@ -48,10 +108,16 @@ class Data():
             (default='psr')
         normalise : bool [optional]
             if True, data gets normalised per process (default=True)
+        dtype : numpy dtype [optional]
+            floating point precision in which data are stored and returned,
+            e.g., np.float32 to halve memory usage; if None, normalised data
+            are stored as np.float64 and data that are not normalised are
+            stored in their original type (default=None)
 
     Attributes:
         data : numpy array
-            realisations, can only be set via 'set_data' method
+            realisations, can only be set via 'set_data' method; for data on
+            disk, memory-mapped array or h5py dataset with raw realisations
         n_processes : int
             number of processes
         n_replications : int
@@ -60,11 +126,27 @@ class Data():
             number of samples in time
         normalise : bool
             if true, all data gets z-standardised per process
+        dtype : numpy dtype | None
+            requested precision of stored data
+        data_type : type
+            type of returned realisations
 
     """
 
-    def __init__(self, data=None, dim_order='psr', normalise=True):
+    def __init__(self, data=None, dim_order='psr', normalise=True,
+                 dtype=None):
         self.normalise = normalise
+        if dtype is not None:
+            dtype = np.dtype(dtype)
+            if not np.issubdtype(dtype, np.floating):
+                raise TypeError('dtype must be a floating point type.')
+        self.dtype = dtype
+        self._realisation_cache = None
+        self._normalisation = None
+        self._buffer = None
+        self._statistics = None
+        self._data_frame = None
+        self._shared = None
         if data is not None:
             self.set_data(data, dim_order)
 
@@ -128,24 +210,33 @@ class Data():
         """Overwrite data in an existing Data object.
 
         Args:
-            data : numpy array
-                1- to 3-dimensional array of realisations
+            data : numpy array | numpy memmap | h5py dataset | str
+                1- to 3-dimensional array of realisations or name of a .npy
+                file; memory-mapped arrays, .npy files, and h5py datasets are
+                not loaded into memory (see class documentation)
             dim_order : string
                 order of dimensions, accepts any combination of the characters
                 'p', 's', and 'r' for processes, samples, and replications;
                 must have the same length as number of dimensions in data
         """
+        if isinstance(data, str):
+            data = np.load(data, mmap_mode='r')
+        on_disk = (isinstance(data, np.memmap) or
+                   not isinstance(data, np.ndarray))
         if len(dim_order) > 3:
             raise RuntimeError('dim_order can not have more than three '
                                'entries')
-        if len(dim_order) != data.ndim:
+        if len(dim_order) != len(data.shape):
             raise RuntimeError('Data array dimension ({0}) and length of '
                                'dim_order ({1}) are not equal.'.format(
-                                           data.ndim, len(dim_order)))
+                                           len(data.shape), len(dim_order)))
 
         # Bring data into the order processes x samples x replications and set
         # set data.
-        data_ordered = self._reorder_data(data, dim_order)
+        if isinstance(data, np.ndarray):
+            data_ordered = self._reorder_data(data, dim_order)
+        else:
+            data_ordered = DatasetReader(data, dim_order)
         self._set_data_size(data_ordered)
         print('Adding data with properties: {0} processes, {1} samples, {2} '
               'replications'.format(self.n_processes, self.n_samples,
@@ -154,21 +245,118 @@ class Data():
             delattr(self, 'data')
         except AttributeError:
             pass
-        if self.normalise:
-            self.data = self._normalise_data(data_ordered)
-        else:
+        self._normalisation = None
+        self._buffer = None
+        self._statistics = None
+        self._data_frame = None
+        self._shared = None
+        if on_disk:
+            # Keep data on disk, compute normalisation statistics and check
+            # for nans in a single pass over the data. Normalisation is applied
+            # when realisations are retrieved.
             self.data = data_ordered
-        self.data_type = type(self.data[0, 0, 0])
+            mean, sd = self._get_data_statistics()
+            if self.normalise:
+                self._normalisation = (mean, sd)
+                self.data_type = np.float64
+            else:
+                self.data_type = self.data.dtype.type
+            if getattr(self, 'dtype', None) is not None:
+                self.data_type = self.dtype.type
+        else:
+            if getattr(self, 'dtype', None) is not None:
+                data_ordered = data_ordered.astype(self.dtype, copy=False)
+            if self.normalise:
+                self.data = self._normalise_data(data_ordered)
+            else:
+                self.data = data_ordered
+            self.data_type = type(self.data[0, 0, 0])
+            # Check for nans once when setting the data, such that
+            # realisations can be retrieved without further checks.
+            if np.issubdtype(self.data.dtype, np.inexact):
+                assert(not np.isnan(self.data).any()), (
+                    'There are nans in the data.')
+        # Cached realisations are invalid for the new data.
+        if getattr(self, '_realisation_cache', None) is not None:
+            self._realisation_cache.clear()
+
+    def _read_block(self, process, start, stop):
+        """Return raw data of a process as array [samples x replications]."""
+        if isinstance(self.data, np.ndarray):
+            return self.data[process, start:stop, :]
+        return self.data.read(process, start, stop)
+
+    def _get_data_statistics(self):
+        """Return mean and standard deviation of each process.
+
+        Compute statistics over samples and replications in a single pass over
+        the data, reading blocks of samples at a time and merging the
+        statistics of blocks (Chan et al., 1979). The standard deviation is
+        computed with denominator (N - 1) and is set to 1 for constant
+        processes (see utils.standardise). Check blocks for nans.
+        """
+        block_size = max(1, 2 ** 22 // self.n_replications)
+        mean = np.zeros(self.n_processes)
+        sd = np.ones(self.n_processes)
+        for process in range(self.n_processes):
+            n = 0
+            p_mean = 0.
+            p_m2 = 0.
+            for start in range(0, self.n_samples, block_size):
+                block = np.asarray(
+                    self._read_block(process, start, start + block_size),
+                    dtype=np.float64)
+                assert(not np.isnan(block).any()), (
+                    'There are nans in the data.')
+                n, p_mean, p_m2 = _merge_statistics(n, p_mean, p_m2, block)
+            mean[process], sd[process] = _get_mean_sd(n, p_mean, p_m2)
+        return mean, sd
+
+    def _apply_normalisation(self, realisations, processes):
+        """Normalise raw realisations of data on disk if requested.
+
+        Normalise realisations and convert them to the requested data type.
+
+        Args:
+            realisations : numpy array
+                raw realisations, last axis represents variables
+            processes : numpy array
+                process index for each variable
+
+        Returns:
+            numpy array
+                normalised realisations
+        """
+        normalisation = getattr(self, '_normalisation', None)
+        if normalisation is not None:
+            mean, sd = normalisation
+            realisations = (realisations - mean[processes]) / sd[processes]
+        return realisations.astype(self.data_type, copy=False)
 
     def _normalise_data(self, d):
-        """Z-standardise data separately for each process."""
-        d_standardised = np.empty(d.shape)
+        """Z-standardise data separately for each process.
+
+        Keep the mean and standard deviation used for standardisation, such
+        that appended data can be transformed accordingly (see _append).
+        """
+        dtype = getattr(self, 'dtype', None)
+        if dtype is None:
+            dtype = np.float64
+        d_standardised = np.empty(d.shape, dtype=dtype)
+        mean = np.zeros(self.n_processes)
+        sd = np.ones(self.n_processes)
         for process in range(self.n_processes):
-            s = utils.standardise(
-                            d[process, :, :].reshape(1, self.n_realisations()),
-                            dimension=1)
-            d_standardised[process, :, :] = s.reshape(self.n_samples,
-                                                      self.n_replications)
+            a = d[process, :, :].reshape(1, self.n_realisations())
+            mean[process] = a.mean(axis=1)[0]
+            # Don't divide by standard devitation if process is constant (see
+            # utils.standardise).
+            a_sd = a.std(axis=1, ddof=1)[0]
+            if not np.isclose(a_sd, 0):
+                sd[process] = a_sd
+            d_standardised[process, :, :] = (
+                (a - mean[process]) / sd[process]).reshape(
+                    self.n_samples, self.n_replications)
+        self._data_frame = (mean, sd)
         return d_standardised
 
     def _reorder_data(self, data, dim_order):
@@ -196,7 +384,274 @@ class Data():
         self.n_samples = data.shape[1]
         self.n_replications = data.shape[2]
 
-    def get_realisations(self, current_value, idx_list, shuffle=False):
+    def append_samples(self, data, dim_order='psr'):
+        """Append samples to the end of each replication.
+
+        Append samples in time to the data held by the Data object. The
+        appended data must contain the same number of processes and
+        replications as the existing data. If the Data object holds no data,
+        data are set via set_data.
+
+        Args:
+            data : numpy array
+                1- to 3-dimensional array of realisations
+            dim_order : string [optional]
+                order of dimensions, accepts any combination of the characters
+                'p', 's', and 'r' for processes, samples, and replications;
+                must have the same length as number of dimensions in data
+                (default='psr')
+        """
+        self._append(data, dim_order, axis=1)
+
+    def append_replications(self, data, dim_order='psr'):
+        """Append replications to the data.
+
+        Append replications (e.g., newly recorded trials) to the data held by
+        the Data object. The appended data must contain the same number of
+        processes and samples as the existing data. If the Data object holds
+        no data, data are set via set_data.
+
+        Args:
+            data : numpy array
+                1- to 3-dimensional array of realisations
+            dim_order : string [optional]
+                order of dimensions, accepts any combination of the characters
+                'p', 's', and 'r' for processes, samples, and replications;
+                must have the same length as number of dimensions in data
+                (default='psr')
+        """
+        self._append(data, dim_order, axis=2)
+
+    def _append(self, data, dim_order, axis):
+        """Append data along the samples (1) or replications (2) axis.
+
+        Existing data are kept as stored, i.e., normalised with the mean and
+        standard deviation of the data set via set_data (the data frame).
+        Appended data are transformed into the same frame and written into a
+        GrowableBuffer. Mean and sum of squared deviations of each process
+        are maintained in the data frame and merged with those of each
+        appended block (Chan et al., 1979). Normalisation with the updated
+        statistics is applied when realisations are retrieved.
+        """
+        if not hasattr(self, 'data'):
+            self.set_data(data, dim_order)
+            return
+        if (isinstance(self.data, np.memmap) or
+                not isinstance(self.data, np.ndarray)):
+            raise RuntimeError('Data can only be appended to data held in '
+                               'memory.')
+        data = np.asarray(data)
+        if len(dim_order) != data.ndim:
+            raise RuntimeError('Data array dimension ({0}) and length of '
+                               'dim_order ({1}) are not equal.'.format(
+                                           data.ndim, len(dim_order)))
+        data = self._reorder_data(data, dim_order)
+        fixed_axis = 3 - axis
+        if (data.shape[0] != self.n_processes or
+                data.shape[fixed_axis] != self.data.shape[fixed_axis]):
+            raise RuntimeError(
+                'Shape of appended data {0} does not match the data, which '
+                'has shape {1} (processes x samples x replications).'.format(
+                    data.shape, self.data.shape))
+        if np.issubdtype(data.dtype, np.inexact):
+            assert(not np.isnan(data).any()), 'There are nans in the data.'
+
+        # Transform data into the frame of the stored data.
+        if self._data_frame is not None:
+            mean, sd = self._data_frame
+            data = ((data - mean[:, np.newaxis, np.newaxis]) /
+                    sd[:, np.newaxis, np.newaxis])
+        if not np.can_cast(data.dtype, self.data.dtype, casting='same_kind'):
+            raise TypeError('Can not append data of type {0} to data of type '
+                            '{1}.'.format(data.dtype, self.data.dtype))
+        data = data.astype(self.data.dtype, copy=False)
+
+        if self.normalise:
+            if self._statistics is None:
+                self._statistics = _merge_statistics(
+                    0, np.zeros(self.n_processes), np.zeros(self.n_processes),
+                    self.data, axis=(1, 2))
+            self._statistics = _merge_statistics(*self._statistics, data,
+                                                 axis=(1, 2))
+            self._normalisation = _get_mean_sd(*self._statistics)
+
+        if self._buffer is None:
+            self._buffer = GrowableBuffer(self.data)
+        self._buffer.append(data, axis)
+        self._data = self._buffer.view
+        self._set_data_size(self.data)
+        # Cached realisations are invalid for the new data.
+        if getattr(self, '_realisation_cache', None) is not None:
+            self._realisation_cache.clear()
+
+    def subset(self, processes=None, replications=None, samples=None):
+        """Return a Data object holding a subset of the data.
+
+        Return a Data object restricted to a subset of processes, samples,
+        and replications, which can be used in any analysis. The subset
+        shares the data and the normalisation statistics of this object,
+        i.e., no data are copied and data are not normalised again. Processes
+        and replications in the subset are indexed in the order in which they
+        are requested, e.g., process processes[0] becomes process 0.
+
+        If processes and replications are given as equally spaced, increasing
+        indices, the subset's data are a view on the data of this object.
+        Otherwise, the subset reads blocks of data for single processes from
+        this object when realisations are requested (see SubsetReader).
+
+        Example:
+
+            >>> data = Data(np.random.rand(10, 1000, 20), 'psr')
+            >>> # Restrict analysis to three processes
+            >>> data_targets = data.subset(processes=[2, 5, 7])
+            >>> # Split replications into two folds
+            >>> data_fold_1 = data.subset(replications=range(10))
+            >>> data_fold_2 = data.subset(replications=range(10, 20))
+
+        Args:
+            processes : list of int [optional]
+                indices of processes in the subset (default=None, use all
+                processes)
+            replications : list of int [optional]
+                indices of replications in the subset (default=None, use all
+                replications)
+            samples : tuple of int [optional]
+                first and last (not included) sample in the subset
+                (default=None, use all samples)
+
+        Returns:
+            Data() instance
+                Data object holding the subset of data
+        """
+        if not hasattr(self, 'data'):
+            raise AttributeError('No data has been added to this Data() '
+                                 'instance.')
+        processes = self._check_subset_index(processes, self.n_processes,
+                                             'process')
+        replications = self._check_subset_index(
+            replications, self.n_replications, 'replication')
+        if samples is None:
+            samples = (0, self.n_samples)
+        if not 0 <= samples[0] < samples[1] <= self.n_samples:
+            raise RuntimeError('Requested samples {0} out of range, data '
+                               'contain {1} samples.'.format(
+                                   samples, self.n_samples))
+
+        process_slice = _index_to_slice(processes)
+        replication_slice = _index_to_slice(replications)
+        if (isinstance(self.data, np.ndarray) and
+                process_slice is not None and replication_slice is not None):
+            data = self.data[process_slice, samples[0]:samples[1],
+                             replication_slice]
+        else:
+            data = SubsetReader(self.data, processes, replications, samples)
+
+        subset = copy.copy(self)
+        subset._data = data
+        subset._set_data_size(data)
+        subset._realisation_cache = None
+        subset._buffer = None
+        subset._statistics = None
+        if self._normalisation is not None:
+            mean, sd = self._normalisation
+            subset._normalisation = (mean[processes], sd[processes])
+        if self._data_frame is not None:
+            mean, sd = self._data_frame
+            subset._data_frame = (mean[processes], sd[processes])
+        return subset
+
+    def share_memory(self):
+        """Move data into shared memory for passing data to other processes.
+
+        Copy data into a block of shared memory (see SharedBuffer). When the
+        Data object or a subset of it is pickled, e.g., to be passed to a
+        worker process, only a handle to the memory block is pickled instead
+        of the data. Unpickled Data objects attach to the memory block without
+        copying the data, data are read-only in these objects. The memory
+        block is removed when the Data object and all its subsets have been
+        deleted, Data objects have to be unpickled before that. Calling
+        set_data or appending data moves data out of shared memory.
+        """
+        if not hasattr(self, 'data'):
+            raise AttributeError('No data has been added to this Data() '
+                                 'instance.')
+        if self._shared is not None and self._shared.contains(self.data):
+            return
+        if (isinstance(self.data, np.memmap) or
+                not isinstance(self.data, np.ndarray)):
+            raise RuntimeError('Only data held in memory can be moved to '
+                               'shared memory.')
+        shared = SharedBuffer(self.data.nbytes)
+        data = shared.array(self.data.shape, self.data.dtype)
+        data[:] = self.data
+        self._data = data
+        self._shared = shared
+        self._buffer = None
+        if getattr(self, '_realisation_cache', None) is not None:
+            self._realisation_cache.clear()
+
+    def __getstate__(self):
+        """Return state for pickling, replace shared data by a handle."""
+        state = self.__dict__.copy()
+        if state.get('_shared') is not None:
+            state['_data'] = self._shared.pack(state['_data'])
+            state['_realisation_cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Set state from pickle, attach to shared data."""
+        if state.get('_shared') is not None:
+            state['_data'] = state['_shared'].unpack(state['_data'])
+        self.__dict__.update(state)
+
+    def _check_subset_index(self, index, n, name):
+        """Return indices for a subset as array, check range."""
+        if index is None:
+            return np.arange(n)
+        index = np.asarray(index, dtype=np.int_).ravel()
+        if index.size == 0:
+            raise RuntimeError('No {0} indices provided for subset.'.format(
+                name))
+        if index.min() < 0 or index.max() >= n:
+            raise RuntimeError('Requested {0} indices out of range, data '
+                               'contain {1} {0}(s).'.format(name, n))
+        return index
+
+    def enable_realisation_cache(self, max_bytes=256 * 2 ** 20):
+        """Cache realisations returned by get_realisations.
+
+        Realisations of individual variables are cached for each current
+        value, such that repeated requests for the same variables are answered
+        from the cache instead of being retrieved from the data again. When
+        the cache exceeds its memory budget, the least recently used
+        realisations are removed. The cache is cleared when new data are set
+        via set_data.
+
+        Args:
+            max_bytes : int [optional]
+                memory budget of the cache in bytes (default=256 MB)
+        """
+        self._realisation_cache = RealisationCache(max_bytes)
+
+    def disable_realisation_cache(self):
+        """Remove the realisation cache."""
+        self._realisation_cache = None
+
+    def realisation_cache_info(self):
+        """Return statistics of the realisation cache.
+
+        Returns:
+            dict
+                number of cache hits and misses, number of cached variables,
+                and memory used and available in bytes; None if the cache is
+                not enabled
+        """
+        if getattr(self, '_realisation_cache', None) is None:
+            return None
+        return self._realisation_cache.info()
+
+    def get_realisations(self, current_value, idx_list, shuffle=False,
+                         rng=None):
         """Return realisations for a list of indices.
 
         Return realisations for indices in list. Optionally, realisations can
@@ -227,6 +682,9 @@ class Data():
                 samples for a process are returned
             shuffle: bool
                 if true permute blocks of replications over trials
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
@@ -249,46 +707,31 @@ class Data():
             raise RuntimeError('All indices for which data is retrieved must '
                                ' be smaller than the current value.')
 
-        # Allocate memory.
         n_real_time = self.n_realisations_samples(current_value)
-        n_real_repl = self.n_realisations_repl()
-        realisations = np.empty((n_real_time * n_real_repl,
-                                 len(idx_list))).astype(self.data_type)
 
         # Shuffle the replication order if requested. This creates surrogate
         # data by permuting replications while keeping the order of samples
         # intact.
         if shuffle:
-            replications_order = np.random.permutation(self.n_replications)
+            if rng is None:
+                rng = np.random
+            replications_order = rng.permutation(self.n_replications)
         else:
             replications_order = np.arange(self.n_replications)
 
-        # Retrieve data.
-        i = 0
-        for idx in idx_list:
-            r = 0
-            # get the last sample as negative value, i.e., no. samples from the
-            # end of the array
-            last_sample = idx[1] - current_value[1]  # indexing is much faster
-            if last_sample == 0:                     # than looping over time!
-                last_sample = None
-            for replication in replications_order:
-                try:
-                    realisations[r:r + n_real_time, i] = self.data[
-                                                        idx[0],
-                                                        idx[1]: last_sample,
-                                                        replication]
-                except IndexError:
-                    raise IndexError('You tried to access variable {0} in a '
-                                     'data set with {1} processes and {2} '
-                                     'samples.'.format(idx, self.n_processes,
-                                                       self.n_samples))
-                r += n_real_time
-
-            assert(not np.isnan(realisations[:, i]).any()), ('There are nans '
-                                                             'in the retrieved'
-                                                             ' realisations.')
-            i += 1
+        cache = getattr(self, '_realisation_cache', None)
+        if cache is None:
+            realisations = self._gather_realisations(
+                idx_list, n_real_time, replications_order)
+        else:
+            # Retrieve realisations in the original replication order from
+            # the cache and permute replications afterwards.
+            realisations = self._get_cached_realisations(
+                cache, current_value, idx_list, n_real_time)
+            if shuffle:
+                realisations = realisations.reshape(
+                    self.n_replications, n_real_time, len(idx_list))[
+                        replications_order].reshape(realisations.shape)
 
         # For each realisation keep the index of the replication it came from.
         replications_index = np.repeat(replications_order, n_real_time)
@@ -297,7 +740,68 @@ class Data():
 
         return realisations, replications_index
 
-    def _get_data_slice(self, process, offset_samples=0, shuffle=False):
+    def _gather_realisations(self, idx_list, n_real_time, replications_order):
+        """Return realisations for a list of indices in a single gather."""
+        idx_array = np.array(idx_list, dtype=np.int_)
+        if not isinstance(self.data, np.ndarray):
+            # Read data from disk, one block of samples per variable.
+            realisations = np.empty(
+                (n_real_time * len(replications_order), len(idx_list)),
+                dtype=self.data.dtype)
+            for i, idx in enumerate(idx_array):
+                if idx[0] >= self.n_processes:
+                    raise IndexError(
+                        'You tried to access variables {0} in a data set with '
+                        '{1} processes and {2} samples.'.format(
+                            idx_list, self.n_processes, self.n_samples))
+                realisations[:, i] = self._read_block(
+                    idx[0], idx[1], idx[1] + n_real_time)[
+                        :, replications_order].T.ravel()
+            return self._apply_normalisation(realisations, idx_array[:, 0])
+
+        # Gather from a strided view holding windows of n_real_time samples
+        # for each start sample (no data are copied when creating the view).
+        # The gather returns an array indexed as [variable, replication,
+        # time], which is then flattened over replications and time.
+        windows = sliding_window_view(self.data, n_real_time, axis=1)
+        try:
+            realisations = windows[idx_array[:, 0, np.newaxis],
+                                   idx_array[:, 1, np.newaxis],
+                                   replications_order[np.newaxis, :]]
+        except IndexError:
+            raise IndexError('You tried to access variables {0} in a data set '
+                             'with {1} processes and {2} samples.'.format(
+                                idx_list, self.n_processes, self.n_samples))
+        realisations = np.ascontiguousarray(
+            realisations.transpose(1, 2, 0)).reshape(
+                n_real_time * len(replications_order), len(idx_list))
+        return self._apply_normalisation(realisations, idx_array[:, 0])
+
+    def _get_cached_realisations(self, cache, current_value, idx_list,
+                                 n_real_time):
+        """Return realisations for a list of indices using the cache."""
+        realisations = np.empty((n_real_time * self.n_replications,
+                                 len(idx_list)), dtype=self.data_type)
+        keys = [(int(current_value[1]), int(idx[0]), int(idx[1]))
+                for idx in idx_list]
+        missing = []
+        for i, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                realisations[:, i] = cached
+        if missing:
+            retrieved = self._gather_realisations(
+                [idx_list[i] for i in missing], n_real_time,
+                np.arange(self.n_replications))
+            realisations[:, missing] = retrieved
+            for j, i in enumerate(missing):
+                cache.put(keys[i], retrieved[:, j].copy())
+        return realisations
+
+    def _get_data_slice(self, process, offset_samples=0, shuffle=False,
+                        rng=None):
         """Return data slice for a single process.
 
         Return data slice for process. Optionally, an offset can be provided
@@ -332,6 +836,9 @@ class Data():
                 offset in samples
             shuffle: bool
                 if true permute blocks of data over trials
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
@@ -350,23 +857,25 @@ class Data():
         # data by permuting replications while keeping the order of samples
         # intact.
         if shuffle:
-            replication_index = np.random.permutation(self.n_replications)
+            if rng is None:
+                rng = np.random
+            replication_index = rng.permutation(self.n_replications)
         else:
             replication_index = np.arange(self.n_replications)
 
         try:
-            data_slice = self.data[process, offset_samples:, replication_index]
+            data_slice = self._read_block(process, offset_samples,
+                                          self.n_samples)[:, replication_index]
         except IndexError:
             raise IndexError('You tried to access process {0} with an offset '
                              'of {1} in a data set of {2} processes and {3} '
                              'samples.'.format(process, offset_samples,
                                                self.n_processes,
                                                self.n_samples))
-        assert(not np.isnan(data_slice).any()), ('There are nans in the '
-                                                 'retrieved data slice.')
-        return data_slice.T, replication_index
+        data_slice = self._apply_normalisation(data_slice, process)
+        return data_slice, replication_index
 
-    def slice_permute_replications(self, process):
+    def slice_permute_replications(self, process, rng=None):
         """Return data slice with permuted replications (time stays intact).
 
         Create surrogate data by permuting realisations over replications while
@@ -375,9 +884,9 @@ class Data():
         have the form (process index, sample index). Realisations are permuted
         block-wise by permuting the order of replications
         """
-        return self._get_data_slice(process, shuffle=True)
+        return self._get_data_slice(process, shuffle=True, rng=rng)
 
-    def slice_permute_samples(self, process, perm_settings):
+    def slice_permute_samples(self, process, perm_settings, rng=None):
         """Return slice of data with permuted samples (repl. stays intact).
 
         Create surrogate data by permuting data in a slice over samples (time)
@@ -459,6 +968,9 @@ class Data():
                       'perm_range' : int
                           range in samples over which realisations can be
                           permuted (default=n/10)
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
@@ -472,15 +984,15 @@ class Data():
             replications is too small to allow a sufficient number of
             permutations for the generation of surrogate data.
         """
-        data_slice = self._get_data_slice(process, shuffle=True)[0]
-        data_slice_perm = np.empty(data_slice.shape).astype(self.data_type)
+        data_slice = self._get_data_slice(process, shuffle=True, rng=rng)[0]
+        data_slice_perm = np.empty(data_slice.shape, dtype=self.data_type)
         perm = self._get_permutation_samples(data_slice.shape[0],
-                                             perm_settings)
+                                             perm_settings, rng)
         for r in range(self.n_replications):
             data_slice_perm[:, r] = data_slice[perm, r]
         return data_slice_perm, perm
 
-    def permute_replications(self, current_value, idx_list):
+    def permute_replications(self, current_value, idx_list, rng=None):
         """Return realisations with permuted replications (time stays intact).
 
         Create surrogate data by permuting realisations over replications while
@@ -509,6 +1021,9 @@ class Data():
                 index of the current_value in the data
             idx_list : list of tuples
                 indices of variables
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
@@ -522,9 +1037,11 @@ class Data():
         """
         if type(idx_list) is not list:
             raise TypeError('idx needs to be a list of tuples.')
-        return self.get_realisations(current_value, idx_list, shuffle=True)
+        return self.get_realisations(current_value, idx_list, shuffle=True,
+                                     rng=rng)
 
-    def permute_samples(self, current_value, idx_list, perm_settings):
+    def permute_samples(self, current_value, idx_list, perm_settings,
+                        rng=None):
         """Return realisations with permuted samples (repl. stays intact).
 
         Create surrogate data by permuting realisations over samples (time)
@@ -619,6 +1136,9 @@ class Data():
                       'perm_range' : int
                         range in samples over which realisations can be
                         permuted (e.g., number of samples / 10)
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
@@ -639,9 +1159,10 @@ class Data():
         [realisations, replication_idx] = self.get_realisations(current_value,
                                                                 idx_list)
         n_samples = sum(replication_idx == 0)
-        perm = self._get_permutation_samples(n_samples, perm_settings)
+        perm = self._get_permutation_samples(n_samples, perm_settings, rng)
         # Apply the permutation to data from each replication.
-        realisations_perm = np.empty(realisations.shape).astype(self.data_type)
+        realisations_perm = np.empty(realisations.shape,
+                                     dtype=self.data_type)
         perm_idx = np.empty(realisations_perm.shape[0])
         for r in range(max(replication_idx) + 1):
             mask = replication_idx == r
@@ -650,7 +1171,7 @@ class Data():
             perm_idx[mask] = perm
         return realisations_perm, perm_idx
 
-    def _get_permutation_samples(self, n_samples, perm_settings):
+    def _get_permutation_samples(self, n_samples, perm_settings, rng=None):
         """Generate permutation of n samples.
 
         Generate a permutation of n samples under various, possible
@@ -666,25 +1187,58 @@ class Data():
             perm_settings : dict
                 settings specifying the allowed permutations, see documentation
                 of permute_samples()
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
-                realisations permuted over time
-            numpy Array
                 permuted indices of samples
         """
+        return self._get_permutation_samples_batch(n_samples, 1,
+                                                   perm_settings, rng)[0]
+
+    def _get_permutation_samples_batch(self, n_samples, n_perm,
+                                       perm_settings, rng=None):
+        """Generate multiple permutations of n samples.
+
+        Generate n_perm permutations of n samples under the restrictions
+        specified in perm_settings (see documentation of permute_samples()).
+        All permutations are generated at once. For a given random state,
+        permutations are identical to permutations generated by n_perm
+        consecutive calls to _get_permutation_samples().
+
+        Args:
+            n_samples : int
+                length of each permutation
+            n_perm : int
+                number of permutations
+            perm_settings : dict
+                settings specifying the allowed permutations, see documentation
+                of permute_samples()
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
+
+        Returns:
+            numpy array
+                permuted indices of samples with dimensions n_perm x n_samples
+        """
         perm_type = perm_settings['perm_type']
 
-        # Get the permutaion 'mask' for one replication (the same mask is then
+        # Get the permutaion 'masks' for one replication (the same mask is then
         # applied to each replication).
         if perm_type == 'random':
-            perm = np.random.permutation(n_samples)
+            if rng is None:
+                rng = np.random
+            perm = np.argsort(rng.random((n_perm, n_samples)), axis=1)
 
         elif perm_type == 'circular':
             max_shift = perm_settings['max_shift']
             if type(max_shift) is not int:
                 raise TypeError(' ''max_shift'' has to be an int.')
-            perm = self._circular_shift(n_samples, max_shift)[0]
+            perm = self._circular_shift_batch(n_samples, max_shift, n_perm,
+                                              rng)[0]
 
         elif perm_type == 'block':
             block_size = perm_settings['block_size']
@@ -693,20 +1247,21 @@ class Data():
                 raise TypeError(' ''block_size'' has to be an int.')
             if type(perm_range) is not int:
                 raise TypeError(' ''perm_range'' has to be an int.')
-            perm = self._swap_blocks(n_samples, block_size, perm_range)
+            perm = self._swap_blocks_batch(n_samples, block_size, perm_range,
+                                           n_perm, rng)
 
         elif perm_type == 'local':
             perm_range = perm_settings['perm_range']
             if type(perm_range) is not int:
                 raise TypeError(' ''perm_range'' has to be an int.')
-            perm = self._swap_local(n_samples, perm_range)
+            perm = self._swap_local_batch(n_samples, perm_range, n_perm, rng)
 
         else:
             raise ValueError('Unknown permutation type ({0}).'.format(
                                                                     perm_type))
         return perm
 
-    def _swap_local(self, n, perm_range):
+    def _swap_local(self, n, perm_range, rng=None):
         """Permute n samples within blocks of length 'perm_range'.
 
         Args:
@@ -714,32 +1269,49 @@ class Data():
                 number of samples
             perm_range : int
                 range over which realisations are permuted
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
                 permuted indices with length n
         """
+        return self._swap_local_batch(n, perm_range, 1, rng)[0]
+
+    def _swap_local_batch(self, n, perm_range, n_perm, rng=None):
+        """Generate n_perm permutations of n samples within 'perm_range'.
+
+        Samples are permuted within consecutive blocks of length 'perm_range',
+        the last block holds the remaining samples if n is not a multiple of
+        'perm_range'. Permutations are created by sorting random keys that are
+        offset by the block index of each sample, such that samples can not
+        leave their block.
+
+        Args:
+            n : int
+                number of samples
+            perm_range : int
+                range over which realisations are permuted
+            n_perm : int
+                number of permutations
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
+
+        Returns:
+            numpy array
+                permuted indices with dimensions n_perm x n
+        """
         assert (perm_range > 1), ('Permutation range has to be larger than 1',
                                   'otherwise there is nothing to permute.')
         assert (n >= perm_range), ('Not enough realisations per replication '
                                    '({0}) to allow for the requested '
                                    '"perm_range" of {1}.' .format(n,
                                                                   perm_range))
+        return _permute_within_ranges(n, perm_range, n_perm, rng)
 
-        if perm_range == n:  # permute all n samples randomly
-            perm = np.random.permutation(n)
-        else:  # build a permutation that permutes only within the perm_range
-            perm = np.empty(n, dtype=int)
-            remainder = n % perm_range
-            i = 0
-            for p in range(n // perm_range):
-                perm[i:i + perm_range] = np.random.permutation(perm_range) + i
-                i += perm_range
-            if remainder > 0:
-                perm[-remainder:] = np.random.permutation(remainder) + i
-        return perm
-
-    def _swap_blocks(self, n, block_size, perm_range):
+    def _swap_blocks(self, n, block_size, perm_range, rng=None):
         """Permute blocks of samples in a time series within a given range.
 
         Permute n samples by swapping blocks of samples within a given range.
@@ -751,50 +1323,63 @@ class Data():
                 number of samples in a block
             perm_range : int
                 range over which blocks can be swapped
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
                 permuted indices with length n
         """
-        n_blocks = np.ceil(n / block_size).astype(int)
-        rem_samples = n % block_size
-        rem_blocks = n_blocks % perm_range
-        if rem_samples == 0:
-            rem_samples = block_size
+        return self._swap_blocks_batch(n, block_size, perm_range, 1, rng)[0]
 
-        # First permute block(!) indices.
-        if perm_range == n_blocks:  # permute all blocks randomly
-            perm_blocks = np.random.permutation(n_blocks)
-        else:  # build a permutation that permutes only within the perm_range
-            perm_blocks = np.empty(n_blocks, dtype=int)
-
-            i = 0
-            for p in range(n_blocks // perm_range):
-                perm_blocks[i:i + perm_range] = np.random.permutation(
-                                                                perm_range) + i
-                i += perm_range
-            if rem_blocks > 0:
-                perm_blocks[-rem_blocks:] = np.random.permutation(
-                                                                rem_blocks) + i
-
-        # Get the block index for each sample index, take into account that the
-        # last block may have fewer samples if n_samples % block_size isn't 0.
-        idx_blocks = np.hstack((np.repeat(np.arange(n_blocks - 1), block_size),
-                                np.repeat(n_blocks - 1, rem_samples)))
-
-        # Permute samples indices according to permuted block indices.
-        perm = np.zeros(n).astype(int)  # allocate memory
-        idx_orig = np.arange(n)  # original order of sample indices
-        i_0 = 0
-        for b in perm_blocks:  # loop over permuted blocks
-            idx = idx_blocks == b  # indices of samples in curr. permuted block
-            i_1 = i_0 + sum(idx)
-            perm[i_0:i_1] = idx_orig[idx]  # append samples to permutation
-            i_0 = i_1
+    def _swap_blocks_batch(self, n, block_size, perm_range, n_perm,
+                           rng=None):
+        """Generate n_perm permutations of n samples by swapping blocks.
 
-        return perm
+        Permute n samples by swapping blocks of samples within a given range.
+        Block indices are permuted within consecutive ranges of 'perm_range'
+        blocks. Samples are then ordered by the position of their block in the
+        permuted block order, keeping the order of samples within blocks
+        intact.
+
+        Args:
+            n : int
+                number of samples
+            block_size : int
+                number of samples in a block
+            perm_range : int
+                range over which blocks can be swapped
+            n_perm : int
+                number of permutations
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
-    def _circular_shift(self, n, max_shift):
+        Returns:
+            numpy array
+                permuted indices with dimensions n_perm x n
+        """
+        n_blocks = np.ceil(n / block_size).astype(int)
+
+        # First permute block(!) indices.
+        perm_blocks = _permute_within_ranges(n_blocks, perm_range, n_perm,
+                                             rng)
+
+        # Get the position of each block in the permuted order of blocks and
+        # the block index for each sample index (the last block may have fewer
+        # samples if n_samples % block_size isn't 0).
+        block_position = np.empty(perm_blocks.shape, dtype=int)
+        np.put_along_axis(block_position, perm_blocks,
+                          np.arange(n_blocks)[np.newaxis, :], axis=1)
+        idx_blocks = np.arange(n) // block_size
+
+        # Permute samples indices according to permuted block indices, a
+        # stable sort keeps the order of samples within each block.
+        return np.argsort(block_position[:, idx_blocks], axis=1,
+                          kind='stable')
+
+    def _circular_shift(self, n, max_shift, rng=None):
         """Permute samples through shifting by a random number of samples.
 
         A time series is shifted circularly by a random number of samples. A
@@ -807,6 +1392,9 @@ class Data():
                 number of samples
             max_shift: int
                 maximum possible shift (default=n)
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
 
         Returns:
             numpy array
@@ -814,14 +1402,38 @@ class Data():
             int
                 no. samples by which the time series was shifted
         """
+        perm, shift = self._circular_shift_batch(n, max_shift, 1, rng)
+        if VERBOSE:
+            print("replications are shifted by {0} samples".format(shift[0]))
+        return perm[0], shift[0]
+
+    def _circular_shift_batch(self, n, max_shift, n_perm, rng=None):
+        """Generate n_perm permutations by random circular shifts.
+
+        Args:
+            n : int
+                number of samples
+            max_shift: int
+                maximum possible shift
+            n_perm : int
+                number of permutations
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
+
+        Returns:
+            numpy array
+                permuted indices with dimensions n_perm x n
+            numpy array
+                no. samples by which the time series was shifted for each
+                permutation
+        """
         assert (max_shift <= n), ('Max_shift ({0}) has to be equal to or '
                                   'smaller than the number of samples in the '
                                   'time series ({1}).'.format(max_shift, n))
-        shift = np.random.randint(low=1, high=max_shift + 1)
-        if VERBOSE:
-            print("replications are shifted by {0} samples".format(shift))
-        return np.hstack((np.arange(n - shift, n),
-                          np.arange(n - shift))), shift
+        shift = utils.random_integers(rng, 1, max_shift + 1, size=n_perm)
+        perm = (np.arange(n)[np.newaxis, :] - shift[:, np.newaxis]) % n
+        return perm, shift
 
     def generate_mute_data(self, n_samples=1000, n_replications=10):
         """Generate example data for a 5-process network.
@@ -875,11 +1487,13 @@ class Data():
         n_samples=1000,
         n_replications=10,
         coefficient_matrices=np.array([[[0.5, 0], [0.4, 0.5]]]),
-        noise_std=0.1
+        noise_std=0.1,
+        rng=None
     ):
         """Generate discrete-time VAR (vector autoregressive) time series.
 
-        Generate data and overwrite the instance's current data.
+        Generate data and overwrite the instance's current data. All
+        replications are simulated in parallel.
 
         Args:
             n_samples : int [optional]
@@ -896,6 +1510,9 @@ class Data():
             noise_std : float [optional]
                 standard deviation of uncorrelated Gaussian noise
                 (default = 0.1)
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
         """
         order = np.shape(coefficient_matrices)[0]
         n_processes = np.shape(coefficient_matrices)[1]
@@ -921,51 +1538,119 @@ class Data():
         if not is_stable:
             RuntimeError('VAR process is not stable and may be nonstationary.')
 
-        # Initialise time series matrix. The 3 dimensions represent
-        # (processes, samples, replications). Only the last n_samples will be
-        # kept, in order to discard transient effects.
-        x = np.zeros((
-            n_processes,
-            order + samples_transient + n_samples,
-            n_replications
-        ))
+        x = self._simulate_var(var_reduced_form[0:n_processes, :], order,
+                               samples_transient + n_samples, n_replications,
+                               noise_std, rng)
 
-        # Generate (different) initial conditions for each replication:
-        # Uniformly sample from the [0,1] interval and tile as many times as
-        # the VAR process order along the second dimension.
-        x[:, 0:order, :] = np.tile(
-            np.random.rand(n_processes, 1, n_replications),
-            (1, order, 1)
-        )
+        # Discard transient effects (only take end of time series)
+        self.set_data(x[-(n_samples + 1):-1, :, :], 'spr')
 
-        # Compute time series
-        for i_repl in range(0, n_replications):
-            for i_sample in range(order, order + samples_transient + n_samples):
-                for i_delay in range(1, order + 1):
-                    x[:, i_sample, i_repl] += np.dot(
-                        coefficient_matrices[i_delay - 1, :, :],
-                        x[:, i_sample - i_delay, i_repl]
-                    )
-                # Add uncorrelated Gaussian noise vector
-                x[:, i_sample, i_repl] += np.random.normal(
-                    0,  # mean
-                    noise_std,
-                    x[:, i_sample, i_repl].shape
-                )
+    def generate_random_var_data(
+        self,
+        n_processes=10,
+        n_samples=1000,
+        n_replications=10,
+        edge_probability=0.1,
+        max_lag=1,
+        coupling=0.4,
+        self_coupling=0.5,
+        noise_std=0.1,
+        rng=None
+    ):
+        """Generate VAR time series on a sparse random network.
+
+        Generate a random directed network, where each link between two
+        processes exists with probability 'edge_probability' and has a random
+        lag between 1 and 'max_lag'. Simulate a VAR process on the network
+        (see generate_var_data()) and overwrite the instance's current data.
+        Each process is coupled to its own past at lag 1 with coefficient
+        'self_coupling'. Coefficients of all links into a target equal
+        'coupling' / no. links into the target, which guarantees a stable
+        process if abs(self_coupling) + abs(coupling) < 1.
+
+        Example:
+
+            >>> data = Data()
+            >>> adjacency = data.generate_random_var_data(
+            >>>     n_processes=200, n_samples=10000, edge_probability=0.01)
+            >>> # Compare to the inferred network
+            >>> results = MultivariateTE().analyse_network(settings, data)
+            >>> inferred = results.get_adjacency_matrix('binary', fdr=False)
+            >>> true_positives = np.sum(inferred & (adjacency > 0))
 
-        # Discard transient effects (only take end of time series)
-        self.set_data(x[:, -(n_samples + 1):-1, :], 'psr')
+        Args:
+            n_processes : int [optional]
+                number of processes (default=10)
+            n_samples : int [optional]
+                number of samples simulated for each process and replication
+                (default=1000)
+            n_replications : int [optional]
+                number of replications (default=10)
+            edge_probability : float [optional]
+                probability of a link between two processes (default=0.1)
+            max_lag : int [optional]
+                maximum lag of links (default=1)
+            coupling : float [optional]
+                summed coefficients of all links into a target (default=0.4)
+            self_coupling : float [optional]
+                coefficient of each process' own past (default=0.5)
+            noise_std : float [optional]
+                standard deviation of uncorrelated Gaussian noise
+                (default = 0.1)
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
+
+        Returns:
+            numpy array
+                adjacency matrix with dimensions (n_processes x n_processes),
+                where entry [i, j] holds the lag of the link from source i to
+                target j or 0 if the link does not exist
+        """
+        if type(max_lag) is not int or max_lag < 1:
+            raise RuntimeError('max_lag has to be an integer > 0.')
+        if not 0 <= edge_probability <= 1:
+            raise RuntimeError('edge_probability has to be in [0, 1].')
+        if abs(self_coupling) + abs(coupling) >= 1:
+            raise RuntimeError('abs(self_coupling) + abs(coupling) has to be '
+                               'smaller than 1 to guarantee a stable VAR '
+                               'process.')
+        if rng is None:
+            rng = np.random
+
+        # Draw links and their lags, entries are indexed [source, target].
+        links = rng.random((n_processes, n_processes)) < edge_probability
+        np.fill_diagonal(links, False)
+        lags = utils.random_integers(rng, 1, max_lag + 1,
+                                     size=(n_processes, n_processes))
+        adjacency = np.where(links, lags, 0)
+
+        # Coefficient matrices are indexed [lag - 1, target, source].
+        coefficient_matrices = np.zeros((max_lag, n_processes, n_processes))
+        sources, targets = np.nonzero(adjacency)
+        n_links_target = np.count_nonzero(adjacency, axis=0)
+        coefficient_matrices[adjacency[sources, targets] - 1,
+                             targets, sources] = (
+                                coupling / n_links_target[targets])
+        coefficient_matrices[0, np.arange(n_processes),
+                             np.arange(n_processes)] = self_coupling
+
+        self.generate_var_data(n_samples, n_replications,
+                               coefficient_matrices, noise_std, rng)
+        return adjacency
 
     def generate_logistic_maps_data(
         self,
         n_samples=1000,
         n_replications=10,
         coefficient_matrices=np.array([[[0.5, 0], [0.4, 0.5]]]),
-        noise_std=0.1
+        noise_std=0.1,
+        rng=None
     ):
         """Generate discrete-time coupled-logistic-maps time series.
 
-        Generate data and overwrite the instance's current data.
+        Generate data and overwrite the instance's current data. All
+        replications are simulated in parallel.
 
         The implemented logistic map function is f(x) = 4 * x * (1 - x).
 
@@ -984,6 +1669,9 @@ class Data():
             noise_std : float [optional]
                 standard deviation of uncorrelated Gaussian noise
                 (default = 0.1)
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
         """
         order = np.shape(coefficient_matrices)[0]
         n_processes = np.shape(coefficient_matrices)[1]
@@ -993,41 +1681,569 @@ class Data():
         def f(x):
             return 4 * x * (1 - x)
 
+        x = self._simulate_var(
+            np.reshape(np.transpose(coefficient_matrices, (1, 0, 2)),
+                       [n_processes, n_processes * order]),
+            order, samples_transient + n_samples, n_replications, noise_std,
+            rng, activation=f, wrap=True)
+
+        # Discard transient effects (only take end of time series)
+        self.set_data(x[-(n_samples + 1):-1, :, :], 'spr')
+
+    def _simulate_var(self, coefficients, order, n_samples, n_replications,
+                      noise_std, rng=None, activation=None, wrap=False):
+        """Simulate a (non-linear) VAR process for all replications at once.
+
+        Simulate x_t = f(sum_l A_l x_(t-l)) + noise for all replications in
+        parallel. Coefficient matrices for all lags are stacked, such that each
+        time step requires a single matrix product over all replications.
+
+        Args:
+            coefficients : numpy array
+                stacked coefficient matrices [A_1, A_2, ..., A_order] with
+                dimensions (no. processes x no. processes * order)
+            order : int
+                process order
+            n_samples : int
+                number of samples simulated after the initial conditions
+            n_replications : int
+                number of replications
+            noise_std : float
+                standard deviation of uncorrelated Gaussian noise
+            rng : numpy.random.Generator [optional]
+                random number generator, if None, the global NumPy random
+                state is used (default=None)
+            activation : function [optional]
+                function applied before adding noise (default=None)
+            wrap : bool [optional]
+                if True, keep values in the [0, 1] range by taking the
+                result modulo 1 (default=False)
+
+        Returns:
+            numpy array
+                time series with dimensions (order + n_samples, no.
+                processes, no. replications)
+        """
+        if rng is None:
+            rng = np.random
+        n_processes = coefficients.shape[0]
+        # Use a sparse matrix product for sparsely coupled networks.
+        if np.count_nonzero(coefficients) < VAR_SPARSE_DENSITY * np.size(
+                coefficients):
+            coefficients = sparse.csr_matrix(coefficients)
+
         # Initialise time series matrix. The 3 dimensions represent
-        # (processes, samples, replications). Only the last n_samples will be
-        # kept, in order to discard transient effects.
-        x = np.zeros((
-            n_processes,
-            order + samples_transient + n_samples,
-            n_replications
-        ))
+        # (samples, processes, replications) such that the realisations of
+        # one time step are contiguous in memory.
+        x = np.empty((order + n_samples, n_processes, n_replications))
 
         # Generate (different) initial conditions for each replication:
-        # Uniformly sample from the [0,1] interval and tile as many times as
-        # the stochastic process order along the second dimension.
-        x[:, 0:order, :] = np.tile(
-            np.random.rand(n_processes, 1, n_replications),
-            (1, order, 1)
-        )
+        # Uniformly sample from the [0,1] interval and repeat as many times as
+        # the process order along the first dimension.
+        x[0:order] = rng.random((1, n_processes, n_replications))
+
+        # Compute time series. Stack past samples as [x_(t-1), ...,
+        # x_(t-order)] to match the stacked coefficient matrices.
+        # Uncorrelated Gaussian noise is drawn for blocks of samples at once.
+        block_size = max(1, VAR_NOISE_BLOCK_ENTRIES //
+                         (n_processes * n_replications))
+        for i_sample in range(order, order + n_samples):
+            if (i_sample - order) % block_size == 0:
+                noise = rng.normal(0, noise_std, (
+                    min(block_size, order + n_samples - i_sample),
+                    n_processes, n_replications))
+            past = x[i_sample - order:i_sample][::-1].reshape(
+                n_processes * order, n_replications)
+            x[i_sample] = coefficients.dot(past)
+            if activation is not None:
+                x[i_sample] = activation(x[i_sample])
+            x[i_sample] += noise[(i_sample - order) % block_size]
+            if wrap:
+                x[i_sample] %= 1
+        return x
+
+
+class RealisationCache():
+    """Cache realisations of variables with least-recently-used eviction.
+
+    Store realisations of individual variables, keyed by the sample index of
+    the current value and the variable's (process index, sample index). If
+    the memory used by cached realisations exceeds the budget, the least
+    recently used entries are removed.
 
-        # Compute time series
-        for i_repl in range(0, n_replications):
-            for i_sample in range(order, order + samples_transient + n_samples):
-                for i_delay in range(1, order + 1):
-                    x[:, i_sample, i_repl] += np.dot(
-                        coefficient_matrices[i_delay - 1, :, :],
-                        x[:, i_sample - i_delay, i_repl]
-                    )
-                # Compute activation function
-                x[:, i_sample, i_repl] = f(x[:, i_sample, i_repl])
-                # Add uncorrelated Gaussian noise vector
-                x[:, i_sample, i_repl] += np.random.normal(
-                    0,  # mean
-                    noise_std,
-                    x[:, i_sample, i_repl].shape
-                )
-                # ensure values are in the [0, 1] range
-                x[:, i_sample, i_repl] = x[:, i_sample, i_repl] % 1
+    Args:
+        max_bytes : int
+            memory budget in bytes
 
-        # Discard transient effects (only take end of time series)
-        self.set_data(x[:, -(n_samples + 1):-1, :], 'psr')
+    Attributes:
+        hits : int
+            number of requests answered from the cache
+        misses : int
+            number of requests for realisations not in the cache
+        n_bytes : int
+            memory used by cached realisations in bytes
+    """
+
+    def __init__(self, max_bytes):
+        if max_bytes < 0:
+            raise RuntimeError('Cache size must not be negative.')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.n_bytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return cached realisations or None if key is not in the cache."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Add realisations to the cache, evict entries if necessary."""
+        if value.nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.n_bytes -= self._entries.pop(key).nbytes
+        value.flags.writeable = False
+        self._entries[key] = value
+        self.n_bytes += value.nbytes
+        while self.n_bytes > self.max_bytes:
+            self.n_bytes -= self._entries.popitem(last=False)[1].nbytes
+
+    def clear(self):
+        """Remove all entries, hit and miss counts are kept."""
+        self._entries.clear()
+        self.n_bytes = 0
+
+    def info(self):
+        """Return cache statistics as a dictionary."""
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'n_entries': len(self._entries),
+                'n_bytes': self.n_bytes,
+                'max_bytes': self.max_bytes}
+
+
+class GrowableBuffer():
+    """Hold a 3-dimensional array that can grow along its last two axes.
+
+    Store data in an array with spare capacity along the samples and
+    replications axes (axes 1 and 2). Appended data are written into the
+    spare capacity; if the capacity is exceeded, the capacity along the
+    respective axis is at least doubled, such that the cost of copying
+    existing data is amortised over appends.
+
+    Args:
+        data : numpy array
+            initial data with dimensions (processes, samples, replications);
+            the array is used as storage until its capacity is exceeded, it
+            is never written to
+
+    Attributes:
+        view : numpy array
+            view of the data held in the buffer
+    """
+
+    def __init__(self, data):
+        self._array = data
+        self._shape = list(data.shape)
+
+    @property
+    def view(self):
+        """Return a view of the data held in the buffer."""
+        return self._array[:, :self._shape[1], :self._shape[2]]
+
+    @property
+    def capacity(self):
+        """Return the shape of the allocated storage."""
+        return self._array.shape
+
+    def append(self, data, axis):
+        """Append data along the samples (1) or replications (2) axis."""
+        if axis not in (1, 2):
+            raise RuntimeError('Data can only be appended along axis 1 '
+                               '(samples) or 2 (replications).')
+        start = self._shape[axis]
+        stop = start + data.shape[axis]
+        if stop > self._array.shape[axis]:
+            capacity = list(self._array.shape)
+            capacity[axis] = max(stop, 2 * capacity[axis])
+            array = np.empty(capacity, dtype=self._array.dtype)
+            array[:, :self._shape[1], :self._shape[2]] = self.view
+            self._array = array
+        index = [slice(None), slice(0, self._shape[1]),
+                 slice(0, self._shape[2])]
+        index[axis] = slice(start, stop)
+        self._array[tuple(index)] = data
+        self._shape[axis] = stop
+
+
+class SharedBuffer():
+    """Block of memory that can be attached by several processes.
+
+    Hold a memory-mapped temporary file, which is created in a RAM-backed
+    file system if available (see SHARED_MEMORY_DIR) or in the default
+    temporary directory if the RAM-backed file system has too little free
+    space (e.g., the 64 MB default in Docker containers). Instances can be
+    pickled, unpickled instances map the same file without copying its
+    content, such that all processes share the same physical memory. The
+    process that created the block removes the file when the instance is
+    deleted, existing mappings stay valid.
+
+    Args:
+        n_bytes : int
+            size of the memory block in bytes
+    """
+
+    def __init__(self, n_bytes):
+        self.n_bytes = max(int(n_bytes), 1)
+        fd, self.name = tempfile.mkstemp(prefix='idtxl_',
+                                         dir=self._get_dir(self.n_bytes))
+        os.close(fd)
+        self._owner = True
+        self._attach('w+')
+
+    @staticmethod
+    def _get_dir(n_bytes):
+        """Return a directory with enough free space for the memory block.
+
+        Writing to a memory-mapped file beyond the free space of its file
+        system kills the process (SIGBUS) instead of raising an error, hence
+        check the free space before creating the file.
+        """
+        for d in [SHARED_MEMORY_DIR, tempfile.gettempdir()]:
+            if d is None:
+                continue
+            stat = os.statvfs(d)
+            if stat.f_bavail * stat.f_frsize >= n_bytes:
+                return d
+        raise RuntimeError(
+            'Not enough free space for a shared memory block of {0} bytes in '
+            '{1} or {2}.'.format(n_bytes, SHARED_MEMORY_DIR,
+                                 tempfile.gettempdir()))
+
+    def _attach(self, mode):
+        self._mmap = np.memmap(self.name, dtype=np.uint8, mode=mode,
+                               shape=(self.n_bytes,))
+        self._address = self._mmap.__array_interface__['data'][0]
+
+    def array(self, shape, dtype, offset=0, strides=None):
+        """Return an array using the memory block as buffer."""
+        return np.ndarray(shape, dtype=dtype, buffer=self._mmap,
+                          offset=offset, strides=strides)
+
+    def contains(self, array):
+        """Return True if array is a view on the memory block."""
+        address = array.__array_interface__['data'][0]
+        return (np.shares_memory(array, self._mmap) and
+                self._address <= address < self._address + self.n_bytes)
+
+    def pack(self, data):
+        """Replace arrays in the memory block by a picklable description."""
+        if isinstance(data, np.ndarray) and self.contains(data):
+            return _SharedArrayState(
+                data.__array_interface__['data'][0] - self._address,
+                data.shape, data.strides, data.dtype)
+        if isinstance(data, SubsetReader):
+            data = copy.copy(data)
+            data.data = self.pack(data.data)
+        return data
+
+    def unpack(self, data):
+        """Replace array descriptions by read-only arrays in the block."""
+        if isinstance(data, _SharedArrayState):
+            array = self.array(data.shape, data.dtype, data.offset,
+                               data.strides)
+            array.flags.writeable = False
+            return array
+        if isinstance(data, SubsetReader):
+            data.data = self.unpack(data.data)
+        return data
+
+    def __getstate__(self):
+        return {'name': self.name, 'n_bytes': self.n_bytes}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._owner = False
+        self._attach('r+')
+
+    def __del__(self):
+        if getattr(self, '_owner', False):
+            try:
+                os.remove(self.name)
+            except OSError:
+                pass
+
+
+class _SharedArrayState():
+    """Describe an array in a SharedBuffer for pickling."""
+
+    def __init__(self, offset, shape, strides, dtype):
+        self.offset = offset
+        self.shape = shape
+        self.strides = strides
+        self.dtype = dtype
+
+
+class _HDF5DatasetState():
+    """Describe an HDF5 dataset by its file and path for pickling."""
+
+    def __init__(self, dataset):
+        self.file_name = dataset.file.filename
+        self.name = dataset.name
+
+    def open(self):
+        """Open the file read-only and return the dataset."""
+        import h5py
+        return h5py.File(self.file_name, 'r')[self.name]
+
+
+def _pack_dataset(dataset):
+    """Replace an h5py dataset by a picklable description."""
+    if type(dataset).__module__.split('.')[0] == 'h5py':
+        return _HDF5DatasetState(dataset)
+    return dataset
+
+
+def _unpack_dataset(dataset):
+    """Reopen an h5py dataset from its description."""
+    if isinstance(dataset, _HDF5DatasetState):
+        return dataset.open()
+    return dataset
+
+
+class DatasetReader():
+    """Read blocks of data from an array-like dataset stored on disk.
+
+    Provide read access to a dataset that does not support NumPy's strided
+    views (e.g., h5py datasets), such that blocks of data for single
+    processes can be read without loading the full dataset into memory.
+    Dimensions of the dataset may be in any order. Instances can be pickled,
+    h5py datasets are then reopened read-only from their file when unpickled
+    (e.g., by worker processes).
+
+    Args:
+        dataset : array-like
+            1- to 3-dimensional dataset supporting basic slicing (e.g., an
+            h5py dataset)
+        dim_order : string
+            order of dimensions in the dataset (see Data class)
+
+    Attributes:
+        shape : tuple
+            shape of the data as (processes, samples, replications)
+        dtype : numpy dtype
+            data type of the dataset
+    """
+
+    def __init__(self, dataset, dim_order):
+        self.dataset = dataset
+        self.dim_order = dim_order
+        self.dtype = np.dtype(dataset.dtype)
+        self.shape = tuple(
+            dataset.shape[dim_order.index(d)] if d in dim_order else 1
+            for d in 'psr')
+
+    def __getstate__(self):
+        """Return state for pickling, replace HDF5 datasets by a handle."""
+        state = self.__dict__.copy()
+        state['dataset'] = _pack_dataset(state['dataset'])
+        return state
+
+    def __setstate__(self, state):
+        """Set state from pickle, reopen HDF5 datasets read-only."""
+        state['dataset'] = _unpack_dataset(state['dataset'])
+        self.__dict__.update(state)
+
+    def read(self, process, start, stop):
+        """Read samples of a single process.
+
+        Args:
+            process : int
+                process index
+            start : int
+                index of first sample
+            stop : int
+                index of last sample (not included)
+
+        Returns:
+            numpy array
+                block of data with dimensions [samples x replications]
+        """
+        if not 0 <= process < self.shape[0]:
+            raise IndexError('Process index {0} out of range.'.format(process))
+        index = []
+        for d in self.dim_order:
+            if d == 'p':
+                index.append(slice(process, process + 1))
+            elif d == 's':
+                index.append(slice(start, stop))
+            else:
+                index.append(slice(None))
+        block = np.asarray(self.dataset[tuple(index)])
+        # Bring block into the order processes x samples x replications.
+        dim_order = self.dim_order
+        for d in 'psr':
+            if d not in dim_order:
+                block = np.expand_dims(block, block.ndim)
+                dim_order += d
+        block = np.transpose(block, [dim_order.index(d) for d in 'psr'])
+        return block[0]
+
+
+class SubsetReader():
+    """Read blocks of data for a subset of processes and replications.
+
+    Provide read access to a subset of data held by a Data object without
+    copying the data. Blocks of data for single processes are read from the
+    data when requested. Used by Data.subset if a subset can not be
+    represented as a view on the data.
+
+    Args:
+        data : numpy array | DatasetReader | SubsetReader
+            data with dimensions (processes, samples, replications)
+        processes : numpy array
+            indices of processes in the subset
+        replications : numpy array
+            indices of replications in the subset
+        samples : tuple of int
+            first and last (not included) sample in the subset
+
+    Attributes:
+        shape : tuple
+            shape of the subset as (processes, samples, replications)
+        dtype : numpy dtype
+            data type of the data
+    """
+
+    def __init__(self, data, processes, replications, samples):
+        self.data = data
+        self.dtype = data.dtype
+        self._processes = processes
+        self._replications = replications
+        self._start = samples[0]
+        self.shape = (len(processes), samples[1] - samples[0],
+                      len(replications))
+
+    def read(self, process, start, stop):
+        """Read samples of a single process.
+
+        Args:
+            process : int
+                process index in the subset
+            start : int
+                index of first sample in the subset
+            stop : int
+                index of last sample in the subset (not included)
+
+        Returns:
+            numpy array
+                block of data with dimensions [samples x replications]
+        """
+        if not 0 <= process < self.shape[0]:
+            raise IndexError('Process index {0} out of range.'.format(process))
+        process = self._processes[process]
+        start = self._start + start
+        stop = self._start + min(stop, self.shape[1])
+        if isinstance(self.data, np.ndarray):
+            block = self.data[process, start:stop, :]
+        else:
+            block = self.data.read(process, start, stop)
+        return block[:, self._replications]
+
+
+def _index_to_slice(index):
+    """Return a slice selecting the same entries as an array of indices.
+
+    Return None if indices are not equally spaced and increasing.
+    """
+    if len(index) == 1:
+        return slice(index[0], index[0] + 1)
+    step = index[1] - index[0]
+    if step > 0 and np.all(np.diff(index) == step):
+        return slice(index[0], index[-1] + 1, step)
+    return None
+
+
+def _merge_statistics(n, mean, m2, block, axis=None):
+    """Merge mean and sum of squared deviations with those of a new block.
+
+    Combine statistics of data seen so far with the statistics of a block of
+    new data (Chan et al., 1979).
+
+    Args:
+        n : int
+            number of values seen so far
+        mean : float | numpy array
+            mean of values seen so far
+        m2 : float | numpy array
+            sum of squared deviations from the mean of values seen so far
+        block : numpy array
+            new values
+        axis : int | tuple of int [optional]
+            axes over which statistics are computed, remaining axes index
+            independent variables (default=None, use all axes)
+
+    Returns:
+        int
+            number of values
+        float | numpy array
+            mean
+        float | numpy array
+            sum of squared deviations from the mean
+    """
+    block = np.asarray(block, dtype=np.float64)
+    n_b = block.size // np.size(mean) if axis is not None else block.size
+    if n_b == 0:
+        return n, mean, m2
+    mean_b = block.mean(axis=axis)
+    if axis is None:
+        m2_b = np.sum((block - mean_b) ** 2)
+    else:
+        m2_b = np.sum((block - np.expand_dims(mean_b, axis)) ** 2, axis=axis)
+    delta = mean_b - mean
+    m2 = m2 + m2_b + delta ** 2 * n * n_b / (n + n_b)
+    mean = mean + delta * n_b / (n + n_b)
+    return n + n_b, mean, m2
+
+
+def _get_mean_sd(n, mean, m2):
+    """Return mean and standard deviation from merged statistics.
+
+    The standard deviation is computed with denominator (N - 1) and is set to
+    1 for constant variables (see utils.standardise).
+    """
+    sd = np.sqrt(m2 / (n - 1)) if n > 1 else np.zeros(np.shape(m2))
+    sd = np.where(np.isclose(sd, 0), 1., sd)
+    if np.ndim(sd) == 0:
+        sd = float(sd)
+    return mean, sd
+
+
+def _permute_within_ranges(n, perm_range, n_perm, rng=None):
+    """Generate n_perm permutations of n indices within ranges.
+
+    Indices are permuted within consecutive ranges of length perm_range, the
+    last range holds the remaining indices if n is not a multiple of
+    perm_range. Permutations are obtained by sorting uniform random keys that
+    are offset by the range index of each index.
+
+    Returns:
+        numpy array
+            permuted indices with dimensions n_perm x n
+    """
+    if rng is None:
+        rng = np.random
+    keys = rng.random((n_perm, n))
+    keys += (np.arange(n) // perm_range)[np.newaxis, :]
+    return np.argsort(keys, axis=1)
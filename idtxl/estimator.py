@@ -90,6 +90,11 @@ class Estimator(metaclass=ABCMeta):
     The method 'is_analytic_null_estimator()' indicates whether the implemented
     estimator supports the generation of analytic surrogates (see docstring for
     details).
+
+    The method 'preferred_dtype()' declares the floating point precision in
+    which the estimator processes continuous data, such that data can be
+    provided in this precision to avoid conversions (see docstring for
+    details).
     """
 
     def __init__(self, settings=None):
@@ -151,6 +156,20 @@ class Estimator(metaclass=ABCMeta):
         """
         pass
 
+    def preferred_dtype(self):
+        """Return floating point precision used for continuous data.
+
+        Return the NumPy floating point type in which the estimator processes
+        continuous realisations. Realisations provided in a different
+        precision are converted by the estimator on each call. Return None if
+        the estimator has no preference, e.g., for estimators of discrete
+        data.
+
+        Returns:
+            numpy dtype | None
+        """
+        return None
+
     def _check_settings(self, settings=None):
         """Set default for settings dictionary.
 
@@ -301,19 +320,19 @@ class Estimator(metaclass=ABCMeta):
                                data[slice_vars[0]].shape[0],
                                data[slice_vars[0]].shape[0] % n_chunks))
 
-            # Cut data into chunks and call estimator serially on each chunk.
+            # Cut data into chunks and call estimator on each chunk.
             chunk_size = int(n_samples_total / n_chunks)
             idx_1 = 0
             idx_2 = chunk_size
-            results = np.empty((n_chunks))
+            chunk_data = []
             for i in range(n_chunks):
-                chunk_data = {}
+                chunk_data.append({})
                 # Slice data into single chunks
                 for v in slice_vars:  # NOTE: I am consciously not creating a deep copy here to save memory
                     if data[v] is not None:
-                        chunk_data[v] = data[v][idx_1:idx_2, :]
+                        chunk_data[i][v] = data[v][idx_1:idx_2, :]
                     else:
-                        chunk_data[v] = data[v]
+                        chunk_data[i][v] = data[v]
                 # Collect data that is reused over chunks.
                 for v in re_use:
                     if data[v] is not None:
@@ -321,9 +340,34 @@ class Estimator(metaclass=ABCMeta):
                             'No. samples in variable {0} ({1}) is not equal '
                             'to chunk size ({2}).'.format(
                                 v, data[v].shape[0], chunk_size))
-                    chunk_data[v] = data[v]
-                results[i] = self.estimate(**chunk_data)
+                    chunk_data[i][v] = data[v]
                 idx_1 = idx_2
                 idx_2 += chunk_size
 
-            return results
+            return self._estimate_chunks(chunk_data, re_use)
+
+    def _estimate_chunks(self, chunk_data, re_use):
+        """Estimate measure for a list of chunks.
+
+        Called by estimate_parallel() for estimators that do not support
+        parallel estimation. The default implementation calls estimate() on
+        each chunk serially. Child classes may overwrite this method to
+        re-use expensive computations on variables that are identical for
+        all chunks (variables in re_use) or to distribute chunks across
+        multiple workers.
+
+        Args:
+            chunk_data : list of dicts
+                realisations of random variables for each chunk, entries for
+                variables in re_use are identical for all chunks
+            re_use : list of keys
+                variables that are re-used over chunks
+
+        Returns:
+            numpy array
+                estimated values for each chunk
+        """
+        results = np.empty((len(chunk_data)))
+        for i, chunk in enumerate(chunk_data):
+            results[i] = self.estimate(**chunk)
+        return results
@@ -54,6 +54,10 @@ class JidtEstimator(Estimator):
         settings.setdefault('local_values', False)
         settings.setdefault('debug', False)
         self.settings = settings
+        self.est_mi = None
+        self._calc_pool = {}
+        self._java_cache = {}
+        self._java_cache_vars = []
 
     def _start_jvm(self):
         """Start JAVA virtual machine if it is not running."""
@@ -86,6 +90,115 @@ class JidtEstimator(Estimator):
     def is_parallel(self):
         return False
 
+    def _get_calc(self, CalcClass, *args):
+        """Return a JIDT calculator from the estimator's calculator pool.
+
+        Calculators are created once for each combination of calculator class
+        and constructor arguments (e.g., variable dimensions and alphabet
+        sizes) and are re-used in subsequent calls. Calculators have to be
+        re-initialised before adding new observations.
+
+        Args:
+            CalcClass : JAVA class
+                JAVA class returned by jpype.JPackage
+            args : int
+                arguments passed to the calculator's constructor
+
+        Returns:
+            Java object
+                JIDT calculator
+        """
+        key = (str(CalcClass), args)
+        try:
+            return self._calc_pool[key]
+        except KeyError:
+            calc = CalcClass(*args)
+            calc.setDebug(self.settings['debug'])
+            self._calc_pool[key] = calc
+            return calc
+
+    def _get_mi_estimator(self, MIClass):
+        """Return estimator used to calculate MI if no conditional is given.
+
+        The estimator is created once and re-used in subsequent calls. JAVA
+        copies of re-used arrays are shared with the MI estimator during an
+        estimate_parallel() call.
+        """
+        if self.est_mi is None:
+            self.est_mi = MIClass(self.settings)
+        self.est_mi._java_cache_vars = self._java_cache_vars
+        self.est_mi._java_cache = self._java_cache
+        return self.est_mi
+
+    def _to_java(self, var, java_type=None):
+        """Copy a numpy array into a JAVA array.
+
+        Copy the array into a JAVA array of doubles (or ints) in a single bulk
+        transfer through the buffer protocol, instead of copying it element by
+        element. The array is first converted to a C-contiguous array of
+        type float64 (or int32).
+
+        During an estimate_parallel() call, JAVA copies of arrays that are
+        re-used over chunks are cached and passed to JIDT without copying
+        them again (see _estimate_chunks()).
+
+        Args:
+            var : numpy array
+                1D or 2D array of realisations
+            java_type : JAVA type [optional]
+                jp.JDouble or jp.JInt (default=jp.JDouble)
+
+        Returns:
+            JAVA array
+                JAVA array of the same shape as var
+        """
+        if java_type is None:
+            java_type = jp.JDouble
+        cache_key = self._get_java_cache_key(var, java_type)
+        if cache_key is not None and cache_key in self._java_cache:
+            return self._java_cache[cache_key]
+
+        if java_type == jp.JInt:
+            assert np.max(np.abs(var)) <= np.iinfo(np.int32).max, (
+                'Discrete values exceed the range of JAVA integers.')
+            var = np.ascontiguousarray(var, dtype=np.int32)
+        else:
+            var = np.ascontiguousarray(var, dtype=np.float64)
+        if var.ndim == 1:
+            java_var = jp.JArray(java_type, 1)(var)
+        elif hasattr(jp.JArray, 'of'):  # bulk copy of nd-arrays, JPype >= 1.0
+            java_var = jp.JArray.of(var)
+        else:
+            java_var = jp.JArray(java_type, var.ndim)(var)
+
+        if cache_key is not None:
+            self._java_cache[cache_key] = java_var
+        return java_var
+
+    def _get_java_cache_key(self, var, java_type):
+        """Return cache key if var is a view of an array re-used over chunks.
+
+        Arrays that share memory with a re-used array and have identical
+        memory layout hold the same data for the duration of an
+        estimate_parallel() call. All other arrays are not cached.
+        """
+        for re_use_var in self._java_cache_vars:
+            if np.may_share_memory(var, re_use_var):
+                return (var.__array_interface__['data'][0], var.shape,
+                        var.strides, var.dtype.str, str(java_type))
+        return None
+
+    def _estimate_chunks(self, chunk_data, re_use):
+        # Cache JAVA copies of re-used variables while iterating over chunks.
+        self._java_cache_vars = [chunk_data[0][v] for v in re_use
+                                 if chunk_data[0][v] is not None]
+        self._java_cache = {}
+        try:
+            return super()._estimate_chunks(chunk_data, re_use)
+        finally:
+            self._java_cache_vars = []
+            self._java_cache = {}
+
 
 class JidtKraskov(JidtEstimator):
     """Abstract class for implementation of JIDT Kraskov-estimators.
@@ -146,6 +259,9 @@ class JidtKraskov(JidtEstimator):
     def is_analytic_null_estimator(self):
         return False
 
+    def preferred_dtype(self):
+        return np.float64
+
 
 class JidtDiscrete(JidtEstimator):
     """Abstract class for implementation of discrete JIDT-estimators.
@@ -177,6 +293,10 @@ class JidtDiscrete(JidtEstimator):
         the JAVA class is added to the object instance, while for Kraskov/
         Gaussian estimators an instance of that class is added (because for the
         latter, objects can be instantiated independent of data properties).
+        Instances are kept in a calculator pool, keyed by the calculator's
+        constructor arguments, and are re-initialised for each estimate.
+        Hence, a calculator returned by estimate() (if return_calc=True) is
+        re-used by subsequent calls with the same alphabet sizes.
     """
 
     def __init__(self, settings):
@@ -307,6 +427,9 @@ class JidtGaussian(JidtEstimator):
     def is_analytic_null_estimator(self):
         return True
 
+    def preferred_dtype(self):
+        return np.float64
+
     def get_analytic_distribution(self, **data):
         """Return a JIDT AnalyticNullDistribution object.
 
@@ -414,8 +537,7 @@ class JidtKraskovCMI(JidtKraskov):
         """
         # Return MI if no conditional was provided.
         if conditional is None:
-            est_mi = JidtKraskovMI(self.settings)
-            return est_mi.estimate(var1, var2)
+            return self._get_mi_estimator(JidtKraskovMI).estimate(var1, var2)
         else:
             assert(conditional.size != 0), 'Conditional Array is empty.'
 
@@ -435,7 +557,9 @@ class JidtKraskovCMI(JidtKraskov):
         self._check_number_of_points(var1.shape[0])
 
         self.calc.initialise(var1.shape[1], var2.shape[1], cond.shape[1])
-        self.calc.setObservations(var1, var2, cond)
+        self.calc.setObservations(self._to_java(var1),
+                                  self._to_java(var2),
+                                  self._to_java(cond))
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
         else:
@@ -525,7 +649,7 @@ class JidtDiscreteCMI(JidtDiscrete):
         """
         # Calculate an MI if no conditional was provided
         if (conditional is None) or (self.settings['alphc'] == 0):
-            est = JidtDiscreteMI(self.settings)
+            est = self._get_mi_estimator(JidtDiscreteMI)
             # Return value will be just the estimate if return_calc is False,
             #  or estimate plus the JIDT MI calculator if return_calc is True:
             return est.estimate(var1, var2, return_calc)
@@ -553,22 +677,18 @@ class JidtDiscreteCMI(JidtDiscrete):
 
         # We have a non-trivial conditional, so make a proper conditional MI
         # calculation
-        calc = self.CalcClass(int(np.power(self.settings['alph1'], var1_dim)),
+        calc = self._get_calc(self.CalcClass,
+                              int(np.power(self.settings['alph1'], var1_dim)),
                               int(np.power(self.settings['alph2'], var2_dim)),
                               int(np.power(self.settings['alphc'], cond_dim)))
-        calc.setDebug(self.settings['debug'])
         calc.initialise()
-        # Unfortunately no faster way to pass numpy arrays in than this list
-        # conversion
-        calc.addObservations(jp.JArray(jp.JInt, 1)(var1.tolist()),
-                             jp.JArray(jp.JInt, 1)(var2.tolist()),
-                             jp.JArray(jp.JInt, 1)(conditional.tolist()))
+        var1 = self._to_java(var1, jp.JInt)
+        var2 = self._to_java(var2, jp.JInt)
+        conditional = self._to_java(conditional, jp.JInt)
+        calc.addObservations(var1, var2, conditional)
         if self.settings['local_values']:
             result = np.array(calc.computeLocalFromPreviousObservations(
-                jp.JArray(jp.JInt, 1)(var1.tolist()),
-                jp.JArray(jp.JInt, 1)(var2.tolist()),
-                jp.JArray(jp.JInt, 1)(conditional.tolist())
-                ))
+                var1, var2, conditional))
         else:
             result = calc.computeAverageLocalOfObservations()
         if return_calc:
@@ -696,18 +816,16 @@ class JidtDiscreteMI(JidtDiscrete):
         # Initialise estimator
         max_base = int(max(np.power(self.settings['alph1'], var1_dim),
                            np.power(self.settings['alph2'], var2_dim)))
-        calc = self.CalcClass(max_base, self.settings['lag_mi'])
-        calc.setDebug(self.settings['debug'])
+        calc = self._get_calc(self.CalcClass, max_base,
+                              self.settings['lag_mi'])
         calc.initialise()
 
-        # Unfortunately no faster way to pass numpy arrays in than this list
-        # conversion
-        calc.addObservations(jp.JArray(jp.JInt, 1)(var1.tolist()),
-                             jp.JArray(jp.JInt, 1)(var2.tolist()))
+        var1 = self._to_java(var1, jp.JInt)
+        var2 = self._to_java(var2, jp.JInt)
+        calc.addObservations(var1, var2)
         if self.settings['local_values']:
             result = np.array(calc.computeLocalFromPreviousObservations(
-                jp.JArray(jp.JInt, 1)(var1.tolist()),
-                jp.JArray(jp.JInt, 1)(var2.tolist())))
+                var1, var2))
         else:
             result = calc.computeAverageLocalOfObservations()
         if return_calc:
@@ -814,7 +932,7 @@ class JidtKraskovMI(JidtKraskov):
         self._check_number_of_points(var1.shape[0])
 
         self.calc.initialise(var1.shape[1], var2.shape[1])
-        self.calc.setObservations(var1, var2)
+        self.calc.setObservations(self._to_java(var1), self._to_java(var2))
 
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
@@ -906,7 +1024,7 @@ class JidtKraskovAIS(JidtKraskov):
         self._check_number_of_points(process.shape[0])
 
         self.calc.initialise(self.settings['history'], self.settings['tau'])
-        self.calc.setObservations(process)
+        self.calc.setObservations(self._to_java(process))
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
         else:
@@ -1006,14 +1124,14 @@ class JidtDiscreteAIS(JidtDiscrete):
             pass  # don't discretise at all, assume data to be discrete
 
         # And finally make the TE calculation:
-        calc = self.CalcClass(self.settings['alph'], self.settings['history'])
+        calc = self._get_calc(self.CalcClass, self.settings['alph'],
+                              self.settings['history'])
         calc.initialise()
-        # Unfortunately no faster way to pass numpy arrays in than this list
-        # conversion
-        calc.addObservations(jp.JArray(jp.JInt, 1)(process.tolist()))
+        process = self._to_java(process, jp.JInt)
+        calc.addObservations(process)
         if self.settings['local_values']:
             result = np.array(calc.computeLocalFromPreviousObservations(
-                                    jp.JArray(jp.JInt, 1)(process.tolist())))
+                                                                    process))
         else:
             result = calc.computeAverageLocalOfObservations()
         if return_calc:
@@ -1115,7 +1233,7 @@ class JidtGaussianAIS(JidtGaussian):
         process = self._ensure_one_dim_input(process)
 
         self.calc.initialise(self.settings['history'], self.settings['tau'])
-        self.calc.setObservations(process)
+        self.calc.setObservations(self._to_java(process))
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
         else:
@@ -1184,7 +1302,7 @@ class JidtGaussianMI(JidtGaussian):
             var2 = var2[self.settings['lag_mi']:, :]
 
         self.calc.initialise(var1.shape[1], var2.shape[1])
-        self.calc.setObservations(var1, var2)
+        self.calc.setObservations(self._to_java(var1), self._to_java(var2))
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
         else:
@@ -1228,7 +1346,6 @@ class JidtGaussianCMI(JidtGaussian):
         CalcClass = (jp.JPackage('infodynamics.measures.continuous.gaussian').
                      ConditionalMutualInfoCalculatorMultiVariateGaussian)
         super().__init__(CalcClass, settings)
-        self.est_mi = None
 
     def estimate(self, var1, var2, conditional=None):
         """Estimate conditional mutual information.
@@ -1251,9 +1368,7 @@ class JidtGaussianCMI(JidtGaussian):
         """
         # Return MI if no conditioning variable was provided.
         if conditional is None:
-            if (self.est_mi is None):
-                self.est_mi = JidtGaussianMI(self.settings)
-            return self.est_mi.estimate(var1, var2)
+            return self._get_mi_estimator(JidtGaussianMI).estimate(var1, var2)
         else:
             assert(conditional.size != 0), 'Conditional Array is empty.'
 
@@ -1269,7 +1384,9 @@ class JidtGaussianCMI(JidtGaussian):
                 var1.shape[0], cond.shape[0]))
 
         self.calc.initialise(var1.shape[1], var2.shape[1], cond.shape[1])
-        self.calc.setObservations(var1, var2, cond)
+        self.calc.setObservations(self._to_java(var1),
+                                  self._to_java(var2),
+                                  self._to_java(cond))
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
         else:
@@ -1387,7 +1504,7 @@ class JidtKraskovTE(JidtKraskov):
                              self.settings['history_source'],
                              self.settings['tau_source'],
                              self.settings['source_target_delay'])
-        self.calc.setObservations(source, target)
+        self.calc.setObservations(self._to_java(source), self._to_java(target))
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
         else:
@@ -1490,21 +1607,19 @@ class JidtDiscreteTE(JidtDiscrete):
 
         # And finally make the TE calculation:
         max_base = max(self.settings['alph1'], self.settings['alph2'])
-        calc = self.CalcClass(max_base,
+        calc = self._get_calc(self.CalcClass, max_base,
                               self.settings['history_target'],
                               self.settings['tau_target'],
                               self.settings['history_source'],
                               self.settings['tau_source'],
                               self.settings['source_target_delay'])
         calc.initialise()
-        # Unfortunately no faster way to pass numpy arrays in than this list
-        # conversion
-        calc.addObservations(jp.JArray(jp.JInt, 1)(source.tolist()),
-                             jp.JArray(jp.JInt, 1)(target.tolist()))
+        source = self._to_java(source, jp.JInt)
+        target = self._to_java(target, jp.JInt)
+        calc.addObservations(source, target)
         if self.settings['local_values']:
             result = np.array(calc.computeLocalFromPreviousObservations(
-                jp.JArray(jp.JInt, 1)(source.tolist()),
-                jp.JArray(jp.JInt, 1)(target.tolist())))
+                source, target))
         else:
             result = calc.computeAverageLocalOfObservations()
         if return_calc:
@@ -1615,7 +1730,7 @@ class JidtGaussianTE(JidtGaussian):
                              self.settings['history_source'],
                              self.settings['tau_source'],
                              self.settings['source_target_delay'])
-        self.calc.setObservations(source, target)
+        self.calc.setObservations(self._to_java(source), self._to_java(target))
         if self.settings['local_values']:
             return np.array(self.calc.computeLocalOfPreviousObservations())
         else:
@@ -1647,10 +1762,20 @@ def common_estimate_surrogates_analytic(estimator, n_perm=200, **data):
     # Compute the statistical significance of the estimate to get an
     #  AnalyticMeasurementDistribution object:
     analytic_distribution = estimator.get_analytic_distribution(**data)
-    # Then compute surrogates at n_perm random p-values
-    surrogate_estimates = np.empty(n_perm)
-    for perm in range(n_perm):
-        surrogate_estimates[perm] = \
-            analytic_distribution.computeEstimateForGivenPValue(
-                np.random.random())
-    return surrogate_estimates
+    # Then compute surrogates at n_perm random p-values. Pass all p-values to
+    # the distribution in a single call instead of calling into Java once per
+    # surrogate, fall back to individual calls for distributions that do not
+    # provide the bulk method.
+    pvalues = np.random.random(n_perm)
+    try:
+        compute_estimates = (
+            analytic_distribution.computeEstimatesForGivenPValues)
+    except AttributeError:
+        surrogate_estimates = np.empty(n_perm)
+        for perm in range(n_perm):
+            surrogate_estimates[perm] = (
+                analytic_distribution.computeEstimateForGivenPValue(
+                    pvalues[perm]))
+        return surrogate_estimates
+    return np.array(compute_estimates(jp.JArray(jp.JDouble, 1)(pvalues)),
+                    dtype=np.float64)
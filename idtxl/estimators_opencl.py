@@ -85,6 +85,9 @@ class OpenCLKraskov(Estimator):
     def is_analytic_null_estimator(self):
         return False
 
+    def preferred_dtype(self):
+        return np.float32
+
     def _get_device(self, gpuid):
         """Return GPU devices, context, and queue."""
         all_platforms = cl.get_platforms()
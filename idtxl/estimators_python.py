@@ -0,0 +1,1536 @@
+"""Provide Python (NumPy/SciPy) estimators."""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+import numpy as np
+from scipy.special import digamma
+from scipy.stats import chi2
+from idtxl.estimator import Estimator
+from idtxl.neighbour_search import BACKENDS, get_neighbour_search
+from . import idtxl_utils as utils
+
+
+class PythonKraskov(Estimator):
+    """Abstract class for implementation of Python Kraskov-estimators.
+
+    Abstract class for implementation of Kraskov-Grassberger-Stoegbauer (KSG)
+    estimators in pure Python, child classes implement estimators for mutual
+    information (MI) and conditional mutual information (CMI) for continuous
+    data. Estimators use KSG algorithm 1 with the maximum norm and yield the
+    same results as the corresponding JIDT estimators, but don't require a
+    JAVA virtual machine.
+
+    The distance to the k-th nearest neighbour is found in the joint space,
+    points strictly within this distance are then counted in the marginal
+    spaces. Temporal neighbours within the Theiler window are excluded from
+    both searches. Searches are performed by one of the backends in
+    idtxl.neighbour_search (KD-tree, box-assisted grid search, or brute
+    force), by default the backend is chosen for each space depending on the
+    number of points and the dimension of the space.
+
+    References:
+
+    - Kraskov, A., Stoegbauer, H., & Grassberger, P. (2004). Estimating mutual
+      information. Phys Rev E, 69(6), 066138.
+    - Frenzel, S., & Pompe, B. (2007). Partial mutual information for coupling
+      analysis of multivariate time series. Phys Rev Lett, 99(20), 204101.
+    - Lizier, Joseph T. (2014). JIDT: an information-theoretic toolkit for
+      studying the dynamics of complex systems. Front Robot AI, 1(11).
+
+    Set common estimation parameters for Python Kraskov-estimators. For usage
+    of these estimators see documentation for the child classes.
+
+    Args:
+        settings : dict [optional]
+            set estimator parameters:
+
+            - debug : bool [optional] - return intermediate results, i.e.
+              neighbour counts from range searches and KNN distances
+              (default=False)
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - kraskov_k : int [optional] - no. nearest neighbours for KNN
+              search (default=4)
+            - normalise : bool [optional] - z-standardise data (default=False)
+            - theiler_t : int [optional] - no. next temporal neighbours ignored
+              in KNN and range searches (default=0)
+            - noise_level : float [optional] - random noise added to the data
+              (default=1e-8)
+            - num_threads : int | str [optional] - number of threads used for
+              neighbour searches (default='USE_ALL', note that this uses *all*
+              available threads on the current machine)
+            - chunk_executor : str [optional] - pool used to distribute chunks
+              over num_threads workers when calling estimate_parallel(),
+              'thread' or 'process' (default='thread')
+            - neighbour_search : str [optional] - backend used for neighbour
+              searches, 'kdtree', 'grid', 'brute_force', or 'auto' to choose
+              a backend depending on the no. points and dimension
+              (default='auto')
+    """
+
+    def __init__(self, settings=None):
+        # Set default estimator settings.
+        settings = self._check_settings(settings)
+        settings.setdefault('kraskov_k', int(4))
+        settings.setdefault('normalise', False)
+        settings.setdefault('theiler_t', int(0))
+        settings.setdefault('noise_level', 1e-8)
+        settings.setdefault('num_threads', 'USE_ALL')
+        settings.setdefault('local_values', False)
+        settings.setdefault('debug', False)
+        settings.setdefault('chunk_executor', 'thread')
+        settings.setdefault('neighbour_search', 'auto')
+        if (settings['neighbour_search'] != 'auto' and
+                settings['neighbour_search'] not in BACKENDS):
+            raise RuntimeError(
+                'Unknown neighbour search {0}, use \'auto\' or one of '
+                '{1}.'.format(settings['neighbour_search'],
+                              list(BACKENDS.keys())))
+        if settings['chunk_executor'] not in ['thread', 'process']:
+            raise RuntimeError(
+                'Unknown chunk executor {0}, use \'thread\' or '
+                '\'process\'.'.format(settings['chunk_executor']))
+        self.settings = settings
+
+    def is_parallel(self):
+        return False
+
+    def is_analytic_null_estimator(self):
+        return False
+
+    def preferred_dtype(self):
+        return np.float64
+
+    def _get_workers(self):
+        """Return number of workers used by neighbour searches."""
+        if self.settings['num_threads'] == 'USE_ALL':
+            return -1
+        return int(self.settings['num_threads'])
+
+    def _get_n_chunk_workers(self, n_chunks):
+        """Return number of workers used to estimate multiple chunks."""
+        if self.settings['num_threads'] == 'USE_ALL':
+            n_threads = os.cpu_count() or 1
+        else:
+            n_threads = int(self.settings['num_threads'])
+        return max(1, min(n_threads, n_chunks))
+
+    def _preprocess(self, name, var):
+        """Bring variable into the format used for neighbour searches."""
+        return self._prepare_var(self._ensure_two_dim_input(var))
+
+    def _stack(self, variables, space):
+        """Return realisations in a (marginal) space spanned by variables."""
+        return np.hstack([variables[v] for v in space])
+
+    def _estimate_chunks(self, chunk_data, re_use):
+        """Estimate measure for a list of chunks.
+
+        Variables in re_use are identical for all chunks. They are normalised
+        and noise is added once, neighbour searches for all marginal spaces
+        spanned by re-used variables only are set up once and are shared
+        between chunks. Chunks are then distributed over a thread or process pool
+        (see setting 'chunk_executor'), where each worker uses a single
+        thread for neighbour searches.
+
+        Args:
+            chunk_data : list of dicts
+                realisations of random variables for each chunk
+            re_use : list of keys
+                variables that are re-used over chunks
+
+        Returns:
+            numpy array
+                estimated values for each chunk
+        """
+        shared_vars = {}
+        for v in re_use:
+            if chunk_data[0][v] is not None:
+                shared_vars[v] = self._preprocess(v, chunk_data[0][v])
+        chunks = [{v: c[v] for v in c if v not in shared_vars}
+                  for c in chunk_data]
+        n_workers = self._get_n_chunk_workers(len(chunks))
+        # Searches are multi-threaded only if chunks are estimated serially.
+        search_workers = self._get_workers() if n_workers == 1 else 1
+        shared_searches = {}
+        for space in self._marginal_spaces:
+            if all(v in shared_vars for v in space):
+                shared_searches[space] = self._get_search(
+                    self._stack(shared_vars, space), search_workers)
+
+        results = np.empty((len(chunks)))
+        if n_workers == 1:
+            for i, chunk in enumerate(chunks):
+                results[i] = self._estimate_chunk(
+                    chunk, shared_vars, shared_searches, search_workers)
+        else:
+            if self.settings['chunk_executor'] == 'process':
+                executor = ProcessPoolExecutor
+            else:
+                executor = ThreadPoolExecutor
+            chunksize = int(np.ceil(len(chunks) / n_workers))
+            with executor(max_workers=n_workers) as pool:
+                results[:] = list(pool.map(
+                    self._estimate_chunk, chunks, repeat(shared_vars),
+                    repeat(shared_searches), repeat(search_workers),
+                    chunksize=chunksize))
+        return results
+
+    def _estimate_chunk(self, chunk, shared_vars, shared_searches, workers):
+        """Estimate measure for a single chunk using shared structures."""
+        variables = dict(shared_vars)
+        for v in chunk:
+            if chunk[v] is not None:
+                variables[v] = self._preprocess(v, chunk[v])
+        return self._estimate_prepared(variables, shared_searches, workers)
+
+    def _get_search(self, pointset, workers):
+        """Return neighbour search for a point set."""
+        return get_neighbour_search(
+            pointset, self.settings['neighbour_search'], workers)
+
+    def _prepare_var(self, var):
+        """Normalise variable and add noise if requested, return a copy."""
+        var = np.array(var, dtype=np.float64)
+        if str(self.settings['normalise']).lower() == 'true':
+            var_sd = var.std(axis=0, ddof=1)
+            var_sd[np.isclose(var_sd, 0)] = 1
+            var = (var - var.mean(axis=0)) / var_sd
+        if self.settings['noise_level'] > 0:
+            var += np.random.normal(scale=float(self.settings['noise_level']),
+                                    size=var.shape)
+        return var
+
+    def _knn_radius(self, pointset, workers):
+        """Return distance to the k-th nearest neighbour for each point.
+
+        Distances are calculated using the maximum norm. Points within the
+        Theiler window around a point (including the point itself) are not
+        considered as neighbours.
+
+        Args:
+            pointset : numpy array
+                2D array [realisations x dimension] in the joint space
+            workers : int
+                number of threads used for the search
+
+        Returns:
+            numpy array
+                distance to the k-th neighbour for each point
+        """
+        kraskov_k = int(self.settings['kraskov_k'])
+        theiler_t = int(self.settings['theiler_t'])
+        # Query enough neighbours such that at least k neighbours remain after
+        # excluding all points in the Theiler window (2 * theiler_t + 1 points
+        # including the point itself).
+        n_query = kraskov_k + 2 * theiler_t + 1
+        dist, idx = self._get_search(pointset, workers).knn(n_query)
+        valid = (np.abs(idx - np.arange(pointset.shape[0])[:, np.newaxis]) >
+                 theiler_t)
+        # Neighbours are returned sorted by distance, take the k-th valid
+        # neighbour in each row.
+        kth_valid = np.argmax(np.cumsum(valid, axis=1) == kraskov_k, axis=1)
+        return dist[np.arange(pointset.shape[0]), kth_valid]
+
+    def _range_count(self, pointset, radius, workers, search=None):
+        """Count neighbours strictly within a radius around each point.
+
+        Distances are calculated using the maximum norm. Points within the
+        Theiler window around a point (including the point itself) are not
+        counted.
+
+        Args:
+            pointset : numpy array
+                2D array [realisations x dimension] in a marginal space
+            radius : numpy array
+                search radius for each point
+            workers : int
+                number of threads used for the search
+            search : NeighbourSearch instance [optional]
+                neighbour search set up for pointset, set up if not provided
+
+        Returns:
+            numpy array
+                number of neighbours for each point
+        """
+        theiler_t = int(self.settings['theiler_t'])
+        n_points = pointset.shape[0]
+        # Searches count points with distance <= r, use the next smaller float
+        # to count points strictly within the radius.
+        radius_strict = np.nextafter(radius, 0)
+        if search is None:
+            search = self._get_search(pointset, workers)
+        count = search.count_within(radius_strict)
+        # Remove points in the Theiler window from the count.
+        for lag in range(-theiler_t, theiler_t + 1):
+            idx = np.arange(max(0, -lag), min(n_points, n_points - lag))
+            dist = np.max(np.abs(pointset[idx] - pointset[idx + lag]), axis=1)
+            count[idx] -= (dist <= radius_strict[idx])
+        return count
+
+
+class PythonKraskovCMI(PythonKraskov):
+    """Calculate conditional mutual information with a Python KSG estimator.
+
+    Calculate the conditional mutual information (CMI) between three variables
+    using the Kraskov type 1 estimator implemented in NumPy/SciPy. If no
+    conditional is given (is None), the function returns the mutual
+    information between var1 and var2. See parent class for references.
+
+    Args:
+        settings : dict [optional]
+            set estimator parameters:
+
+            - debug : bool [optional] - return intermediate results, i.e.
+              neighbour counts from range searches and KNN distances
+              (default=False)
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - kraskov_k : int [optional] - no. nearest neighbours for KNN
+              search (default=4)
+            - normalise : bool [optional] - z-standardise data (default=False)
+            - theiler_t : int [optional] - no. next temporal neighbours ignored
+              in KNN and range searches (default=0)
+            - noise_level : float [optional] - random noise added to the data
+              (default=1e-8)
+            - num_threads : int | str [optional] - number of threads used for
+              neighbour searches (default='USE_ALL', note that this uses *all*
+              available threads on the current machine)
+            - chunk_executor : str [optional] - pool used to distribute chunks
+              over num_threads workers when calling estimate_parallel(),
+              'thread' or 'process' (default='thread')
+            - neighbour_search : str [optional] - backend used for neighbour
+              searches, 'kdtree', 'grid', 'brute_force', or 'auto' to choose
+              a backend depending on the no. points and dimension
+              (default='auto')
+
+    Note:
+        Some technical details: IDTxl normalises over raw data once, outside
+        the CMI estimator to save computation time. The Theiler window ignores
+        trial boundaries. The CMI estimator does add noise to the data as a
+        default. To make analysis runs replicable set noise_level to 0.
+    """
+
+    _marginal_spaces = (('var1', 'conditional'), ('var2', 'conditional'),
+                        ('conditional',))
+
+    def __init__(self, settings=None):
+        super().__init__(settings)
+        self.est_mi = None
+
+    def _get_mi_estimator(self):
+        """Return MI estimator used if no conditional is provided."""
+        if self.est_mi is None:
+            self.est_mi = PythonKraskovMI(self.settings)
+        return self.est_mi
+
+    def estimate(self, var1, var2, conditional=None):
+        """Estimate conditional mutual information.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [realisations x variable dimension]
+                or a 1D array representing [realisations]
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+            conditional : numpy array [optional]
+                realisations of the conditioning variable (similar to var), if
+                no conditional is provided, return MI between var1 and var2
+
+        Returns:
+            float | numpy array
+                average CMI over all samples or local CMI for individual
+                samples if 'local_values'=True
+        """
+        # Return MI if no conditional was provided.
+        if conditional is None:
+            return self._get_mi_estimator().estimate(var1, var2)
+        else:
+            assert(conditional.size != 0), 'Conditional Array is empty.'
+        return self._estimate_chunk(
+            {'var1': var1, 'var2': var2, 'conditional': conditional},
+            {}, {}, self._get_workers())
+
+    def _estimate_chunks(self, chunk_data, re_use):
+        # Return MI if no conditional was provided.
+        if chunk_data[0]['conditional'] is None:
+            return self._get_mi_estimator()._estimate_chunks(
+                [{'var1': c['var1'], 'var2': c['var2']} for c in chunk_data],
+                [v for v in re_use if v != 'conditional'])
+        else:
+            assert(chunk_data[0]['conditional'].size != 0), (
+                'Conditional Array is empty.')
+        return super()._estimate_chunks(chunk_data, re_use)
+
+    def _estimate_prepared(self, variables, searches, workers):
+        """Estimate CMI from preprocessed variables and neighbour searches."""
+        var1 = variables['var1']
+        var2 = variables['var2']
+        cond = variables['conditional']
+        # Check if variables have equal no. observations.
+        assert(var1.shape[0] == var2.shape[0]), (
+            'Unequal number of observations (var1: {0}, var2: {1}).'.format(
+                var1.shape[0], var2.shape[0]))
+        assert(var1.shape[0] == cond.shape[0]), (
+            'Unequal number of observations (var1: {0}, cond: {1}).'.format(
+                var1.shape[0], cond.shape[0]))
+
+        # Check if number of points is sufficient for estimation.
+        self._check_number_of_points(var1.shape[0])
+
+        # Find k-th neighbour distance in the joint space, count neighbours
+        # within that distance in the marginal spaces.
+        radius = self._knn_radius(np.hstack((var1, var2, cond)), workers)
+        count = [self._range_count(self._stack(variables, space), radius,
+                                   workers, searches.get(space))
+                 for space in self._marginal_spaces]
+        count_var1_cond, count_var2_cond, count_cond = count
+
+        local_cmi = (digamma(int(self.settings['kraskov_k'])) -
+                     digamma(count_var1_cond + 1) -
+                     digamma(count_var2_cond + 1) +
+                     digamma(count_cond + 1))
+        if self.settings['local_values']:
+            cmi = local_cmi
+        else:
+            cmi = np.mean(local_cmi)
+
+        if self.settings['debug']:
+            return cmi, radius, count_var1_cond, count_var2_cond, count_cond
+        else:
+            return cmi
+
+
+class PythonKraskovMI(PythonKraskov):
+    """Calculate mutual information with a Python KSG estimator.
+
+    Calculate the mutual information (MI) between two variables using the
+    Kraskov type 1 estimator implemented in NumPy/SciPy. See parent class for
+    references.
+
+    Args:
+        settings : dict [optional]
+            set estimator parameters:
+
+            - debug : bool [optional] - return intermediate results, i.e.
+              neighbour counts from range searches and KNN distances
+              (default=False)
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - kraskov_k : int [optional] - no. nearest neighbours for KNN
+              search (default=4)
+            - normalise : bool [optional] - z-standardise data (default=False)
+            - theiler_t : int [optional] - no. next temporal neighbours ignored
+              in KNN and range searches (default=0)
+            - noise_level : float [optional] - random noise added to the data
+              (default=1e-8)
+            - num_threads : int | str [optional] - number of threads used for
+              neighbour searches (default='USE_ALL', note that this uses *all*
+              available threads on the current machine)
+            - chunk_executor : str [optional] - pool used to distribute chunks
+              over num_threads workers when calling estimate_parallel(),
+              'thread' or 'process' (default='thread')
+            - neighbour_search : str [optional] - backend used for neighbour
+              searches, 'kdtree', 'grid', 'brute_force', or 'auto' to choose
+              a backend depending on the no. points and dimension
+              (default='auto')
+            - lag_mi : int [optional] - time difference in samples to calculate
+              the lagged MI between processes (default=0)
+
+    Note:
+        Some technical details: IDTxl normalises over raw data once, outside
+        the MI estimator to save computation time. The Theiler window ignores
+        trial boundaries. The MI estimator does add noise to the data as a
+        default. To make analysis runs replicable set noise_level to 0.
+    """
+
+    _marginal_spaces = (('var1',), ('var2',))
+
+    def __init__(self, settings=None):
+        super().__init__(settings)
+        self.settings.setdefault('lag_mi', 0)
+
+    def estimate(self, var1, var2):
+        """Estimate mutual information.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [realisations x variable dimension]
+                or a 1D array representing [realisations]
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+
+        Returns:
+            float | numpy array
+                average MI over all samples or local MI for individual
+                samples if 'local_values'=True
+        """
+        return self._estimate_chunk({'var1': var1, 'var2': var2}, {}, {},
+                                    self._get_workers())
+
+    def _preprocess(self, name, var):
+        var = self._ensure_two_dim_input(var)
+        # Shift variables to calculate a lagged MI.
+        if self.settings['lag_mi'] > 0:
+            if name == 'var1':
+                var = var[:-self.settings['lag_mi'], :]
+            else:
+                var = var[self.settings['lag_mi']:, :]
+        return self._prepare_var(var)
+
+    def _estimate_prepared(self, variables, searches, workers):
+        """Estimate MI from preprocessed variables and neighbour searches."""
+        var1 = variables['var1']
+        var2 = variables['var2']
+        # Check if variables have equal no. observations.
+        assert(var1.shape[0] == var2.shape[0]), (
+            'Unequal number of observations (var1: {0}, var2: {1}).'.format(
+                var1.shape[0] + self.settings['lag_mi'],
+                var2.shape[0] + self.settings['lag_mi']))
+
+        # Check if number of points is sufficient for estimation.
+        self._check_number_of_points(var1.shape[0])
+
+        # Find k-th neighbour distance in the joint space, count neighbours
+        # within that distance in the marginal spaces.
+        radius = self._knn_radius(np.hstack((var1, var2)), workers)
+        count_var1, count_var2 = [
+            self._range_count(variables[space[0]], radius, workers,
+                              searches.get(space))
+            for space in self._marginal_spaces]
+
+        local_mi = (digamma(int(self.settings['kraskov_k'])) +
+                    digamma(var1.shape[0]) -
+                    digamma(count_var1 + 1) -
+                    digamma(count_var2 + 1))
+        if self.settings['local_values']:
+            mi = local_mi
+        else:
+            mi = np.mean(local_mi)
+
+        if self.settings['debug']:
+            return mi, radius, count_var1, count_var2
+        else:
+            return mi
+
+
+class PythonGaussian(Estimator):
+    """Abstract class for implementation of Python Gaussian-estimators.
+
+    Abstract class for implementation of linear Gaussian estimators in pure
+    Python, child classes implement estimators for mutual information (MI) and
+    conditional mutual information (CMI) for continuous data. For jointly
+    Gaussian variables, (C)MI can be expressed in terms of log-determinants of
+    the variables' covariance matrices, e.g.,
+
+        I(X;Y|Z) = 0.5 * (log|S_xz| + log|S_yz| - log|S_z| - log|S_xyz|).
+
+    The estimators support parallel estimation over chunks of data: the
+    covariance matrices of the joint space are computed for all chunks at once
+    and log-determinants of all sub-blocks are calculated in a single batched
+    call. Results are identical to the JIDT Gaussian estimators.
+
+    References:
+
+    - Barnett, L., Barrett, A. B., & Seth, A. K. (2009). Granger causality and
+      transfer entropy are equivalent for Gaussian variables. Phys Rev Lett,
+      103(23), 238701.
+    - Lizier, Joseph T. (2014). JIDT: an information-theoretic toolkit for
+      studying the dynamics of complex systems. Front Robot AI, 1(11).
+
+    Set common estimation parameters for Python Gaussian-estimators. For usage
+    of these estimators see documentation for the child classes.
+
+    Args:
+        settings : dict [optional]
+            set estimator parameters:
+
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+    """
+
+    def __init__(self, settings=None):
+        # Set default estimator settings.
+        settings = self._check_settings(settings)
+        settings.setdefault('local_values', False)
+        self.settings = settings
+
+    def is_parallel(self):
+        return True
+
+    def is_analytic_null_estimator(self):
+        return False
+
+    def preferred_dtype(self):
+        return np.float64
+
+    def _reshape_chunks(self, var, n_chunks):
+        """Reshape realisations into [n_chunks x chunk length x dimension]."""
+        var = self._ensure_two_dim_input(var)
+        assert var.shape[0] % n_chunks == 0, (
+            'No. chunks ({0}) does not match data length ({1}).'.format(
+                n_chunks, var.shape[0]))
+        return var.reshape(n_chunks, var.shape[0] // n_chunks, var.shape[1])
+
+    def _estimate_blocks(self, variables, terms):
+        """Estimate a linear combination of Gaussian entropies for all chunks.
+
+        Args:
+            variables : list of numpy arrays
+                realisations for each variable, each array has dimensions
+                [n_chunks x chunk length x variable dimension]
+            terms : list of tuples
+                each tuple holds the sign of the entropy term and the indices
+                of variables spanning the (marginal) space
+
+        Returns:
+            numpy array
+                average estimate for each chunk or local estimates for each
+                realisation if 'local_values'=True
+        """
+        joint = np.concatenate(variables, axis=2).astype(np.float64)
+        n_chunks, chunklength, _ = joint.shape
+        if chunklength < 2:
+            raise RuntimeError('Insufficient number of points ({0}) to '
+                               'estimate covariance.'.format(chunklength))
+        joint = joint - joint.mean(axis=1, keepdims=True)
+        cov = np.einsum('cni,cnj->cij', joint, joint) / (chunklength - 1)
+
+        # Find column indices of each variable in the joint space.
+        bounds = np.cumsum([0] + [v.shape[2] for v in variables])
+        cols = [np.arange(bounds[i], bounds[i + 1])
+                for i in range(len(variables))]
+
+        estimate = np.zeros(n_chunks)
+        local = np.zeros((n_chunks, chunklength))
+        singular = np.zeros(n_chunks, dtype=bool)
+        for sign, space in terms:
+            idx = np.concatenate([cols[i] for i in space])
+            cov_space = cov[:, idx[:, np.newaxis], idx]
+            det_sign, logdet = np.linalg.slogdet(cov_space)
+            singular |= (det_sign <= 0) | ~np.isfinite(logdet)
+            if singular.all():
+                break
+            # Exclude singular chunks from the sums, their results are set to
+            # zero below.
+            logdet[singular] = 0
+            # Gaussian entropy: H = 0.5 * log|S| + c, where constants cancel
+            # in the linear combination.
+            estimate += sign * 0.5 * logdet
+            if self.settings['local_values']:
+                # Local terms: -log p(v) = 0.5 * (log|S| + v' S^-1 v) + c
+                # Avoid inverting singular matrices, the local values of
+                # these chunks are set to zero below.
+                cov_space[singular] = np.eye(len(idx))
+                v = joint[:, :, idx]
+                maha = np.einsum('cni,cni->cn', v, np.linalg.solve(
+                    cov_space, v.transpose(0, 2, 1)).transpose(0, 2, 1))
+                local += sign * 0.5 * (logdet[:, np.newaxis] + maha)
+
+        # As JIDT, return zero if the covariance matrix of a chunk is not
+        # positive definite, i.e., if variables are linearly redundant.
+        estimate[singular] = 0
+        local[singular] = 0
+        if self.settings['local_values']:
+            return local.ravel()
+        else:
+            return estimate
+
+
+class PythonGaussianCMI(PythonGaussian):
+    """Calculate conditional mutual information with a Python Gaussian estimator.
+
+    Calculate the conditional mutual information (CMI) between three variables
+    using a linear Gaussian estimator implemented in NumPy. If no conditional
+    is given (is None), the function returns the mutual information between
+    var1 and var2. See parent class for references.
+
+    Args:
+        settings : dict [optional]
+            set estimator parameters:
+
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+    """
+
+    def __init__(self, settings=None):
+        super().__init__(settings)
+        # MI estimator used if no conditional is provided.
+        self.est_mi = PythonGaussianMI(self.settings)
+
+    def estimate(self, var1, var2, conditional=None, n_chunks=1):
+        """Estimate conditional mutual information.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [(realisations * n_chunks) x
+                variable dimension] or a 1D array representing [realisations]
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+            conditional : numpy array [optional]
+                realisations of the conditioning variable (similar to var), if
+                no conditional is provided, return MI between var1 and var2
+            n_chunks : int [optional]
+                number of data chunks, no. data points has to be the same for
+                each chunk (default=1)
+
+        Returns:
+            numpy array
+                average CMI over all samples for each chunk or local CMI for
+                individual samples if 'local_values'=True
+        """
+        # Return MI if no conditional was provided.
+        if conditional is None:
+            return self.est_mi.estimate(var1, var2, n_chunks)
+        else:
+            assert(conditional.size != 0), 'Conditional Array is empty.'
+
+        var1 = self._ensure_two_dim_input(var1)
+        var2 = self._ensure_two_dim_input(var2)
+        conditional = self._ensure_two_dim_input(conditional)
+        assert(var1.shape[0] == var2.shape[0]), (
+            'Unequal number of observations (var1: {0}, var2: {1}).'.format(
+                var1.shape[0], var2.shape[0]))
+        assert(var1.shape[0] == conditional.shape[0]), (
+            'Unequal number of observations (var1: {0}, cond: {1}).'.format(
+                var1.shape[0], conditional.shape[0]))
+        variables = [self._reshape_chunks(v, n_chunks)
+                     for v in [var1, var2, conditional]]
+        # I(X;Y|Z) = H(X,Z) + H(Y,Z) - H(Z) - H(X,Y,Z)
+        return self._estimate_blocks(
+            variables, [(1, (0, 2)), (1, (1, 2)), (-1, (2,)), (-1, (0, 1, 2))])
+
+
+class PythonGaussianMI(PythonGaussian):
+    """Calculate mutual information with a Python Gaussian estimator.
+
+    Calculate the mutual information (MI) between two variables using a linear
+    Gaussian estimator implemented in NumPy. See parent class for references.
+
+    Args:
+        settings : dict [optional]
+            set estimator parameters:
+
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - lag_mi : int [optional] - time difference in samples to calculate
+              the lagged MI between processes (default=0)
+    """
+
+    def __init__(self, settings=None):
+        super().__init__(settings)
+        self.settings.setdefault('lag_mi', 0)
+
+    def estimate(self, var1, var2, n_chunks=1):
+        """Estimate mutual information.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [(realisations * n_chunks) x
+                variable dimension] or a 1D array representing [realisations]
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+            n_chunks : int [optional]
+                number of data chunks, no. data points has to be the same for
+                each chunk (default=1)
+
+        Returns:
+            numpy array
+                average MI over all samples for each chunk or local MI for
+                individual samples if 'local_values'=True
+        """
+        var1 = self._ensure_two_dim_input(var1)
+        var2 = self._ensure_two_dim_input(var2)
+        assert(var1.shape[0] == var2.shape[0]), (
+            'Unequal number of observations (var1: {0}, var2: {1}).'.format(
+                var1.shape[0], var2.shape[0]))
+        var1 = self._reshape_chunks(var1, n_chunks)
+        var2 = self._reshape_chunks(var2, n_chunks)
+
+        # Shift variables within each chunk to calculate a lagged MI.
+        lag = self.settings['lag_mi']
+        if lag > 0:
+            var1 = var1[:, :-lag, :]
+            var2 = var2[:, lag:, :]
+
+        # I(X;Y) = H(X) + H(Y) - H(X,Y)
+        return self._estimate_blocks(
+            [var1, var2], [(1, (0,)), (1, (1,)), (-1, (0, 1))])
+
+
+class ChiSquareNullDistribution():
+    """Analytic null distribution of plug-in estimates for discrete data.
+
+    Under the null hypothesis of no relationship between two discrete
+    variables (in the context of a conditional), 2 * N * ln(2) * I, where I is
+    the plug-in (C)MI estimate in bits from N observations, is chi-square
+    distributed with degrees of freedom depending on the variables' alphabet
+    sizes.
+
+    References:
+
+    - Brillinger, D. R. (2004). Some data analyses using mutual information.
+      Braz J Probab Stat, 18(2), 163-182.
+    - Lizier, Joseph T. (2014). JIDT: an information-theoretic toolkit for
+      studying the dynamics of complex systems. Front Robot AI, 1(11).
+
+    Args:
+        n_observations : int
+            number of observations the estimate was calculated from
+        degrees_of_freedom : int
+            degrees of freedom of the chi-square distribution
+    """
+
+    def __init__(self, n_observations, degrees_of_freedom):
+        self.n_observations = n_observations
+        self.degrees_of_freedom = degrees_of_freedom
+
+    def estimate_for_pvalue(self, pvalue):
+        """Return the estimate (in bits) that has the given p-value.
+
+        Args:
+            pvalue : float | numpy array
+                p-value(s)
+
+        Returns:
+            float | numpy array
+                estimate(s) under the null distribution
+        """
+        return (chi2.isf(pvalue, self.degrees_of_freedom) /
+                (2 * self.n_observations * np.log(2)))
+
+    # Use the method name of JIDT's analytic distributions such that objects
+    # can be used interchangeably, e.g., in
+    # estimators_jidt.common_estimate_surrogates_analytic().
+    computeEstimateForGivenPValue = estimate_for_pvalue
+    computeEstimatesForGivenPValues = estimate_for_pvalue
+
+
+class PythonDiscrete(Estimator):
+    """Abstract class for implementation of Python discrete estimators.
+
+    Abstract class for implementation of plug-in estimators for discrete data
+    in pure Python. Child classes implement estimators for mutual information
+    (MI), conditional mutual information (CMI), active information storage
+    (AIS), and transfer entropy (TE). Estimates are returned in bits and are
+    identical to the JIDT discrete estimators.
+
+    Probabilities are estimated from joint histograms that are computed with
+    np.bincount over combined symbols. The estimators support parallel
+    estimation over chunks of data: each chunk enters the histogram as an
+    additional variable such that all chunks are handled in a single pass.
+    The estimators provide analytic surrogate distributions (see
+    ChiSquareNullDistribution).
+
+    Set common estimation parameters for discrete Python estimators. For usage
+    of these estimators see documentation for the child classes.
+
+    Args:
+        settings : dict [optional]
+            set estimator parameters:
+
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - discretise_method : str [optional] - if and how to discretise
+              incoming continuous data, can be 'max_ent' for maximum entropy
+              binning, 'equal' for equal size bins, and 'none' if no binning is
+              required (default='none')
+    """
+
+    # Maximum number of bins for which histograms are allocated densely,
+    # larger histograms are computed over occupied bins only.
+    _max_dense_bins = 2 ** 24
+
+    def __init__(self, settings=None):
+        # Set default estimator settings.
+        settings = self._check_settings(settings)
+        settings.setdefault('local_values', False)
+        settings.setdefault('discretise_method', 'none')
+        self.settings = settings
+
+    def is_parallel(self):
+        return True
+
+    def is_analytic_null_estimator(self):
+        return True
+
+    def _discretise_var(self, var, alph, name, n_chunks):
+        """Discretise variable or check that it is discrete.
+
+        Continuous data are discretised for each chunk individually.
+        """
+        if self.settings['discretise_method'] == 'equal':
+            return np.concatenate([utils.discretise(c, alph)
+                                   for c in np.split(var, n_chunks)])
+        elif self.settings['discretise_method'] == 'max_ent':
+            return np.concatenate([utils.discretise_max_ent(c, alph)
+                                   for c in np.split(var, n_chunks)])
+        elif self.settings['discretise_method'] == 'none':
+            assert issubclass(var.dtype.type, np.integer), (
+                '{0} is not an integer numpy array. '
+                'Discretise data to use this estimator.'.format(name))
+            assert np.min(var) >= 0, (
+                'Minimum of {0} is smaller than 0.'.format(name.lower()))
+            assert np.max(var) < alph, (
+                'Maximum of {0} is larger than the alphabet size.'.format(
+                    name.lower()))
+            return var
+        else:
+            raise ValueError('Unkown discretisation method.')
+
+    def _chunk_index(self, n_chunks, chunklength):
+        """Return the chunk index of each realisation."""
+        return np.repeat(np.arange(n_chunks), chunklength)
+
+    def _embed(self, process, alph, history, tau, delay, start):
+        """Return combined past states of chunked 1D processes.
+
+        Args:
+            process : numpy array
+                discrete process [n_chunks x chunk length]
+            alph : int
+                alphabet size of the process
+            history : int
+                number of past samples in the embedding
+            tau : int
+                spacing between past samples
+            delay : int
+                lag of the most recent past sample w.r.t. the current value
+            start : int
+                first current value for which a past state is returned
+
+        Returns:
+            numpy array
+                combined past states [n_chunks x (chunk length - start)]
+        """
+        idx = np.arange(start, process.shape[1])
+        state = np.zeros((process.shape[0], idx.size), dtype=np.int_)
+        for i in range(history):
+            state = state * alph + process[:, idx - delay - i * tau]
+        return state
+
+    def _compress(self, symbols):
+        """Map symbols to consecutive integers."""
+        uniq, symbols = np.unique(symbols, return_inverse=True)
+        return symbols.ravel(), uniq.size
+
+    def _local_counts(self, symbols, alphabet_sizes):
+        """Return the count of each realisation's joint symbol.
+
+        Args:
+            symbols : list of numpy arrays
+                1D arrays of discrete symbols for each variable
+            alphabet_sizes : list of ints
+                alphabet size of each variable
+
+        Returns:
+            numpy array
+                number of occurrences of the joint symbol of each realisation
+        """
+        joint = symbols[0]
+        n_joint = int(alphabet_sizes[0])
+        for s, n in zip(symbols[1:], alphabet_sizes[1:]):
+            if n_joint * int(n) > np.iinfo(np.int_).max:
+                joint, n_joint = self._compress(joint)
+            joint = joint * int(n) + s
+            n_joint *= int(n)
+        if n_joint > self._max_dense_bins:
+            joint, n_joint = self._compress(joint)
+        return np.bincount(joint, minlength=n_joint)[joint]
+
+    def _plugin_estimate(self, terms, n_chunks, n_obs):
+        """Return local or average plug-in estimates for all chunks.
+
+        Args:
+            terms : list of tuples
+                each tuple holds the sign of the log-probability in the local
+                estimate, a list of symbols and a list of alphabet sizes
+                spanning the (marginal) space
+            n_chunks : int
+                number of chunks
+            n_obs : int
+                number of observations per chunk
+
+        Returns:
+            numpy array
+                local estimates [n_chunks x n_obs]
+        """
+        local = np.zeros(n_chunks * n_obs)
+        for sign, symbols, alphabet_sizes in terms:
+            local += sign * (
+                np.log2(self._local_counts(symbols, alphabet_sizes)) -
+                np.log2(n_obs))
+        return local.reshape(n_chunks, n_obs)
+
+    def _return_estimate(self, local, n_skipped=0):
+        """Return average estimate per chunk or local estimates.
+
+        Local estimates are returned for all realisations, where the first
+        n_skipped realisations of each chunk, for which no estimate exists
+        (e.g., due to the embedding of past states), are set to zero.
+        """
+        if self.settings['local_values']:
+            return np.hstack((np.zeros((local.shape[0], n_skipped)),
+                              local)).ravel()
+        else:
+            return local.mean(axis=1)
+
+    def estimate_surrogates_analytic(self, n_perm=200, **data):
+        """Return estimate of the analytical surrogate distribution.
+
+        This method must be implemented because this class'
+        is_analytic_null_estimator() method returns true.
+
+        Args:
+            n_perms : int [optional]
+                number of permutations (default=200)
+            data : numpy arrays
+                realisations of random variables required for the calculation
+                (varies between estimators, e.g. 2 variables for MI, 3 for
+                CMI). Formatted as per the estimate method for this estimator.
+
+        Returns:
+            numpy array
+                n_perm surrogates of the average MI/CMI/TE over all samples
+                under the null hypothesis of no relationship between var1 and
+                var2 (in the context of conditional)
+        """
+        analytic_distribution = self.get_analytic_distribution(**data)
+        return analytic_distribution.estimate_for_pvalue(
+            np.random.random(n_perm))
+
+
+class PythonDiscreteCMI(PythonDiscrete):
+    """Calculate CMI with a Python plug-in estimator for discrete variables.
+
+    Calculate the conditional mutual information between two variables given
+    the third using a plug-in estimator implemented in NumPy. See parent class
+    for references.
+
+    Args:
+        settings : dict [optional]
+            sets estimation parameters:
+
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - discretise_method : str [optional] - if and how to discretise
+              incoming continuous data, can be 'max_ent' for maximum entropy
+              binning, 'equal' for equal size bins, and 'none' if no binning is
+              required (default='none')
+            - n_discrete_bins : int [optional] - number of discrete bins/
+              levels or the base of each dimension of the discrete variables
+              (default=2). If set, this parameter overwrites/sets alph1, alph2
+              and alphc
+            - alph1 : int [optional] - number of discrete bins/levels for var1
+              (default=2, or the value set for n_discrete_bins)
+            - alph2 : int [optional] - number of discrete bins/levels for var2
+              (default=2, or the value set for n_discrete_bins)
+            - alphc : int [optional] - number of discrete bins/levels for
+              conditional (default=2, or the value set for n_discrete_bins)
+    """
+
+    def __init__(self, settings=None):
+        # Set default alphabet sizes. Try to overwrite alphabet sizes with
+        # number of bins for discretisation if provided, otherwise assume
+        # binary variables.
+        super().__init__(settings)
+        try:
+            n_discrete_bins = int(self.settings['n_discrete_bins'])
+            self.settings['alph1'] = n_discrete_bins
+            self.settings['alph2'] = n_discrete_bins
+            self.settings['alphc'] = n_discrete_bins
+        except KeyError:
+            pass  # Do nothing and use the default for alph_* set below
+        self.settings.setdefault('alph1', int(2))
+        self.settings.setdefault('alph2', int(2))
+        self.settings.setdefault('alphc', int(2))
+        # MI estimator used if no conditional is provided.
+        self.est_mi = PythonDiscreteMI(self.settings)
+
+    def _get_symbols(self, var1, var2, conditional, n_chunks):
+        """Return combined symbols and alphabet sizes of all variables."""
+        symbols = []
+        alphabet_sizes = []
+        for var, alph, name in zip([var1, var2, conditional],
+                                   [self.settings['alph1'],
+                                    self.settings['alph2'],
+                                    self.settings['alphc']],
+                                   ['Var1', 'Var2', 'Conditional']):
+            var = self._ensure_two_dim_input(var)
+            assert var.shape[0] % n_chunks == 0, (
+                'No. chunks ({0}) does not match data length ({1}).'.format(
+                    n_chunks, var.shape[0]))
+            var = self._discretise_var(var, alph, name, n_chunks)
+            symbols.append(utils.combine_discrete_dimensions(var, alph))
+            alphabet_sizes.append(int(alph) ** var.shape[1])
+        assert(symbols[0].shape[0] == symbols[1].shape[0]), (
+            'Unequal number of observations (var1: {0}, var2: {1}).'.format(
+                symbols[0].shape[0], symbols[1].shape[0]))
+        assert(symbols[0].shape[0] == symbols[2].shape[0]), (
+            'Unequal number of observations (var1: {0}, cond: {1}).'.format(
+                symbols[0].shape[0], symbols[2].shape[0]))
+        return symbols, alphabet_sizes
+
+    def estimate(self, var1, var2, conditional=None, n_chunks=1):
+        """Estimate conditional mutual information.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [(realisations * n_chunks) x
+                variable dimension] or a 1D array representing [realisations],
+                array type can be float (requires discretisation) or int
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+            conditional : numpy array [optional]
+                realisations of the conditioning variable (similar to var), if
+                no conditional is provided, return MI between var1 and var2
+            n_chunks : int [optional]
+                number of data chunks, no. data points has to be the same for
+                each chunk (default=1)
+
+        Returns:
+            numpy array
+                average CMI over all samples for each chunk or local CMI for
+                individual samples if 'local_values'=True
+        """
+        # Calculate an MI if no conditional was provided
+        if (conditional is None) or (self.settings['alphc'] == 0):
+            return self.est_mi.estimate(var1, var2, n_chunks)
+        else:
+            assert(conditional.size != 0), 'Conditional Array is empty.'
+
+        [v1, v2, c], [a1, a2, ac] = self._get_symbols(var1, var2, conditional,
+                                                      n_chunks)
+        n_obs = v1.shape[0] // n_chunks
+        chunk = self._chunk_index(n_chunks, n_obs)
+        # i(x;y|z) = log p(x,y,z) + log p(z) - log p(x,z) - log p(y,z)
+        local = self._plugin_estimate([
+            (1, [chunk, v1, v2, c], [n_chunks, a1, a2, ac]),
+            (1, [chunk, c], [n_chunks, ac]),
+            (-1, [chunk, v1, c], [n_chunks, a1, ac]),
+            (-1, [chunk, v2, c], [n_chunks, a2, ac])], n_chunks, n_obs)
+        return self._return_estimate(local)
+
+    def get_analytic_distribution(self, var1, var2, conditional=None):
+        """Return analytic null distribution of the CMI estimate.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [realisations x variable dimension]
+                or a 1D array representing [realisations], array type can be
+                float (requires discretisation) or int
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+            conditional : numpy array [optional]
+                realisations of the conditioning variable (similar to var), if
+                no conditional is provided, return MI between var1 and var2
+
+        Returns:
+            ChiSquareNullDistribution instance
+                analytic distribution of the estimate under the null hypothesis
+        """
+        if (conditional is None) or (self.settings['alphc'] == 0):
+            return self.est_mi.get_analytic_distribution(var1, var2)
+        [v1, v2, c], [a1, a2, ac] = self._get_symbols(var1, var2, conditional,
+                                                      1)
+        return ChiSquareNullDistribution(v1.shape[0], (a1 - 1) * (a2 - 1) * ac)
+
+
+class PythonDiscreteMI(PythonDiscrete):
+    """Calculate MI with a Python plug-in estimator for discrete variables.
+
+    Calculate the mutual information (MI) between two variables using a
+    plug-in estimator implemented in NumPy. See parent class for references.
+
+    Args:
+        settings : dict [optional]
+            sets estimation parameters:
+
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - discretise_method : str [optional] - if and how to discretise
+              incoming continuous data, can be 'max_ent' for maximum entropy
+              binning, 'equal' for equal size bins, and 'none' if no binning is
+              required (default='none')
+            - n_discrete_bins : int [optional] - number of discrete bins/
+              levels or the base of each dimension of the discrete variables
+              (default=2). If set, this parameter overwrites/sets alph1 and
+              alph2
+            - alph1 : int [optional] - number of discrete bins/levels for var1
+              (default=2, or the value set for n_discrete_bins)
+            - alph2 : int [optional] - number of discrete bins/levels for var2
+              (default=2, or the value set for n_discrete_bins)
+            - lag_mi : int [optional] - time difference in samples to calculate
+              the lagged MI between processes (default=0)
+    """
+
+    def __init__(self, settings=None):
+        # Set default alphabet sizes. Try to overwrite alphabet sizes with
+        # number of bins for discretisation if provided, otherwise assume
+        # binary variables.
+        super().__init__(settings)
+        self.settings.setdefault('lag_mi', int(0))
+        try:
+            n_discrete_bins = int(self.settings['n_discrete_bins'])
+            self.settings['alph1'] = n_discrete_bins
+            self.settings['alph2'] = n_discrete_bins
+        except KeyError:
+            pass  # Do nothing and use the default for alph_* set below
+        self.settings.setdefault('alph1', int(2))
+        self.settings.setdefault('alph2', int(2))
+
+    def _get_symbols(self, var1, var2, n_chunks):
+        """Return combined and lagged symbols and alphabet sizes."""
+        symbols = []
+        alphabet_sizes = []
+        for var, alph, name in zip([var1, var2],
+                                   [self.settings['alph1'],
+                                    self.settings['alph2']],
+                                   ['Var1', 'Var2']):
+            var = self._ensure_two_dim_input(var)
+            assert var.shape[0] % n_chunks == 0, (
+                'No. chunks ({0}) does not match data length ({1}).'.format(
+                    n_chunks, var.shape[0]))
+            var = self._discretise_var(var, alph, name, n_chunks)
+            symbols.append(utils.combine_discrete_dimensions(
+                var, alph).reshape(n_chunks, -1))
+            alphabet_sizes.append(int(alph) ** var.shape[1])
+        assert(symbols[0].shape == symbols[1].shape), (
+            'Unequal number of observations (var1: {0}, var2: {1}).'.format(
+                symbols[0].size, symbols[1].size))
+
+        # Shift variables within each chunk to calculate a lagged MI.
+        lag = self.settings['lag_mi']
+        if lag > 0:
+            symbols = [symbols[0][:, :-lag], symbols[1][:, lag:]]
+        return [s.ravel() for s in symbols], alphabet_sizes
+
+    def estimate(self, var1, var2, n_chunks=1):
+        """Estimate mutual information.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [(realisations * n_chunks) x
+                variable dimension] or a 1D array representing [realisations],
+                array type can be float (requires discretisation) or int
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+            n_chunks : int [optional]
+                number of data chunks, no. data points has to be the same for
+                each chunk (default=1)
+
+        Returns:
+            numpy array
+                average MI over all samples for each chunk or local MI for
+                individual samples if 'local_values'=True
+        """
+        [v1, v2], [a1, a2] = self._get_symbols(var1, var2, n_chunks)
+        n_obs = v1.shape[0] // n_chunks
+        chunk = self._chunk_index(n_chunks, n_obs)
+        # i(x;y) = log p(x,y) - log p(x) - log p(y)
+        local = self._plugin_estimate([
+            (1, [chunk, v1, v2], [n_chunks, a1, a2]),
+            (-1, [chunk, v1], [n_chunks, a1]),
+            (-1, [chunk, v2], [n_chunks, a2])], n_chunks, n_obs)
+        return self._return_estimate(local)
+
+    def get_analytic_distribution(self, var1, var2):
+        """Return analytic null distribution of the MI estimate.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [realisations x variable dimension]
+                or a 1D array representing [realisations], array type can be
+                float (requires discretisation) or int
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+
+        Returns:
+            ChiSquareNullDistribution instance
+                analytic distribution of the estimate under the null hypothesis
+        """
+        [v1, v2], [a1, a2] = self._get_symbols(var1, var2, 1)
+        return ChiSquareNullDistribution(v1.shape[0], (a1 - 1) * (a2 - 1))
+
+
+class PythonDiscreteAIS(PythonDiscrete):
+    """Calculate AIS with a Python plug-in estimator for discrete variables.
+
+    Calculate the active information storage (AIS) for one process using a
+    plug-in estimator implemented in NumPy. AIS is defined as the mutual
+    information between the processes' past state and current value. See
+    parent class for references.
+
+    Args:
+        settings : dict
+            set estimator parameters:
+
+            - history : int - number of samples in the target's past used as
+              embedding
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+            - discretise_method : str [optional] - if and how to discretise
+              incoming continuous data, can be 'max_ent' for maximum entropy
+              binning, 'equal' for equal size bins, and 'none' if no binning is
+              required (default='none')
+            - n_discrete_bins : int [optional] - number of discrete bins/
+              levels or the base of each dimension of the discrete variables
+              (default=2). If set, this parameter overwrites/sets alph
+            - alph : int [optional] - number of discrete bins/levels for var1
+              (default=2 , or the value set for n_discrete_bins)
+    """
+
+    def __init__(self, settings):
+        if type(settings) is not dict:
+            raise TypeError('settings should be a dictionary.')
+        try:
+            settings['history']
+        except KeyError:
+            raise RuntimeError('No history was provided for AIS estimation.')
+        assert type(settings['history']) is int, (
+                                            'History has to be an integer.')
+
+        # Get alphabet sizes and check if discretisation is requested
+        try:
+            n_discrete_bins = int(settings['n_discrete_bins'])
+            settings['alph'] = n_discrete_bins
+        except KeyError:
+            pass  # Do nothing and use the default for alph_* set below
+        settings.setdefault('alph', int(2))
+        super().__init__(settings)
+
+    def _get_symbols(self, process, n_chunks):
+        """Return current values and past states of a process."""
+        process = self._ensure_one_dim_input(process)
+        assert process.shape[0] % n_chunks == 0, (
+            'No. chunks ({0}) does not match data length ({1}).'.format(
+                n_chunks, process.shape[0]))
+        process = self._discretise_var(process, self.settings['alph'],
+                                       'Process', n_chunks)
+        process = process.reshape(n_chunks, -1)
+        history = self.settings['history']
+        past = self._embed(process, self.settings['alph'], history, 1, 1,
+                           history)
+        return process[:, history:].ravel(), past.ravel()
+
+    def estimate(self, process, n_chunks=1):
+        """Estimate active information storage.
+
+        Args:
+            process : numpy array
+                realisations as either a 2D numpy array where array dimensions
+                represent [(realisations * n_chunks) x variable dimension] or
+                a 1D array representing [realisations], array type can be
+                float (requires discretisation) or int
+            n_chunks : int [optional]
+                number of data chunks, no. data points has to be the same for
+                each chunk (default=1)
+
+        Returns:
+            numpy array
+                average AIS over all samples for each chunk or local AIS for
+                individual samples if 'local_values'=True
+        """
+        current, past = self._get_symbols(process, n_chunks)
+        alph = self.settings['alph']
+        n_past = alph ** self.settings['history']
+        n_obs = current.shape[0] // n_chunks
+        chunk = self._chunk_index(n_chunks, n_obs)
+        local = self._plugin_estimate([
+            (1, [chunk, current, past], [n_chunks, alph, n_past]),
+            (-1, [chunk, current], [n_chunks, alph]),
+            (-1, [chunk, past], [n_chunks, n_past])], n_chunks, n_obs)
+        return self._return_estimate(local, self.settings['history'])
+
+    def get_analytic_distribution(self, process):
+        """Return analytic null distribution of the AIS estimate.
+
+        Args:
+            process : numpy array
+                realisations as either a 2D numpy array where array dimensions
+                represent [realisations x variable dimension] or a 1D array
+                representing [realisations], array type can be float (requires
+                discretisation) or int
+
+        Returns:
+            ChiSquareNullDistribution instance
+                analytic distribution of the estimate under the null hypothesis
+        """
+        current, past = self._get_symbols(process, 1)
+        alph = self.settings['alph']
+        return ChiSquareNullDistribution(
+            current.shape[0],
+            (alph ** self.settings['history'] - 1) * (alph - 1))
+
+
+class PythonDiscreteTE(PythonDiscrete):
+    """Calculate TE with a Python plug-in estimator for discrete variables.
+
+    Calculate the transfer entropy between two time series processes using a
+    plug-in estimator implemented in NumPy. Transfer entropy is defined as the
+    conditional mutual information between the source's past state and the
+    target's current value, conditional on the target's past. See parent
+    class for references.
+
+    Args:
+        settings : dict
+            sets estimation parameters:
+
+            - history_target : int - number of samples in the target's past
+              used as embedding
+            - history_source  : int [optional] - number of samples in the
+              source's past used as embedding (default=same as the target
+              history)
+            - tau_source : int [optional] - source's embedding delay
+              (default=1)
+            - tau_target : int [optional] - target's embedding delay
+              (default=1)
+            - source_target_delay : int [optional] - information transfer delay
+              between source and target (default=1)
+            - discretise_method : str [optional] - if and how to discretise
+              incoming continuous data, can be 'max_ent' for maximum entropy
+              binning, 'equal' for equal size bins, and 'none' if no binning is
+              required (default='none')
+            - n_discrete_bins : int [optional] - number of discrete bins/
+              levels or the base of each dimension of the discrete variables
+              (default=2). If set, this parameter overwrites/sets alph1 and
+              alph2
+            - alph1 : int [optional] - number of discrete bins/levels for
+              source (default=2, or the value set for n_discrete_bins)
+            - alph2 : int [optional] - number of discrete bins/levels for
+              target (default=2, or the value set for n_discrete_bins)
+            - local_values : bool [optional] - return local TE instead of
+              average TE (default=False)
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+
+        # Get embedding and delay parameters.
+        try:
+            history_target = self.settings['history_target']
+        except KeyError:
+            raise RuntimeError('No target history was provided for TE '
+                               'estimation.')
+        self.settings.setdefault('history_source', history_target)
+        self.settings.setdefault('tau_target', 1)
+        self.settings.setdefault('tau_source', 1)
+        self.settings.setdefault('source_target_delay', 1)
+        for p in ['history_target', 'history_source', 'tau_target',
+                  'tau_source', 'source_target_delay']:
+            assert type(self.settings[p]) is int, (
+                '{0} has to be an integer.'.format(p))
+
+        # Get alphabet sizes and check if discretisation is requested. Try to
+        # overwrite alphabet sizes with number of bins.
+        try:
+            n_discrete_bins = int(settings['n_discrete_bins'])
+            settings['alph1'] = n_discrete_bins
+            settings['alph2'] = n_discrete_bins
+        except KeyError:
+            # do nothing and set alphabet sizes to default below
+            pass
+        self.settings.setdefault('alph1', int(2))
+        self.settings.setdefault('alph2', int(2))
+
+    def _get_start(self):
+        """Return index of the first current value with a full embedding."""
+        return max((self.settings['history_target'] - 1) *
+                   self.settings['tau_target'] + 1,
+                   (self.settings['history_source'] - 1) *
+                   self.settings['tau_source'] +
+                   self.settings['source_target_delay'])
+
+    def _get_symbols(self, source, target, n_chunks):
+        """Return source past, target current value, and target past."""
+        processes = []
+        for var, alph, name in zip([source, target],
+                                   [self.settings['alph1'],
+                                    self.settings['alph2']],
+                                   ['Source', 'Target']):
+            var = self._ensure_one_dim_input(var)
+            assert var.shape[0] % n_chunks == 0, (
+                'No. chunks ({0}) does not match data length ({1}).'.format(
+                    n_chunks, var.shape[0]))
+            var = self._discretise_var(var, alph, name, n_chunks)
+            processes.append(var.reshape(n_chunks, -1))
+        assert(processes[0].shape == processes[1].shape), (
+            'Unequal number of observations (source: {0}, target: '
+            '{1}).'.format(processes[0].size, processes[1].size))
+        start = self._get_start()
+        source_past = self._embed(processes[0], self.settings['alph1'],
+                                  self.settings['history_source'],
+                                  self.settings['tau_source'],
+                                  self.settings['source_target_delay'], start)
+        target_past = self._embed(processes[1], self.settings['alph2'],
+                                  self.settings['history_target'],
+                                  self.settings['tau_target'], 1, start)
+        return (source_past.ravel(), processes[1][:, start:].ravel(),
+                target_past.ravel())
+
+    def _get_alphabet_sizes(self):
+        return (self.settings['alph1'] ** self.settings['history_source'],
+                self.settings['alph2'],
+                self.settings['alph2'] ** self.settings['history_target'])
+
+    def estimate(self, source, target, n_chunks=1):
+        """Estimate transfer entropy from a source to a target variable.
+
+        Args:
+            source : numpy array
+                realisations of source variable, either a 2D numpy array where
+                array dimensions represent [(realisations * n_chunks) x
+                variable dimension] or a 1D array representing [realisations],
+                array type can be float (requires discretisation) or int
+            target : numpy array
+                realisations of target variable (similar to var1)
+            n_chunks : int [optional]
+                number of data chunks, no. data points has to be the same for
+                each chunk (default=1)
+
+        Returns:
+            numpy array
+                average TE over all samples for each chunk or local TE for
+                individual samples if 'local_values'=True
+        """
+        src, tgt, tgt_past = self._get_symbols(source, target, n_chunks)
+        a_src, a_tgt, a_tgt_past = self._get_alphabet_sizes()
+        n_obs = tgt.shape[0] // n_chunks
+        chunk = self._chunk_index(n_chunks, n_obs)
+        local = self._plugin_estimate([
+            (1, [chunk, src, tgt, tgt_past],
+             [n_chunks, a_src, a_tgt, a_tgt_past]),
+            (1, [chunk, tgt_past], [n_chunks, a_tgt_past]),
+            (-1, [chunk, src, tgt_past], [n_chunks, a_src, a_tgt_past]),
+            (-1, [chunk, tgt, tgt_past], [n_chunks, a_tgt, a_tgt_past])],
+            n_chunks, n_obs)
+        return self._return_estimate(local, self._get_start())
+
+    def get_analytic_distribution(self, source, target):
+        """Return analytic null distribution of the TE estimate.
+
+        Args:
+            source : numpy array
+                realisations of source variable, either a 2D numpy array where
+                array dimensions represent [realisations x variable dimension]
+                or a 1D array representing [realisations], array type can be
+                float (requires discretisation) or int
+            target : numpy array
+                realisations of target variable (similar to var1)
+
+        Returns:
+            ChiSquareNullDistribution instance
+                analytic distribution of the estimate under the null hypothesis
+        """
+        src, tgt, tgt_past = self._get_symbols(source, target, 1)
+        a_src, a_tgt, a_tgt_past = self._get_alphabet_sizes()
+        return ChiSquareNullDistribution(
+            tgt.shape[0], (a_src - 1) * (a_tgt - 1) * a_tgt_past)
@@ -10,7 +10,7 @@ import numpy as np
 import copy as cp
 import itertools as it
 from scipy.io import loadmat
-from .data import Data
+from .data import Data, _pack_dataset, _unpack_dataset
 from . import idtxl_exceptions as ex
 try:
     import networkx as nx
@@ -162,7 +162,8 @@ def load_pickle(name):
         return pickle.load(f)
 
 
-def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True):
+def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True,
+                     channels=None, trials=None, samples=None, lazy=False):
     """Convert FieldTrip-style MATLAB-file into an IDTxl Data object.
 
     Import a MATLAB structure with fields  "trial" (data), "label" (channel
@@ -175,6 +176,18 @@ def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True):
     The structure is assumed to be saved as a matlab hdf5 file ("-v7.3' or
     higher, .mat) with a SINGLE FieldTrip data structure inside.
 
+    Optionally, a subset of channels, trials, and samples can be imported.
+    Only the selected data are read from the file. If lazy is True, no data
+    are read on import; instead, the returned Data object reads data from the
+    file when realisations are requested (see FieldTripTrials).
+
+    Example:
+
+        >>> # Import 3 channels and the first 100 trials, read data on demand
+        >>> data, label, timestamps, fsample = import_fieldtrip(
+        >>>     'data.mat', 'data', 'v7.3', channels=['MLC11', 'MLC12', 4],
+        >>>     trials=range(100), samples=(500, 1500), lazy=True)
+
     Args:
         file_name : string
             full (matlab) file_name on disk
@@ -185,6 +198,17 @@ def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True):
             version of the file, e.g. 'v7.3' for MATLAB's 7.3 format
         normalise : bool [optional]
             normalise data after import (default=True)
+        channels : list of int | list of str [optional]
+            channels to import, given as channel indices or labels
+            (default=None, import all channels)
+        trials : list of int [optional]
+            indices of trials to import (default=None, import all trials)
+        samples : tuple of int [optional]
+            first and last (not included) sample to import from each trial
+            (default=None, import all samples)
+        lazy : bool [optional]
+            if True, return a Data object that reads data from the file on
+            demand (default=False)
 
     Returns:
         Data() instance
@@ -206,51 +230,53 @@ def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True):
 
     print('Creating Python dictionary from FT data structure: {0}'
           .format(ft_struct_name))
-    trial_data = _ft_import_trial(file_name, ft_struct_name)
     label = _ft_import_label(file_name, ft_struct_name)
+    if channels is not None:
+        channels = _ft_channel_index(channels, label)
+        label = [label[c] for c in channels]
+    trial_data = _ft_import_trial(file_name, ft_struct_name, channels, trials,
+                                  samples, lazy)
     fsample = _ft_fsample_2_float(file_name, ft_struct_name)
-    timestamps = _ft_import_time(file_name, ft_struct_name)
+    timestamps = _ft_import_time(file_name, ft_struct_name, trials, samples)
 
     data = Data(data=trial_data, dim_order='spr', normalise=normalise)
     return data, label, timestamps, fsample
 
 
-def _ft_import_trial(file_name, ft_struct_name):
+def _ft_channel_index(channels, label):
+    """Return channel indices for a list of channel indices or labels."""
+    index = []
+    for c in channels:
+        if isinstance(c, str):
+            try:
+                c = label.index(c)
+            except ValueError:
+                raise RuntimeError('Channel {0} not found in labels.'.format(
+                    c))
+        index.append(int(c))
+    return index
+
+
+def _ft_import_trial(file_name, ft_struct_name, channels=None, trials=None,
+                     samples=None, lazy=False):
     """Import FieldTrip trial data into Python."""
-    ft_file = h5py.File(file_name)
-    ft_struct = ft_file[ft_struct_name]  # TODO: ft_struct_name = automagic...
-
-    # Get the trial cells that contain the references (pointers) to the data
-    # we need. Then get the data from matrices in cells of a 1 x numtrials cell
-    # array in the original FieldTrip structure.
-    trial = ft_struct['trial']
-
-    # Get the trial cells that contain the references (pointers) to the data
-    # we need. Then get the data from matrices in cells of a 1 x numtrials cell
-    # array in the original FieldTrip structure.
-    trial = ft_struct['trial']
-
-    # Allocate memory to hold actual data, read shape of first trial to know
-    # the data size.
-    trial_data_tmp = np.array(ft_file[trial[0][0]])  # get data from 1st trial
+    trial_data = FieldTripTrials(file_name, ft_struct_name, channels, trials,
+                                 samples)
     print('Found data with first dimension: {0}, and second: {1}'
-          .format(trial_data_tmp.shape[0], trial_data_tmp.shape[1]))
-    geometry = trial_data_tmp.shape + (trial.shape[0],)
-    trial_data = np.empty(geometry)
-
-    # Get actual data from h5py structure.
-    for tt in range(0, trial.shape[0]):
-        trialref = trial[tt][0]  # get trial reference
-        trial_data[:, :, tt] = np.array(ft_file[trialref])  # get data
+          .format(trial_data.n_samples_trial, trial_data.n_channels_trial))
+    if lazy:
+        return trial_data
 
-    ft_file.close()
-    return trial_data
+    # Read selected data trial by trial into memory.
+    data = trial_data[:, :, :]
+    trial_data.close()
+    return data
 
 
 def _ft_import_label(file_name, ft_struct_name):
     """Import FieldTrip labels into Python."""
-    # for details of the data handling see comments in _ft_import_trial
-    ft_file = h5py.File(file_name)
+    # for details of the data handling see comments in FieldTripTrials
+    ft_file = h5py.File(file_name, 'r')
     ft_struct = ft_file[ft_struct_name]
     ft_label = ft_struct['label']
 
@@ -272,37 +298,192 @@ def _ft_import_label(file_name, ft_struct_name):
     return label
 
 
-def _ft_import_time(file_name, ft_struct_name):
+def _ft_import_time(file_name, ft_struct_name, trials=None, samples=None):
     """Import FieldTrip time stamps into Python."""
-    # for details of the data handling see comments in ft_trial_2_numpyarray
-    ft_file = h5py.File(file_name)
+    # for details of the data handling see comments in FieldTripTrials
+    ft_file = h5py.File(file_name, 'r')
     ft_struct = ft_file[ft_struct_name]
     ft_time = ft_struct['time']
     if VERBOSE:
         print('Converting FT time cell array to numpy array')
 
-    np_timeaxis_tmp = np.array(ft_file[ft_time[0][0]])
-    geometry = np_timeaxis_tmp.shape + (ft_time.shape[0],)
+    if trials is None:
+        trials = range(ft_time.shape[0])
+    if samples is None:
+        samples = (0, ft_file[ft_time[0][0]].shape[0])
+    np_timeaxis_tmp = ft_file[ft_time[trials[0]][0]][samples[0]:samples[1]]
+    geometry = np_timeaxis_tmp.shape + (len(trials),)
     timestamps = np.empty(geometry)
-    for tt in range(0, ft_time.shape[0]):
+    for i, tt in enumerate(trials):
         timeref = ft_time[tt][0]
-        timestamps[:, :, tt] = np.array(ft_file[timeref])
+        timestamps[:, :, i] = ft_file[timeref][samples[0]:samples[1]]
     ft_file.close()
     return timestamps
 
 
 def _ft_fsample_2_float(file_name, ft_struct_name):
-    ft_file = h5py.File(file_name)
+    ft_file = h5py.File(file_name, 'r')
     ft_struct = ft_file[ft_struct_name]
     FTfsample = ft_struct['fsample']
     fsample = int(FTfsample[0])
     if VERBOSE:
         print('Converting FT fsample array (1x1) to numpy array (1x1)')
+    ft_file.close()
     return fsample
 
 
+class FieldTripTrials():
+    """Provide read access to FieldTrip trial data stored in an HDF5 file.
+
+    Present the trials of a FieldTrip structure saved as MATLAB hdf5 file
+    ("-v7.3' or higher, .mat) as an array with dimensions (samples, channels,
+    trials), without reading data into memory. Data are read when the array
+    is indexed, where only the requested samples and channels are read from
+    each requested trial. Optionally, the array is restricted to a subset of
+    channels, trials, and samples in the file. Instances can be passed to
+    Data() using dim_order 'spr', the file stays open until close() is
+    called. Pickled instances reopen the file read-only when unpickled.
+
+    In the file, the FieldTrip field "trial" holds references to one dataset
+    per trial, where each dataset has dimensions (samples, channels) (MATLAB
+    stores arrays in column-major order, hence, dimensions appear transposed
+    compared to the FieldTrip structure).
+
+    Args:
+        file_name : string
+            full (matlab) file_name on disk
+        ft_struct_name : string
+            variable name of the MATLAB structure that is in FieldTrip format
+        channels : list of int [optional]
+            indices of channels (default=None, use all channels)
+        trials : list of int [optional]
+            indices of trials (default=None, use all trials)
+        samples : tuple of int [optional]
+            first and last (not included) sample in each trial (default=None,
+            use all samples)
+
+    Attributes:
+        shape : tuple
+            shape of the selected data as (samples, channels, trials)
+        dtype : numpy dtype
+            data type of the trial data
+        n_samples_trial : int
+            number of samples per trial in the file
+        n_channels_trial : int
+            number of channels per trial in the file
+    """
+
+    def __init__(self, file_name, ft_struct_name, channels=None, trials=None,
+                 samples=None):
+        self._init_args = (file_name, ft_struct_name, channels, trials,
+                           samples)
+        self._file = h5py.File(file_name, 'r')
+        # Get the trial cells that contain the references (pointers) to the
+        # data we need, the data are stored in matrices in cells of a 1 x
+        # numtrials cell array in the original FieldTrip structure.
+        trial = self._file[ft_struct_name]['trial'][()]
+        first_trial = self._file[trial[0][0]]
+        self.n_samples_trial, self.n_channels_trial = first_trial.shape
+        self.dtype = np.dtype(first_trial.dtype)
+
+        if trials is None:
+            trials = range(trial.shape[0])
+        if channels is None:
+            channels = range(self.n_channels_trial)
+        if samples is None:
+            samples = (0, self.n_samples_trial)
+        trials = np.asarray(trials, dtype=int)
+        self._channels = np.asarray(channels, dtype=int)
+        self._samples = range(samples[0], samples[1])
+        if trials.size and (trials.min() < 0 or
+                            trials.max() >= trial.shape[0]):
+            raise RuntimeError('Trial indices out of range, the file contains '
+                               '{0} trials.'.format(trial.shape[0]))
+        if self._channels.size and (
+                self._channels.min() < 0 or
+                self._channels.max() >= self.n_channels_trial):
+            raise RuntimeError('Channel indices out of range, the file '
+                               'contains {0} channels.'.format(
+                                   self.n_channels_trial))
+        if not 0 <= samples[0] < samples[1] <= self.n_samples_trial:
+            raise RuntimeError('Requested samples {0} out of range, trials '
+                               'contain {1} samples.'.format(
+                                   samples, self.n_samples_trial))
+        self._trial_refs = [trial[t][0] for t in trials]
+        self.shape = (len(self._samples), len(self._channels),
+                      len(self._trial_refs))
+
+    def __getstate__(self):
+        """Return state for pickling, the file is reopened when unpickled."""
+        return {'init_args': self._init_args}
+
+    def __setstate__(self, state):
+        """Set state from pickle, reopen the file read-only."""
+        self.__init__(*state['init_args'])
+
+    def __getitem__(self, index):
+        """Read data for a tuple of slices over samples, channels, trials."""
+        if (not isinstance(index, tuple) or len(index) != 3 or
+                not all(isinstance(i, slice) for i in index)):
+            raise IndexError('FieldTripTrials supports indexing by a tuple of '
+                             'three slices only.')
+        samples = self._samples[index[0]]
+        channels = self._channels[index[1]]
+        trial_refs = self._trial_refs[index[2]]
+        if samples.step != 1:
+            raise IndexError('Only contiguous samples can be read.')
+
+        # HDF5 requires increasing indices when selecting channels, read
+        # a contiguous block if possible.
+        channels_read, channels_inverse = np.unique(channels,
+                                                    return_inverse=True)
+        if (channels_read.size and channels_read[-1] - channels_read[0] + 1 ==
+                channels_read.size):
+            channels_read = slice(channels_read[0], channels_read[-1] + 1)
+        else:
+            channels_read = list(channels_read)
+
+        block = np.empty((len(samples), len(channels), len(trial_refs)),
+                         dtype=self.dtype)
+        for i, ref in enumerate(trial_refs):
+            block[:, :, i] = self._file[ref][
+                samples.start:samples.stop, channels_read][:, channels_inverse]
+        return block
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+
+class _SqueezedDataset():
+    """Provide read access to an HDF5 dataset without singleton dimensions."""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.dtype = np.dtype(dataset.dtype)
+        self._keep = [n != 1 for n in dataset.shape]
+        self.shape = tuple(n for n in dataset.shape if n != 1)
+
+    def __getstate__(self):
+        """Return state for pickling, replace the dataset by a handle."""
+        state = self.__dict__.copy()
+        state['dataset'] = _pack_dataset(state['dataset'])
+        return state
+
+    def __setstate__(self, state):
+        """Set state from pickle, reopen the dataset read-only."""
+        state['dataset'] = _unpack_dataset(state['dataset'])
+        self.__dict__.update(state)
+
+    def __getitem__(self, index):
+        """Read data for a tuple of slices over non-singleton dimensions."""
+        index = iter(index)
+        return self.dataset[tuple(next(index) if keep else 0
+                                  for keep in self._keep)]
+
+
 def import_matarray(file_name, array_name, file_version, dim_order,
-                    normalise=True):
+                    normalise=True, lazy=False):
     """Read Matlab hdf5 file into IDTxl.
 
     reads a matlab hdf5 file ("-v7.3' or higher, .mat) or non-hdf5 files with a
@@ -330,14 +511,21 @@ def import_matarray(file_name, array_name, file_version, dim_order,
             two-dimensional array of data from several processes over time
         normalise : bool [optional]
             normalise data after import (default=True)
+        lazy : bool [optional]
+            if True, return a Data object that reads data from the file on
+            demand instead of loading the array into memory, only supported
+            for version 'v7.3' (default=False)
 
     Returns:
         Data() instance
             instance of IDTxl Data object, containing data from the 'trial'
             field
     """
+    if lazy and file_version != 'v7.3':
+        raise RuntimeError('Lazy import is only supported for mat files in '
+                           'version 7.3 (hdf5).')
     if file_version == 'v7.3':
-        mat_file = h5py.File(file_name)
+        mat_file = h5py.File(file_name, 'r')
         # Assert that at least one of the keys found at the top level of the
         # HDF file  matches the name of the array we wanted
         if array_name not in mat_file.keys():
@@ -345,8 +533,12 @@ def import_matarray(file_name, array_name, file_version, dim_order,
                                'at the file''s top level.'.format(array_name))
 
         # 2. Create an object for the matlab array (from the hdf5 hierachy),
-        # the trailing [()] ensures everything is read
-        mat_data = np.squeeze(np.asarray(mat_file[array_name][()]))
+        # the trailing [()] ensures everything is read. For lazy import, data
+        # are read from the file by the Data object on demand.
+        if lazy:
+            mat_data = _SqueezedDataset(mat_file[array_name])
+        else:
+            mat_data = np.squeeze(np.asarray(mat_file[array_name][()]))
 
     elif file_version in ['v4', 'v6', 'v7']:
         try:
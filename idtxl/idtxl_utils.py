@@ -47,6 +47,112 @@ def standardise(a, dimension=0, df=1):
         return (a - a.mean(axis=dimension)) / a_sd
 
 
+def check_precision(estimator, data):
+    """Check if data are stored in the estimator's preferred precision.
+
+    Compare the floating point precision of realisations returned by a Data
+    instance to the precision in which an estimator processes continuous
+    data (see Estimator.preferred_dtype()). Print a note if realisations have
+    to be converted by the estimator on each call.
+
+    Args:
+        estimator : Estimator instance
+            estimator used for analysis
+        data : Data instance
+            data to be analysed
+
+    Returns:
+        bool
+            False if realisations are converted by the estimator, True
+            otherwise
+    """
+    preferred = estimator.preferred_dtype()
+    if (preferred is None or
+            not np.issubdtype(data.data_type, np.floating) or
+            np.dtype(data.data_type) == np.dtype(preferred)):
+        return True
+    print('Note: data are stored as {0}, {1} converts them to {2} on each '
+          'call. Create the Data object with dtype={2} to avoid conversions.'
+          .format(np.dtype(data.data_type).name, type(estimator).__name__,
+                  np.dtype(preferred).name))
+    return False
+
+
+def seed_sequence(seed, *keys):
+    """Return seed sequence for reproducible random streams.
+
+    Create a NumPy SeedSequence from a user-provided seed. Additional keys,
+    e.g., the index of the target analysed, select an independent child
+    stream of the seed. Child streams depend only on the seed and keys, such
+    that analyses run in any order or in parallel draw identical random
+    numbers.
+
+    Args:
+        seed : int | list of int | numpy.random.SeedSequence | None
+            seed provided by the user, if None, the global NumPy random state
+            is used for surrogate creation
+        keys : int
+            keys identifying the child stream
+
+    Returns:
+        numpy.random.SeedSequence | None
+            seed sequence or None if seed is None
+    """
+    if seed is None:
+        return None
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(
+            seed.entropy, spawn_key=tuple(seed.spawn_key) + keys,
+            pool_size=seed.pool_size)
+    return np.random.SeedSequence(seed, spawn_key=keys)
+
+
+def spawn_rng(seed_seq, default=None):
+    """Return random number generator for the next child stream.
+
+    Spawn the next child of a seed sequence and return a random number
+    generator drawing from the child stream. Children are spawned in order,
+    such that repeated calls in the same order return identical streams.
+
+    Args:
+        seed_seq : numpy.random.SeedSequence | None
+            seed sequence, see seed_sequence()
+        default : object [optional]
+            returned if seed_seq is None, e.g., numpy.random to draw from the
+            global NumPy random state (default=None)
+
+    Returns:
+        numpy.random.Generator | object
+            random number generator or default if seed_seq is None
+    """
+    if seed_seq is None:
+        return default
+    return np.random.default_rng(seed_seq.spawn(1)[0])
+
+
+def random_integers(rng, low, high, size=None):
+    """Draw random integers from the half-open interval [low, high).
+
+    Args:
+        rng : numpy.random.Generator | numpy.random | None
+            random number generator, if None or numpy.random, the global
+            NumPy random state is used
+        low : int
+            lowest integer
+        high : int
+            one above the largest integer
+        size : int | tuple [optional]
+            output shape (default=None, returns a single integer)
+
+    Returns:
+        int | numpy array
+            random integers
+    """
+    if rng is None or rng is np.random:
+        return np.random.randint(low, high, size=size)
+    return rng.integers(low, high, size=size)
+
+
 def sort_descending(a):
     """Sort array in descending order."""
     # http://stackoverflow.com/questions/26984414/
@@ -266,22 +372,18 @@ def combine_discrete_dimensions(a, numBins):
         return a
 
     # Else, 2D array assumed
-    num_samples = a.shape[0]
     dimensions = a.shape[1]
-    combined_values = np.zeros(num_samples, dtype=np.int_)
-    for t in range(num_samples):
-        combined_value = 0
-        multiplier = 1
-        for c in range(dimensions - 1, -1, -1):
-            combined_value = combined_value + a[t][c] * multiplier
-            multiplier = multiplier * numBins
-            if multiplier <= 0:
-                # Multiplier has overflown
-                raise ArithmeticError(
-                    'Combination of numBins and number of dimensions of a '
-                    'leads to overflow in making unidimensional array')
-        combined_values[t] = int(combined_value)
-    return combined_values
+    if dimensions == 1:
+        # Nothing to combine, return a view of the data if possible.
+        return a[:, 0].astype(np.int_, copy=False)
+    if numBins ** dimensions > np.iinfo(np.int_).max:
+        # Multiplier would overflow
+        raise ArithmeticError(
+            'Combination of numBins and number of dimensions of a '
+            'leads to overflow in making unidimensional array')
+    multipliers = np.power(numBins, np.arange(dimensions - 1, -1, -1),
+                           dtype=np.int_)
+    return np.dot(a.astype(np.int_), multipliers)
 
 
 def equal_dicts(dict_1, dict_2):
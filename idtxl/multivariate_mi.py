@@ -102,6 +102,18 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
                 - fdr_correction : bool [optional] - correct results on the
                   network level, see documentation of stats.network_fdr() for
                   details (default=True)
+                - n_workers : int [optional] - number of worker processes; if
+                  larger than 1, targets are analysed in parallel in a pool of
+                  processes, data are passed to workers in shared memory
+                  (default=1); unless set explicitly, the estimator setting
+                  num_threads is set to the no. CPUs divided by n_workers
+                - checkpoint_dir : str [optional] - directory to which
+                  the result of each target and the selection state of
+                  targets under analysis are saved (default=None)
+                - resume : bool [optional] - resume an interrupted
+                  analysis from checkpoint_dir, targets with saved results
+                  are skipped, partially analysed targets continue from
+                  their saved selection state (default=False)
 
             data : Data instance
                 raw data for analysis
@@ -126,6 +138,9 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
         # Set defaults for network inference.
         settings.setdefault('verbose', True)
         settings.setdefault('fdr_correction', True)
+        settings.setdefault('n_workers', 1)
+        settings.setdefault('checkpoint_dir', None)
+        settings.setdefault('resume', False)
 
         # Check which targets and sources are requested for analysis.
         if targets == 'all':
@@ -147,12 +162,14 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
         results = ResultsNetworkInference(n_nodes=data.n_processes,
                                           n_realisations=data.n_realisations(),
                                           normalised=data.normalise)
+        res_targets = self._map_targets(
+            'analyse_single_target', settings, data,
+            list(zip(targets, sources)))
         for t in range(len(targets)):
             if settings['verbose']:
                 print('\n####### analysing target with index {0} from list {1}'
                       .format(t, targets))
-            res_single = self.analyse_single_target(
-                    settings, data, targets[t], sources[t])
+            res_single = next(res_targets)
             results.combine_results(res_single)
 
         # Get no. realisations actually used for estimation from single target
@@ -243,6 +260,17 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
                   creation by shuffling realisations in time instead of
                   shuffling replications; see documentation of
                   Data.permute_samples() for further settings (default=False)
+                - sequential_perm : bool [optional] - stop permutation tests
+                  as soon as a test is clearly non-significant, the no.
+                  permutations used is reported in the results, see
+                  stats._permutation_test() for further settings
+                  (default=False)
+                - seed : int | numpy.random.SeedSequence [optional] - seed
+                  for reproducible surrogate creation; an independent random
+                  stream is derived from the seed for each target, such that
+                  results do not depend on the order in which targets are
+                  analysed; if None, the global NumPy random state is used
+                  (default=None)
                 - verbose : bool [optional] - toggle console output
                   (default=True)
 
@@ -299,6 +327,9 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
                 'omnibus_mi': self.statistic_omnibus,
                 'omnibus_pval': self.pvalue_omnibus,
                 'omnibus_sign': self.sign_omnibus,
+                'omnibus_n_perm': self._n_perm_achieved.get('omnibus'),
+                'selected_sources_n_perm': self._n_perm_achieved.get(
+                    'max_seq'),
                 'mi': self.statistic_single_link
             })
         self._reset()  # remove attributes
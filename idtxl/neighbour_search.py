@@ -0,0 +1,447 @@
+"""Provide neighbour searches using the maximum norm for KSG estimators.
+
+Neighbour searches are the main computational cost of Kraskov-Grassberger-
+Stoegbauer (KSG) estimators. The module provides interchangeable search
+backends that all answer two queries on a fixed set of points:
+
+- knn(k): distances to and indices of the k nearest neighbours of each point
+  (including the point itself)
+- count_within(radius): number of points within a point-specific radius
+  around each point (including the point itself)
+
+Distances are calculated using the maximum norm. Available backends are a
+KD-tree (SciPy's cKDTree), a box-assisted grid search, and a brute force
+search. Use get_neighbour_search() to create a search for a point set,
+choosing a backend by name or automatically based on the number of points
+and their dimension.
+
+References:
+
+- Grassberger, P. (1990). An optimized box-assisted algorithm for fractal
+  dimensions. Phys Lett A, 148(1-2), 63-68.
+- Schreiber, T. (1995). Efficient neighbor searching in nonlinear time
+  series analysis. Int J Bifurcat Chaos, 5(02), 349-358.
+"""
+from abc import ABCMeta, abstractmethod
+import itertools as it
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Max. number of entries in distance matrices computed at once by the brute
+# force and grid searches.
+MAX_DIST_ENTRIES = 2 ** 22
+# Thresholds for automatic backend selection.
+BRUTE_FORCE_MAX_POINTS = 256
+GRID_MAX_DIM = 1
+
+
+class NeighbourSearch(metaclass=ABCMeta):
+    """Abstract class for neighbour searches using the maximum norm.
+
+    Child classes are initialised with a point set and implement KNN and range
+    queries for all points in the set.
+
+    Args:
+        pointset : numpy array
+            2D array of points [realisations x dimension]
+        workers : int [optional]
+            number of threads used for searches, -1 uses all available
+            threads, not all backends support multi-threading (default=1)
+    """
+
+    def __init__(self, pointset, workers=1):
+        self.pointset = np.asarray(pointset, dtype=np.float64)
+        if self.pointset.ndim == 1:
+            self.pointset = self.pointset[:, np.newaxis]
+        self.workers = workers
+
+    @property
+    def n_points(self):
+        """Number of points in the point set."""
+        return self.pointset.shape[0]
+
+    @abstractmethod
+    def knn(self, k):
+        """Find the k nearest neighbours of each point.
+
+        The point itself is returned as its own nearest neighbour at distance
+        0.
+
+        Args:
+            k : int
+                number of neighbours
+
+        Returns:
+            numpy array
+                distances to neighbours, sorted in ascending order for each
+                point [realisations x k]
+            numpy array
+                indices of neighbours [realisations x k]
+        """
+        pass
+
+    @abstractmethod
+    def count_within(self, radius):
+        """Count points within a radius around each point.
+
+        Points at exactly the radius are counted, the point itself is counted.
+
+        Args:
+            radius : numpy array
+                search radius for each point
+
+        Returns:
+            numpy array
+                number of points within radius for each point
+        """
+        pass
+
+
+class KDTreeSearch(NeighbourSearch):
+    """Neighbour search using SciPy's cKDTree.
+
+    The search tree is built once on initialisation. Searches are efficient
+    for low- to medium-dimensional data and scale as O(N log N) with the
+    number of points N. The search supports multi-threading.
+    """
+
+    def __init__(self, pointset, workers=1):
+        super().__init__(pointset, workers)
+        self.tree = cKDTree(self.pointset)
+
+    def knn(self, k):
+        return self.tree.query(self.pointset, k=k, p=np.inf,
+                               workers=self.workers)
+
+    def count_within(self, radius):
+        return self.tree.query_ball_point(self.pointset, r=radius, p=np.inf,
+                                          return_length=True,
+                                          workers=self.workers)
+
+
+class BruteForceSearch(NeighbourSearch):
+    """Neighbour search by computing all pairwise distances.
+
+    Distances are computed in blocks of points to limit memory usage. The
+    search has no setup cost and scales as O(N^2) with the number of points
+    N, it is the fastest option for small point sets.
+    """
+
+    def _block_size(self, n_candidates):
+        return max(1, MAX_DIST_ENTRIES // max(1, n_candidates))
+
+    def knn(self, k):
+        n = self.n_points
+        dist = np.empty((n, k))
+        idx = np.empty((n, k), dtype=np.int_)
+        block_size = self._block_size(n)
+        for start in range(0, n, block_size):
+            stop = min(n, start + block_size)
+            d = _max_norm_dist(self.pointset[start:stop], self.pointset)
+            dist[start:stop], idx[start:stop] = _k_smallest(
+                d, np.arange(n), k)
+        return dist, idx
+
+    def count_within(self, radius):
+        radius = np.asarray(radius)
+        n = self.n_points
+        count = np.empty(n, dtype=np.int_)
+        block_size = self._block_size(n)
+        for start in range(0, n, block_size):
+            stop = min(n, start + block_size)
+            d = _max_norm_dist(self.pointset[start:stop], self.pointset)
+            count[start:stop] = np.sum(
+                d <= radius[start:stop, np.newaxis], axis=1)
+        return count
+
+
+class GridSearch(NeighbourSearch):
+    """Box-assisted neighbour search.
+
+    Partition the space spanned by a subset of dimensions into a regular grid
+    of boxes and sort points by box (Grassberger, 1990; Schreiber, 1995). For
+    the maximum norm, candidate neighbours within a distance r around a point
+    can only lie in boxes at most ceil(r / box size) boxes away along each
+    grid dimension, such that only these boxes have to be searched. Distances
+    are computed for all points in a box at once.
+
+    For one-dimensional point sets, points are sorted and searches are
+    resolved for all points at once using binary searches on the sorted
+    values, which scales as O(N log N) with the number of points N.
+
+    Args:
+        pointset : numpy array
+            2D array of points [realisations x dimension]
+        workers : int [optional]
+            not used, for compatibility with other backends
+        n_grid_dims : int [optional]
+            number of dimensions used for partitioning, the dimensions with
+            the largest range are used (default=2)
+        box_occupancy : int [optional]
+            average number of points per box, determines the number of boxes
+            (default=16)
+    """
+
+    def __init__(self, pointset, workers=1, n_grid_dims=2, box_occupancy=16):
+        super().__init__(pointset, workers)
+        n, dim = self.pointset.shape
+        if dim == 1:
+            self._sort_idx = np.argsort(self.pointset[:, 0], kind='mergesort')
+            self._sorted = self.pointset[self._sort_idx, 0]
+            return
+
+        # Use the dimensions with the largest range for partitioning.
+        extent = np.ptp(self.pointset, axis=0)
+        self._grid_dims = np.argsort(extent)[::-1][:min(n_grid_dims, dim)]
+        n_grid_dims = len(self._grid_dims)
+        self._n_boxes = max(1, int((n / box_occupancy) ** (1 / n_grid_dims)))
+        grid_points = self.pointset[:, self._grid_dims]
+        self._lower = grid_points.min(axis=0)
+        self._box_size = extent[self._grid_dims] / self._n_boxes
+        self._box_size[self._box_size == 0] = 1
+        box = np.floor((grid_points - self._lower) / self._box_size)
+        box = np.clip(box, 0, self._n_boxes - 1).astype(np.int_)
+        box_id = np.ravel_multi_index(
+            box.T, (self._n_boxes,) * n_grid_dims)
+        self._sort_idx = np.argsort(box_id, kind='mergesort')
+        self._box = box
+        self._box_id = box_id
+        # Index of the first point in each box in sorted order.
+        self._box_start = np.searchsorted(
+            box_id[self._sort_idx],
+            np.arange(self._n_boxes ** n_grid_dims + 1))
+
+    def knn(self, k):
+        if self.pointset.shape[1] == 1:
+            return self._knn_sorted(k)
+        n = self.n_points
+        dist = np.empty((n, k))
+        idx = np.empty((n, k), dtype=np.int_)
+        for points in self._iter_boxes():
+            # A point outside the searched boxes is further away than
+            # reach * box size along at least one grid dimension. Increase the
+            # number of searched boxes until the k-th neighbour lies within
+            # this distance for all points.
+            reach = 1
+            while True:
+                candidates = self._candidates(points[0], reach)
+                if len(candidates) >= k:
+                    d = _max_norm_dist(self.pointset[points],
+                                       self.pointset[candidates])
+                    d_k, i_k = _k_smallest(d, candidates, k)
+                    max_dist = d_k[:, -1].max()
+                    if (max_dist <= reach * self._box_size.min() or
+                            len(candidates) == n):
+                        break
+                    reach = max(reach + 1, int(np.ceil(
+                        max_dist / self._box_size.min())))
+                else:
+                    reach += 1
+            dist[points], idx[points] = d_k, i_k
+        return dist, idx
+
+    def count_within(self, radius):
+        radius = np.asarray(radius)
+        if self.pointset.shape[1] == 1:
+            return self._count_sorted(radius)
+        count = np.empty(self.n_points, dtype=np.int_)
+        for points in self._iter_boxes():
+            reach = np.ceil(radius[points].max() / self._box_size).astype(
+                np.int_)
+            candidates = self._candidates(points[0], reach)
+            # Limit the size of distance matrices.
+            block_size = max(1, MAX_DIST_ENTRIES // len(candidates))
+            for start in range(0, len(points), block_size):
+                p = points[start:start + block_size]
+                d = _max_norm_dist(self.pointset[p],
+                                   self.pointset[candidates])
+                count[p] = np.sum(d <= radius[p, np.newaxis], axis=1)
+        return count
+
+    def _iter_boxes(self):
+        """Yield indices of points in each non-empty box."""
+        starts = self._box_start
+        occupied = np.flatnonzero(np.diff(starts))
+        for b in occupied:
+            yield self._sort_idx[starts[b]:starts[b + 1]]
+
+    def _candidates(self, point, reach):
+        """Return indices of points in boxes within reach of point's box."""
+        reach = np.broadcast_to(reach, self._box.shape[1])
+        box = self._box[point]
+        low = np.maximum(box - reach, 0)
+        high = np.minimum(box + reach, self._n_boxes - 1)
+        # Boxes along the last grid dimension are consecutive in sorted order,
+        # collect one slice of sorted points for each combination of boxes in
+        # the remaining grid dimensions.
+        shape = (self._n_boxes,) * len(box)
+        slices = []
+        for b in it.product(*[range(l, h + 1) for l, h in
+                              zip(low[:-1], high[:-1])]):
+            first = np.ravel_multi_index(b + (low[-1],), shape)
+            last = np.ravel_multi_index(b + (high[-1],), shape)
+            slices.append(self._sort_idx[self._box_start[first]:
+                                         self._box_start[last + 1]])
+        return np.concatenate(slices)
+
+    def _knn_sorted(self, k):
+        """KNN search on sorted one-dimensional data."""
+        n = self.n_points
+        # The k nearest neighbours of a point (including the point itself) lie
+        # within the k - 1 preceding and succeeding points in sorted order.
+        offsets = np.arange(-(k - 1), k)
+        window = np.arange(n)[:, np.newaxis] + offsets
+        valid = (window >= 0) & (window < n)
+        window = np.clip(window, 0, n - 1)
+        d = np.abs(self._sorted[window] - self._sorted[:, np.newaxis])
+        d[~valid] = np.inf
+        d_k, i_k = _k_smallest(d, window, k)
+        dist = np.empty((n, k))
+        idx = np.empty((n, k), dtype=np.int_)
+        dist[self._sort_idx] = d_k
+        idx[self._sort_idx] = self._sort_idx[i_k]
+        return dist, idx
+
+    def _count_sorted(self, radius):
+        """Range count on sorted one-dimensional data."""
+        values = self.pointset[:, 0]
+        high = np.searchsorted(self._sorted, values + radius, side='right')
+        low = np.searchsorted(self._sorted, values - radius, side='left')
+        # Rounding in values +/- radius may include or exclude points at
+        # exactly the search radius, correct the count at both ends.
+        high = _correct_bound(self._sorted, values, radius, high, 'high')
+        low = _correct_bound(self._sorted, values, radius, low, 'low')
+        return high - low
+
+
+def _correct_bound(sorted_values, values, radius, bound, side):
+    """Move bounds of ranges found by searchsorted to exact distance."""
+    n = len(sorted_values)
+    if side == 'high':
+        # First point outside the range: move down while the previous point is
+        # outside, move up while the current point is inside.
+        while True:
+            prev = np.clip(bound - 1, 0, n - 1)
+            move = (bound > 0) & (np.abs(sorted_values[prev] - values) >
+                                  radius)
+            if not move.any():
+                break
+            bound[move] -= 1
+        while True:
+            cur = np.clip(bound, 0, n - 1)
+            move = (bound < n) & (np.abs(sorted_values[cur] - values) <=
+                                  radius)
+            if not move.any():
+                break
+            bound[move] += 1
+    else:
+        # First point inside the range: move up while the current point is
+        # outside, move down while the previous point is inside.
+        while True:
+            cur = np.clip(bound, 0, n - 1)
+            move = (bound < n) & (np.abs(sorted_values[cur] - values) >
+                                  radius)
+            if not move.any():
+                break
+            bound[move] += 1
+        while True:
+            prev = np.clip(bound - 1, 0, n - 1)
+            move = (bound > 0) & (np.abs(sorted_values[prev] - values) <=
+                                  radius)
+            if not move.any():
+                break
+            bound[move] -= 1
+    return bound
+
+
+def _max_norm_dist(points, candidates):
+    """Return matrix of maximum norm distances between two point sets."""
+    dist = np.abs(points[:, np.newaxis, 0] - candidates[np.newaxis, :, 0])
+    for d in range(1, points.shape[1]):
+        np.maximum(dist,
+                   np.abs(points[:, np.newaxis, d] -
+                          candidates[np.newaxis, :, d]),
+                   out=dist)
+    return dist
+
+
+def _k_smallest(dist, candidates, k):
+    """Return the k smallest distances per row and corresponding indices."""
+    if dist.shape[1] > k:
+        part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(dist.shape[1]), dist.shape)
+    rows = np.arange(dist.shape[0])[:, np.newaxis]
+    d = dist[rows, part]
+    order = np.argsort(d, axis=1, kind='mergesort')
+    part = part[rows, order]
+    if candidates.ndim == 1:
+        idx = candidates[part]
+    else:
+        idx = candidates[rows, part]
+    return d[rows, order], idx
+
+
+BACKENDS = {
+    'kdtree': KDTreeSearch,
+    'grid': GridSearch,
+    'brute_force': BruteForceSearch,
+}
+
+
+def select_backend(n_points, dim):
+    """Select a neighbour search backend for a point set.
+
+    Use a brute force search for small point sets, where building search
+    structures does not pay off. Use the sorting-based grid search for
+    one-dimensional point sets, which is faster than the KD-tree for all set
+    sizes. Use the KD-tree otherwise, which outperforms the NumPy
+    implementation of the box-assisted search in higher dimensions.
+
+    Args:
+        n_points : int
+            number of points
+        dim : int
+            dimension of the points
+
+    Returns:
+        str
+            name of the backend
+    """
+    if n_points <= BRUTE_FORCE_MAX_POINTS:
+        return 'brute_force'
+    elif dim <= GRID_MAX_DIM:
+        return 'grid'
+    else:
+        return 'kdtree'
+
+
+def get_neighbour_search(pointset, backend='auto', workers=1):
+    """Return neighbour search for a point set.
+
+    Args:
+        pointset : numpy array
+            2D array of points [realisations x dimension]
+        backend : str [optional]
+            search backend, 'kdtree', 'grid', 'brute_force', or 'auto' to
+            select a backend based on the number of points and their dimension
+            (default='auto')
+        workers : int [optional]
+            number of threads used for searches, -1 uses all available
+            threads, not all backends support multi-threading (default=1)
+
+    Returns:
+        NeighbourSearch instance
+            search for the point set
+    """
+    if backend == 'auto':
+        pointset = np.asarray(pointset)
+        dim = 1 if pointset.ndim == 1 else pointset.shape[1]
+        backend = select_backend(pointset.shape[0], dim)
+    try:
+        search_class = BACKENDS[backend]
+    except KeyError:
+        raise RuntimeError('Unknown neighbour search backend {0}, use one of '
+                           '{1} or \'auto\'.'.format(backend,
+                                                     list(BACKENDS.keys())))
+    return search_class(pointset, workers)
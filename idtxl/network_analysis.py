@@ -2,6 +2,10 @@
 """
 import copy as cp
 import itertools as it
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from . import idtxl_utils as utils
 
@@ -21,6 +25,117 @@ class NetworkAnalysis():
         self._current_value_realisations = None
         self._selected_vars_realisations = None
         self._min_stats_surr_table = None
+        self._seed_sequence = None
+        self._n_perm_achieved = {}
+
+    def _map_targets(self, method, settings, data, args):
+        """Return an iterator over results of single-target analyses.
+
+        Call an analysis method, e.g., 'analyse_single_target', for each tuple
+        of arguments in args. If settings['n_workers'] is larger than 1,
+        analyses are run in a pool of worker processes (see
+        _map_targets_parallel). Otherwise, each analysis is run in this
+        process when the iterator is advanced. If settings['checkpoint_dir']
+        is set, results are saved or loaded from the checkpoint directory (see
+        _analyse_checkpointed).
+
+        Args:
+            method : str
+                name of the analysis method, called as
+                method(settings, data, *args[i])
+            settings : dict
+                analysis settings, passed to the analysis method
+            data : Data instance
+                raw data for analysis
+            args : list of tuples
+                further arguments for each analysis, e.g., (target, sources)
+
+        Returns:
+            iterator
+                results of single-target analyses in the order of args
+        """
+        n_workers = settings.get('n_workers', 1)
+        if not isinstance(n_workers, int) or n_workers < 1:
+            raise RuntimeError('n_workers has to be a positive integer.')
+        if n_workers == 1 or len(args) < 2:
+            return (self._analyse_checkpointed(method, settings, data, a)
+                    for a in args)
+        return self._map_targets_parallel(method, settings, data, args,
+                                          n_workers)
+
+    def _map_targets_parallel(self, method, settings, data, args, n_workers):
+        """Run single-target analyses in a pool of worker processes.
+
+        Each worker creates a new instance of the analysis class, such that
+        estimators are created within workers (e.g., JIDT estimators can not
+        be pickled). Data held in memory are moved to shared memory, such that
+        workers access data without copying (see Data.share_memory). Workers
+        are started using the 'spawn' method, hence, scripts using parallel
+        analysis have to protect their entry point by
+        if __name__ == '__main__'. Unless set explicitly, the estimator
+        setting 'num_threads' is set such that workers share the available
+        CPUs instead of each worker using all CPUs.
+        """
+        n_workers = min(n_workers, len(args))
+        if 'num_threads' not in settings:
+            settings = dict(settings,
+                            num_threads=max(1, os.cpu_count() // n_workers))
+        data_shared = data.subset()
+        try:
+            data_shared.share_memory()
+        except RuntimeError:
+            # Data on disk are passed to workers directly, workers reopen
+            # memory-mapped files and HDF5 datasets read-only.
+            data_shared = data
+        with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [executor.submit(_analyse_in_worker, type(self), method,
+                                       settings, data_shared, a)
+                       for a in args]
+            for f in futures:
+                yield f.result()
+
+    def _analyse_checkpointed(self, method, settings, data, args):
+        """Run a single-target analysis and save its result to a checkpoint.
+
+        If settings['checkpoint_dir'] is set, the result of each single-target
+        analysis is saved to the checkpoint directory. If additionally
+        settings['resume'] is True, results saved by a previous, interrupted
+        analysis are loaded instead of repeating the analysis. Targets
+        without a saved result are analysed and may continue from a partial
+        selection state (see NetworkInference._restore_state).
+
+        Args:
+            method : str
+                name of the analysis method, called as
+                method(settings, data, *args)
+            settings : dict
+                analysis settings, passed to the analysis method
+            data : Data instance
+                raw data for analysis
+            args : tuple
+                further arguments of the analysis, where the first entry is
+                the target (or process) analysed
+
+        Returns:
+            results of the single-target analysis
+        """
+        checkpoint_dir = settings.get('checkpoint_dir', None)
+        if checkpoint_dir is None:
+            return getattr(self, method)(settings, data, *args)
+        if settings.get('resume', False):
+            results = _load_checkpoint(checkpoint_dir, 'result', args[0])
+            if results is not None:
+                _check_checkpoint_settings(results.settings, settings)
+                for k in _RUN_SETTINGS:
+                    if k in settings:
+                        results.settings[k] = settings[k]
+                return results
+        results = getattr(self, method)(settings, data, *args)
+        _save_checkpoint(results, checkpoint_dir, 'result', args[0])
+        _remove_checkpoint(checkpoint_dir, 'state', args[0])
+        return results
 
     @property
     def current_value(self):
@@ -442,3 +557,72 @@ class NetworkAnalysis():
                     conditional_realisations)
 
         return links
+
+
+def _analyse_in_worker(analysis_class, method, settings, data, args):
+    """Run a single-target analysis in a worker process."""
+    return analysis_class()._analyse_checkpointed(method, settings, data, args)
+
+
+# Settings that control how, but not what, is analysed. These may change
+# between an interrupted analysis and its resumption.
+_RUN_SETTINGS = ('checkpoint_dir', 'resume', 'n_workers', 'num_threads',
+                 'verbose')
+
+
+def _checkpoint_path(checkpoint_dir, kind, target):
+    """Return path of a checkpoint file, kind is 'result' or 'state'."""
+    return os.path.join(checkpoint_dir, '{0}_{1}.p'.format(kind, target))
+
+
+def _save_checkpoint(obj, checkpoint_dir, kind, target):
+    """Save object to a checkpoint file.
+
+    The object is written to a temporary file first, which then replaces the
+    checkpoint, such that an interrupted write never leaves a corrupted
+    checkpoint.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = _checkpoint_path(checkpoint_dir, kind, target)
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+
+def _load_checkpoint(checkpoint_dir, kind, target):
+    """Load object from a checkpoint file, return None if there is none."""
+    path = _checkpoint_path(checkpoint_dir, kind, target)
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _remove_checkpoint(checkpoint_dir, kind, target):
+    """Remove a checkpoint file if it exists."""
+    path = _checkpoint_path(checkpoint_dir, kind, target)
+    if os.path.isfile(path):
+        os.remove(path)
+
+
+def _check_checkpoint_settings(saved_settings, settings):
+    """Check if a checkpoint was created with the current settings."""
+    saved = {k: _comparable_setting(v) for k, v in saved_settings.items()
+             if k not in _RUN_SETTINGS}
+    current = {k: _comparable_setting(v) for k, v in settings.items()}
+    if utils.conflicting_entries(saved, current):
+        raise RuntimeError('Can not resume analysis - checkpoint in {0} was '
+                           'created with different analysis settings.'.format(
+                               settings['checkpoint_dir']))
+
+
+def _comparable_setting(value):
+    """Return a setting in a form that can be compared by value.
+
+    SeedSequence instances are compared by identity, return the parameters
+    defining their random streams instead.
+    """
+    if isinstance(value, np.random.SeedSequence):
+        return (np.asarray(value.entropy).tolist(), tuple(value.spawn_key),
+                value.pool_size)
+    return value
@@ -70,6 +70,9 @@ class NetworkComparison(NetworkAnalysis):
                   surrogates by shuffling data over time. See
                   Data.permute_samples() for settings for further options for
                   surrogate creation
+                - seed : int | numpy.random.SeedSequence [optional] - seed
+                  for reproducible surrogate creation; if None, the global
+                  NumPy random state is used (default=None)
                 - verbose : bool [optional] - toggle console output
                   (default=True)
 
@@ -164,6 +167,9 @@ class NetworkComparison(NetworkAnalysis):
                   surrogates by shuffling data over time. See
                   Data.permute_samples() for settings for further options for
                   surrogate creation
+                - seed : int | numpy.random.SeedSequence [optional] - seed
+                  for reproducible surrogate creation; if None, the global
+                  NumPy random state is used (default=None)
                 - verbose : bool [optional] - toggle console output
                   (default=True)
 
@@ -506,9 +512,9 @@ class NetworkComparison(NetworkAnalysis):
             # Permute data obejcts between conditions a and b before
             # calculating the CMI.
             cmi_set_all = np.array(cmi_set_a + cmi_set_b)
-            new_partition_a = np.random.choice(range(len(cmi_set_all)),
-                                               size=len(cmi_set_a),
-                                               replace=False)
+            rng = utils.spawn_rng(self._seed_sequence, default=np.random)
+            new_partition_a = rng.choice(range(len(cmi_set_all)),
+                                         size=len(cmi_set_a), replace=False)
             new_partition_b = np.array(list(set(range(0, len(cmi_set_all))) -
                                             set(new_partition_a)))
             cmi_set_a_perm = cmi_set_all[new_partition_a]
@@ -715,7 +721,8 @@ class NetworkComparison(NetworkAnalysis):
             current_value, target_vars)[0]
         current_value_surrogates = stats._get_surrogates(
             data, current_value, [current_value],
-            n_perm=self.settings['n_perm_comp'], perm_settings=self.settings)
+            n_perm=self.settings['n_perm_comp'], perm_settings=self.settings,
+            rng=utils.spawn_rng(self._seed_sequence))
 
         # Calculate TE for each link, i.e., for a single source and the target
         te_surrogates = {}
@@ -878,9 +885,11 @@ class NetworkComparison(NetworkAnalysis):
 
         # Swap or permute realisations of the conditioning set depending on the
         # stats type.
+        rng = utils.spawn_rng(self._seed_sequence, default=np.random)
         if self.settings['stats_type'] == 'dependent':
-            swap = np.repeat(np.random.randint(2, size=n_repl).astype(bool),
-                             n_per_repl)
+            swap = np.repeat(
+                utils.random_integers(rng, 0, 2, size=n_repl).astype(bool),
+                n_per_repl)
             cond_a_perm[swap, :] = cond_b_real[swap, :]
             cond_b_perm[swap, :] = cond_a_real[swap, :]
             cur_val_a_perm[swap, :] = cur_val_b_real[swap, :]
@@ -889,7 +898,7 @@ class NetworkComparison(NetworkAnalysis):
         elif self.settings['stats_type'] == 'independent':
             # Pool replications from both data sets and draw two samples of
             # size n_repl.
-            resample_a = np.random.choice(2 * n_repl, n_repl, replace=False)
+            resample_a = rng.choice(2 * n_repl, n_repl, replace=False)
             resample_b = np.setdiff1d(np.arange(2 * n_repl), resample_a)
 
             # Get resampled realisations for group A.
@@ -953,8 +962,10 @@ class NetworkComparison(NetworkAnalysis):
         settings.setdefault('alpha_comp', 0.05)
         settings.setdefault('tail_comp', 'two')
         settings.setdefault('permute_in_time', False)
+        settings.setdefault('seed', None)
         stats.check_n_perm(settings['n_perm_comp'], settings['alpha_comp'])
         self.settings = settings
+        self._seed_sequence = utils.seed_sequence(settings['seed'])
 
     def _reset(self):
         """Reset instance after analysis."""
@@ -1,8 +1,10 @@
 """Parent class for all network inference."""
 import numpy as np
-from .network_analysis import NetworkAnalysis
+from .network_analysis import (NetworkAnalysis, _check_checkpoint_settings,
+                               _load_checkpoint, _save_checkpoint)
 from .estimator import find_estimator
 from . import stats
+from . import idtxl_utils as utils
 
 
 class NetworkInference(NetworkAnalysis):
@@ -27,6 +29,9 @@ class NetworkInference(NetworkAnalysis):
             indices of the set of conditionals coming from source processes
     """
 
+    # Stages of the analysis of a single target, in the order they are run.
+    _STAGES = ('target', 'sources', 'prune', 'final')
+
     def __init__(self):
         # Create class attributes for estimation
         self.statistic_omnibus = None
@@ -34,6 +39,7 @@ class NetworkInference(NetworkAnalysis):
         self.pvalue_omnibus = None
         self.statistic_sign_sources = None
         self.pvalues_sign_sources = None
+        self._resume_stage = None
         super().__init__()
 
     def _check_target(self, target, n_processes):
@@ -77,7 +83,7 @@ class NetworkInference(NetworkAnalysis):
             print('\nTarget: {0} - testing sources {1}'.format(
                 self.target, self.source_set))
 
-    def _include_candidates(self, candidate_set, data):
+    def _include_candidates(self, candidate_set, data, stage=None):
         """Inlcude informative candidates into the conditioning set.
 
         Loop over each candidate in the candidate set and test if it has
@@ -93,6 +99,10 @@ class NetworkInference(NetworkAnalysis):
                 (process index, sample index)
             data : Data instance
                 raw data
+            stage : str [optional]
+                stage of the analysis, if provided, the selection state is
+                saved to a checkpoint after each included candidate (see
+                _save_state)
 
         Returns:
             bool
@@ -139,6 +149,8 @@ class NetworkInference(NetworkAnalysis):
                         [max_candidate],
                         data.get_realisations(self.current_value,
                                               [max_candidate])[0])
+                if stage is not None:
+                    self._save_state(stage)
             else:
                 if self.settings['verbose']:
                     print(' -- not significant')
@@ -169,6 +181,101 @@ class NetworkInference(NetworkAnalysis):
                         cond_idx,
                         data.get_realisations(self.current_value, cond_idx)[0])
 
+    def _save_state(self, stage):
+        """Save the selection state of the current target to a checkpoint.
+
+        Save the selected variables and the position in the random stream for
+        surrogate creation to settings['checkpoint_dir']. A resumed analysis
+        continues from this state (see _restore_state). Nothing is saved if
+        no checkpoint directory is set.
+
+        Args:
+            stage : str
+                stage of the analysis to resume from, one of 'target',
+                'sources', 'prune', 'final'
+        """
+        if self.settings['checkpoint_dir'] is None:
+            return
+        if self._seed_sequence is None:
+            n_children_spawned = None
+        else:
+            n_children_spawned = self._seed_sequence.n_children_spawned
+        # Significance of sources is known after the inclusion of sources in
+        # bivariate analyses, attributes may have been removed by _reset().
+        state = {
+            'settings': self.settings,
+            'stage': stage,
+            'selected_vars_full': self.selected_vars_full,
+            'pvalues_sign_sources': getattr(
+                self, 'pvalues_sign_sources', None),
+            'statistic_sign_sources': getattr(
+                self, 'statistic_sign_sources', None),
+            'n_perm_achieved': self._n_perm_achieved,
+            'n_children_spawned': n_children_spawned}
+        _save_checkpoint(state, self.settings['checkpoint_dir'], 'state',
+                         self.target)
+
+    def _restore_state(self, data):
+        """Restore the selection state of the current target.
+
+        If settings['resume'] is True and a checkpoint of the current target
+        exists in settings['checkpoint_dir'], restore selected variables,
+        their realisations, and the position in the random stream for
+        surrogate creation. Stages of the analysis finished before the
+        checkpoint was saved are skipped (see _stage_finished). With a seed,
+        the resumed analysis returns the same results as an uninterrupted
+        analysis.
+
+        Args:
+            data : Data instance
+                raw data
+        """
+        self._resume_stage = None
+        if (self.settings['checkpoint_dir'] is None or
+                not self.settings['resume']):
+            return
+        state = _load_checkpoint(self.settings['checkpoint_dir'], 'state',
+                                 self.target)
+        if state is None:
+            return
+        _check_checkpoint_settings(state['settings'], self.settings)
+        if self.settings['verbose']:
+            print('Resuming analysis of target {0} at stage \'{1}\'.'.format(
+                self.target, state['stage']))
+
+        self.selected_vars_full = []
+        self.selected_vars_sources = []
+        self.selected_vars_target = []
+        self._selected_vars_realisations = None
+        if state['selected_vars_full']:
+            self._append_selected_vars(
+                state['selected_vars_full'],
+                data.get_realisations(self.current_value,
+                                      state['selected_vars_full'])[0])
+        self.pvalues_sign_sources = state['pvalues_sign_sources']
+        self.statistic_sign_sources = state['statistic_sign_sources']
+        self._n_perm_achieved = state['n_perm_achieved']
+        if self._seed_sequence is not None:
+            self._seed_sequence = np.random.SeedSequence(
+                self._seed_sequence.entropy,
+                spawn_key=self._seed_sequence.spawn_key,
+                pool_size=self._seed_sequence.pool_size,
+                n_children_spawned=state['n_children_spawned'])
+        self._resume_stage = state['stage']
+
+    def _stage_finished(self, stage):
+        """Return True if a resumed analysis already finished a stage."""
+        return (self._resume_stage is not None and
+                self._STAGES.index(self._resume_stage) >
+                self._STAGES.index(stage))
+
+    def _remaining_candidates(self, candidates, stage):
+        """Remove candidates already included before resuming a stage."""
+        if self._resume_stage != stage:
+            return candidates, False
+        remaining = [c for c in candidates if c not in self.selected_vars_full]
+        return remaining, len(remaining) < len(candidates)
+
     def _remove_non_significant(self, s, p, stat):
         # Remove non-significant sources from the candidate set. Loop
         # backwards over the candidates to remove them iteratively.
@@ -195,6 +302,9 @@ class NetworkInferenceMI(NetworkInference):
         self.settings.setdefault('add_conditionals', None)
         self.settings.setdefault('tau_sources', 1)
         self.settings.setdefault('local_values', False)
+        self.settings.setdefault('seed', None)
+        self.settings.setdefault('checkpoint_dir', None)
+        self.settings.setdefault('resume', False)
 
         # Check lags and taus for multivariate embedding.
         if 'max_lag_sources' not in self.settings:
@@ -244,11 +354,16 @@ class NetworkInferenceMI(NetworkInference):
         except KeyError:
             raise RuntimeError('Please provide an estimator class or name!')
         self._cmi_estimator = EstimatorClass(self.settings)
+        utils.check_precision(self._cmi_estimator, data)
 
         # Check the provided target and sources.
         self._check_target(target, data.n_processes)
         self._check_source_set(sources, data.n_processes)
 
+        # Derive the random stream for surrogate creation for this target.
+        self._seed_sequence = utils.seed_sequence(self.settings['seed'],
+                                                  self.target)
+
         # Check provided search depths (lags) for sources, set the
         # current_value.
         assert(data.n_samples >= self.settings['max_lag_sources'] + 1), (
@@ -289,6 +404,9 @@ class NetworkInferenceMI(NetworkInference):
         if self.settings['add_conditionals'] is not None:
             self._force_conditionals(self.settings['add_conditionals'], data)
 
+        # Continue from the selection state of an interrupted analysis.
+        self._restore_state(data)
+
     def _reset(self):
         """Reset instance after analysis."""
         self.__init__()
@@ -318,6 +436,9 @@ class NetworkInferenceTE(NetworkInference):
         self.settings.setdefault('tau_target', 1)
         self.settings.setdefault('tau_sources', 1)
         self.settings.setdefault('local_values', False)
+        self.settings.setdefault('seed', None)
+        self.settings.setdefault('checkpoint_dir', None)
+        self.settings.setdefault('resume', False)
 
         # Check lags and taus for multivariate embedding.
         if 'max_lag_sources' not in self.settings:
@@ -375,11 +496,16 @@ class NetworkInferenceTE(NetworkInference):
         except KeyError:
             raise RuntimeError('Please provide an estimator class or name!')
         self._cmi_estimator = EstimatorClass(self.settings)
+        utils.check_precision(self._cmi_estimator, data)
 
         # Check the provided target and sources.
         self._check_target(target, data.n_processes)
         self._check_source_set(sources, data.n_processes)
 
+        # Derive the random stream for surrogate creation for this target.
+        self._seed_sequence = utils.seed_sequence(self.settings['seed'],
+                                                  self.target)
+
         # Check provided search depths (lags) for source and target, set the
         # current_value.
         max_lag = max(self.settings['max_lag_sources'],
@@ -423,8 +549,13 @@ class NetworkInferenceTE(NetworkInference):
         if self.settings['add_conditionals'] is not None:
             self._force_conditionals(self.settings['add_conditionals'], data)
 
+        # Continue from the selection state of an interrupted analysis.
+        self._restore_state(data)
+
     def _include_target_candidates(self, data):
         """Test candidates from the target's past."""
+        if self._stage_finished('target'):
+            return
         procs = [self.target]
         # Make samples
         samples = np.arange(
@@ -432,7 +563,10 @@ class NetworkInferenceTE(NetworkInference):
                 self.current_value[1] - self.settings['max_lag_target'] - 1,
                 -self.settings['tau_target']).tolist()
         candidates = self._define_candidates(procs, samples)
-        sources_found = self._include_candidates(candidates, data)
+        candidates, included = self._remaining_candidates(candidates,
+                                                          'target')
+        sources_found = self._include_candidates(candidates, data, 'target')
+        sources_found = sources_found or included
 
         # If no candidates were found in the target's past, add at least one
         # sample so we are still calculating a proper TE.
@@ -442,6 +576,7 @@ class NetworkInferenceTE(NetworkInference):
             idx = (self.current_value[0], self.current_value[1] - 1)
             realisations = data.get_realisations(self.current_value, [idx])[0]
             self._append_selected_vars([idx], realisations)
+        self._save_state('sources')
 
     def _reset(self):
         """Reset instance after analysis."""
@@ -476,6 +611,8 @@ class NetworkInferenceBivariate(NetworkInference):
             data : Data instance
                 raw data
         """
+        if self._stage_finished('sources'):
+            return
         # Define candidate set and get realisations.
         procs = self.source_set
         if self.settings['max_lag_sources'] == 0:
@@ -504,6 +641,7 @@ class NetworkInferenceBivariate(NetworkInference):
         p, stat = self._remove_non_significant(s, p, stat)
         self.pvalues_sign_sources = p
         self.statistic_sign_sources = stat
+        self._save_state('final')
 
     def _test_final_conditional(self, data):
         """Perform statistical test on the final conditional set."""
@@ -547,6 +685,8 @@ class NetworkInferenceMultivariate(NetworkInference):
 
     def _include_source_candidates(self, data):
         """Test candidates in the source's past."""
+        if self._stage_finished('sources'):
+            return
         procs = self.source_set
         if self.settings['max_lag_sources'] == 0:
             samples = np.zeros(1).astype(int)
@@ -559,7 +699,9 @@ class NetworkInferenceMultivariate(NetworkInference):
         # Possible extension in the future: include non-selected target
         # candidates as further candidates, # they may get selected due to
         # synergies.
-        self._include_candidates(candidates, data)
+        candidates = self._remaining_candidates(candidates, 'sources')[0]
+        self._include_candidates(candidates, data, 'sources')
+        self._save_state('prune')
 
     def _prune_candidates(self, data):
         """Remove uninformative candidates from the final conditional set.
@@ -586,11 +728,11 @@ class NetworkInferenceMultivariate(NetworkInference):
             cond_dim = len(self.selected_vars_full) - 1
             candidate_realisations = np.empty(
                 (data.n_realisations(self.current_value) *
-                 len(self.selected_vars_sources), 1)).astype(data.data_type)
+                 len(self.selected_vars_sources), 1), dtype=data.data_type)
             conditional_realisations = np.empty(
                 (data.n_realisations(self.current_value) *
                  len(self.selected_vars_sources),
-                 cond_dim)).astype(data.data_type)
+                 cond_dim), dtype=data.data_type)
 
             # calculate TE simultaneously for all candidates
             i_1 = 0
@@ -634,6 +776,7 @@ class NetworkInferenceMultivariate(NetworkInference):
                 # if self.settings['verbose']:
                 #     print(' -- not significant\n')
                 self._remove_selected_var(min_candidate)
+                self._save_state('prune')
             else:
                 if self.settings['verbose']:
                     print(' -- significant')
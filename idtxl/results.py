@@ -250,6 +250,9 @@ class ResultsSingleProcessAnalysis(Results):
             - ais_pval : float - p-value of AIS estimate
             - ais_sign : bool - significance of AIS estimate wrt. to the
                 alpha_mi specified in the settings
+            - ais_n_perm : int - no. permutations used for testing the AIS
+                estimate, smaller than n_perm_mi if testing stopped early
+                (see settings 'sequential_perm')
             - selected_var : list of tuples - variables with significant
                 information about the current value of the process that have
                 been added to the processes past state, a variable is
@@ -358,12 +361,17 @@ class ResultsNetworkAnalysis(Results):
           the target
         - omnibus_sign : bool - significance of omnibus information transfer
           wrt. to the alpha_omnibus specified in the settings
+        - omnibus_n_perm : int - no. permutations used by the omnibus test,
+          smaller than n_perm_omnibus if testing stopped early (see settings
+          'sequential_perm')
         - selected_vars_sources : list of tuples - source variables with
           significant information about the current value
         - selected_vars_target : list of tuples - target variables with
           significant information about the current value
         - selected_sources_pval : array of floats - p-value for each selected
           variable
+        - selected_sources_n_perm : int - no. permutations used for testing
+          selected variables
         - selected_sources_te : array of floats - TE-value for each selected
           variable
         - sources_tested : list of int - list of sources tested for the current
@@ -0,0 +1,282 @@
+"""Distribute network analyses over workers sharing a file system.
+
+Analyses are split into single-target tasks (or single-process tasks for
+active information storage), which are written to a queue directory. Workers
+on any machine with access to the queue directory claim tasks and write
+partial results back to the queue. A collector combines partial results and
+performs FDR-correction on the network level.
+
+Example:
+
+    >>> # Submit the analysis of all targets.
+    >>> submit_network('/shared/queue', MultivariateTE, settings, data)
+    >>> # Run a worker on each node, either by calling run_worker() or from
+    >>> # the command line: python -m idtxl.scheduler /shared/queue
+    >>> run_worker('/shared/queue')
+    >>> # Combine results once all tasks are finished.
+    >>> results = collect_results('/shared/queue')
+
+The queue directory contains the job description (job.p), the data (data.p),
+and the sub-directories 'tasks' (open tasks), 'claimed' (tasks currently
+analysed), 'failed' (tasks that raised an error), and 'results'. Tasks are
+claimed by renaming the task file, which is atomic on a single file system,
+such that each task is analysed by exactly one worker. Partial results are
+saved as checkpoints (see settings 'checkpoint_dir' and 'resume' in
+analyse_network). Tasks that are requeued after a worker failed continue
+from the last saved state.
+"""
+import copy as cp
+import os
+import pickle
+import socket
+import sys
+import traceback
+from .single_process_analysis import SingleProcessAnalysis
+from .network_analysis import _checkpoint_path, _load_checkpoint
+from .results import ResultsNetworkInference, ResultsSingleProcessAnalysis
+from .stats import ais_fdr, network_fdr
+
+_QUEUE_DIRS = ('tasks', 'claimed', 'failed', 'results')
+
+
+def submit_network(queue_dir, analysis_class, settings, data, targets='all',
+                   sources='all'):
+    """Write the analysis of a network as single-target tasks to a queue.
+
+    Args:
+        queue_dir : str
+            path to the queue directory, must be accessible by all workers
+        analysis_class : class
+            analysis class, e.g., MultivariateTE or ActiveInformationStorage
+        settings : dict
+            analysis settings, see documentation of the analysis class'
+            analyse_network() method
+        data : Data instance | str
+            raw data for analysis or path to a pickled Data instance on the
+            shared file system, which is then read by the workers directly
+        targets : list of int | 'all' [optional]
+            index of target processes or processes for which AIS is estimated
+            (default='all')
+        sources : list of int | list of list | 'all' [optional]
+            indices of source processes for each target (default='all'), see
+            documentation of analyse_network(), ignored for AIS
+
+    Returns:
+        list of int
+            targets or processes written to the queue
+    """
+    if os.path.exists(os.path.join(queue_dir, 'job.p')):
+        raise RuntimeError('Queue directory {0} already holds a job.'.format(
+            queue_dir))
+    for d in _QUEUE_DIRS:
+        os.makedirs(os.path.join(queue_dir, d), exist_ok=True)
+
+    # Save data once, tasks hold a reference to the data file.
+    if isinstance(data, str):
+        data_file = os.path.abspath(data)
+        with open(data_file, 'rb') as f:
+            data = pickle.load(f)
+    else:
+        data_file = 'data.p'
+        _dump(data, os.path.join(queue_dir, data_file))
+
+    # Partial results are saved as checkpoints to the results directory.
+    settings = cp.deepcopy(settings)
+    settings.setdefault('verbose', True)
+    settings.setdefault('fdr_correction', True)
+    settings['checkpoint_dir'] = os.path.abspath(
+        os.path.join(queue_dir, 'results'))
+    settings['resume'] = True
+
+    if targets == 'all':
+        targets = [t for t in range(data.n_processes)]
+    if issubclass(analysis_class, SingleProcessAnalysis):
+        method = 'analyse_single_process'
+        args = [(t,) for t in targets]
+    else:
+        method = 'analyse_single_target'
+        if sources == 'all':
+            sources = ['all' for t in targets]
+        elif type(sources[0]) is int:
+            sources = [sources for t in targets]
+        assert(len(sources) == len(targets)), ('List of targets and list of '
+                                               'sources have to have the same '
+                                               'length')
+        args = list(zip(targets, sources))
+
+    _dump({'analysis_class': analysis_class,
+           'settings': settings,
+           'targets': targets,
+           'n_nodes': data.n_processes,
+           'n_realisations': data.n_realisations(),
+           'normalised': data.normalise},
+          os.path.join(queue_dir, 'job.p'))
+    for a in args:
+        _dump({'analysis_class': analysis_class,
+               'method': method,
+               'settings': settings,
+               'data_file': data_file,
+               'args': a},
+              os.path.join(queue_dir, 'tasks', 'task_{0}.p'.format(a[0])))
+    return targets
+
+
+def run_worker(queue_dir, max_tasks=None):
+    """Claim and analyse tasks from a queue until no open tasks are left.
+
+    Tasks are claimed atomically, such that any number of workers can run on
+    the same queue in parallel. Tasks that raise an error are moved to the
+    'failed' directory together with the error message, the worker then
+    continues with the next task.
+
+    Args:
+        queue_dir : str
+            path to the queue directory
+        max_tasks : int [optional]
+            maximum number of tasks analysed by this worker, if None, all
+            open tasks are analysed (default=None)
+
+    Returns:
+        int
+            number of tasks analysed successfully
+    """
+    worker_id = '{0}_{1}'.format(socket.gethostname(), os.getpid())
+    data_cache = {}
+    n_done = 0
+    n_claimed = 0
+    while max_tasks is None or n_claimed < max_tasks:
+        claimed = _claim_task(queue_dir, worker_id)
+        if claimed is None:
+            break
+        n_claimed += 1
+        with open(claimed, 'rb') as f:
+            task = pickle.load(f)
+        try:
+            data_file = os.path.join(queue_dir, task['data_file'])
+            if data_file not in data_cache:
+                with open(data_file, 'rb') as f:
+                    data_cache[data_file] = pickle.load(f)
+            # The result is saved to the results directory as a checkpoint.
+            task['analysis_class']()._analyse_checkpointed(
+                task['method'], task['settings'], data_cache[data_file],
+                task['args'])
+        except Exception:
+            failed = os.path.join(queue_dir, 'failed',
+                                  os.path.basename(claimed))
+            with open(failed + '.log', 'w') as f:
+                f.write(traceback.format_exc())
+            os.replace(claimed, failed)
+            print('Task {0} failed, see {1}.log.'.format(task['args'][0],
+                                                        failed))
+        else:
+            os.remove(claimed)
+            n_done += 1
+    return n_done
+
+
+def requeue_tasks(queue_dir, failed=True):
+    """Move claimed tasks back to the queue.
+
+    Requeue tasks of workers that were stopped before finishing their task.
+    Only call this function if no workers are running on the queue. Requeued
+    tasks continue from their last saved state.
+
+    Args:
+        queue_dir : str
+            path to the queue directory
+        failed : bool [optional]
+            also requeue tasks that raised an error (default=True)
+
+    Returns:
+        int
+            number of requeued tasks
+    """
+    dirs = ['claimed', 'failed'] if failed else ['claimed']
+    n_requeued = 0
+    for d in dirs:
+        for name in os.listdir(os.path.join(queue_dir, d)):
+            path = os.path.join(queue_dir, d, name)
+            if name.endswith('.log'):
+                os.remove(path)
+                continue
+            task_name = name.split('.p')[0] + '.p'
+            os.replace(path, os.path.join(queue_dir, 'tasks', task_name))
+            n_requeued += 1
+    return n_requeued
+
+
+def collect_results(queue_dir):
+    """Combine partial results of all tasks in a queue.
+
+    Combine partial results and perform FDR-correction on the network level
+    if requested in the settings (see stats.network_fdr() and
+    stats.ais_fdr()).
+
+    Args:
+        queue_dir : str
+            path to the queue directory
+
+    Returns:
+        ResultsNetworkInference | ResultsSingleProcessAnalysis instance
+            results of the network analysis
+    """
+    with open(os.path.join(queue_dir, 'job.p'), 'rb') as f:
+        job = pickle.load(f)
+    results_dir = job['settings']['checkpoint_dir']
+    missing = [t for t in job['targets'] if not os.path.isfile(
+        _checkpoint_path(results_dir, 'result', t))]
+    if missing:
+        raise RuntimeError('Can not collect results - tasks for {0} are not '
+                           'finished.'.format(missing))
+
+    if issubclass(job['analysis_class'], SingleProcessAnalysis):
+        results = ResultsSingleProcessAnalysis(
+            n_nodes=job['n_nodes'], n_realisations=job['n_realisations'],
+            normalised=job['normalised'])
+        fdr = ais_fdr
+    else:
+        results = ResultsNetworkInference(
+            n_nodes=job['n_nodes'], n_realisations=job['n_realisations'],
+            normalised=job['normalised'])
+        fdr = network_fdr
+    for t in job['targets']:
+        res_single = _load_checkpoint(results_dir, 'result', t)
+        results.combine_results(res_single)
+
+    # Get no. realisations actually used for estimation from single target
+    # analysis.
+    results.data_properties.n_realisations = (
+        res_single.data_properties.n_realisations)
+    if job['settings']['fdr_correction']:
+        results = fdr(job['settings'], results)
+    return results
+
+
+def _claim_task(queue_dir, worker_id):
+    """Claim an open task, return path of the claimed task or None."""
+    tasks_dir = os.path.join(queue_dir, 'tasks')
+    for name in sorted(os.listdir(tasks_dir)):
+        if not name.endswith('.p'):  # task is still being written
+            continue
+        claimed = os.path.join(queue_dir, 'claimed',
+                               '{0}.{1}'.format(name, worker_id))
+        try:
+            os.rename(os.path.join(tasks_dir, name), claimed)
+        except FileNotFoundError:  # task was claimed by another worker
+            continue
+        return claimed
+    return None
+
+
+def _dump(obj, path):
+    """Pickle object to a temporary file and move it to its final path."""
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print('Usage: python -m idtxl.scheduler <queue_dir>')
+        sys.exit(1)
+    print('Analysed {0} tasks.'.format(run_worker(sys.argv[1])))
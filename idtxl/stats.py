@@ -1,6 +1,7 @@
 """Provide statistics functions."""
 import copy as cp
 import numpy as np
+from scipy.stats import beta
 from . import idtxl_utils as utils
 
 
@@ -62,8 +63,9 @@ def ais_fdr(settings=None, *results):
             pval = np.append(
                 pval, results_comb._single_process[process].ais_pval)
             process_idx = np.append(process_idx, process)
-            n_perm = np.append(
-                    n_perm, results_comb.settings.n_perm_mi)
+            n_perm = np.append(n_perm, _get_n_perm(
+                results_comb._single_process[process].ais_n_perm,
+                results_comb.settings.n_perm_mi))
 
     if pval.size == 0:
         print('FDR correction: no links in final results ...\n')
@@ -164,8 +166,9 @@ def network_fdr(settings=None, *results):
                 pval = np.append(
                     pval, results_comb._single_target[target].omnibus_pval)
                 target_idx = np.append(target_idx, target)
-                n_perm = np.append(
-                        n_perm, results_comb.settings.n_perm_omnibus)
+                n_perm = np.append(n_perm, _get_n_perm(
+                    results_comb._single_target[target].omnibus_n_perm,
+                    results_comb.settings.n_perm_omnibus))
     else:  # individual variables
         for target in results_comb.targets_analysed:
             if results_comb._single_target[target].omnibus_sign:
@@ -179,8 +182,10 @@ def network_fdr(settings=None, *results):
                 cands = (cands +
                          (results_comb._single_target[target].
                           selected_vars_sources))
-                n_perm = np.append(
-                    n_perm, results_comb.settings.n_perm_max_seq)
+                n_perm = np.append(n_perm, _get_n_perm(
+                    results_comb._single_target[target].
+                    selected_sources_n_perm,
+                    results_comb.settings.n_perm_max_seq))
 
     if pval.size == 0:
         print('No links in final results ...')
@@ -233,6 +238,13 @@ def network_fdr(settings=None, *results):
     return results_comb
 
 
+def _get_n_perm(n_perm_achieved, n_perm):
+    """Return no. permutations used by a test, default to the requested no."""
+    if n_perm_achieved is None:
+        return n_perm
+    return n_perm_achieved
+
+
 def _perform_fdr_corretion(pval, constant, alpha):
     """Calculate sequential threshold for FDR-correction.
 
@@ -312,6 +324,10 @@ def omnibus_test(analysis_setup, data):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - sequential_perm : bool [optional] - create surrogates in
+              blocks and stop as soon as the test is clearly
+              non-significant, see _permutation_test() for further settings
+              (default=False)
 
         data : Data instance
             raw data
@@ -355,30 +371,34 @@ def omnibus_test(analysis_setup, data):
     # Create the surrogate distribution by permuting the conditional sources.
     if analysis_setup.settings['verbose']:
         print('omnibus test, n_perm: {0}'.format(n_permutations))
-    if (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
-            permute_in_time):
-        # Generate the surrogates analytically
-        analysis_setup.settings['analytical_surrogates'] = True
-        surr_distribution = (analysis_setup._cmi_estimator.
-                             estimate_surrogates_analytic(
-                               n_perm=n_permutations,
+    analytic = (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
+                permute_in_time)
+    analysis_setup.settings['analytical_surrogates'] = analytic
+
+    def create_surrogates(n_perm):
+        if analytic:  # generate the surrogates analytically
+            return analysis_setup._cmi_estimator.estimate_surrogates_analytic(
+                               n_perm=n_perm,
                                var1=cond_source_realisations,
                                var2=analysis_setup._current_value_realisations,
-                               conditional=cond_target_realisations))
-    else:
-        analysis_setup.settings['analytical_surrogates'] = False
+                               conditional=cond_target_realisations)
         surr_cond_real = _get_surrogates(data,
                                          analysis_setup.current_value,
                                          analysis_setup.selected_vars_sources,
-                                         n_permutations,
-                                         analysis_setup.settings)
-
-        surr_distribution = analysis_setup._cmi_estimator.estimate_parallel(
-                            n_chunks=n_permutations,
+                                         n_perm,
+                                         analysis_setup.settings,
+                                         _spawn_rng(analysis_setup))
+        return analysis_setup._cmi_estimator.estimate_parallel(
+                            n_chunks=n_perm,
                             re_use=['var2', 'conditional'],
                             var1=surr_cond_real,
                             var2=analysis_setup._current_value_realisations,
                             conditional=cond_target_realisations)
+
+    surr_distribution = _permutation_test(
+        analysis_setup, 'omnibus', create_surrogates, n_permutations,
+        lambda surr: _is_non_significant(analysis_setup, statisitc, surr,
+                                         alpha))
     [significance, pvalue] = _find_pvalue(statisitc, surr_distribution,
                                           alpha, 'one_bigger')
     if analysis_setup.settings['verbose']:
@@ -407,6 +427,10 @@ def max_statistic(analysis_setup, data, candidate_set, te_max_candidate):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - sequential_perm : bool [optional] - create surrogates in
+              blocks and stop as soon as the test is clearly
+              non-significant, see _permutation_test() for further settings
+              (default=False)
 
         data : Data instance
             raw data
@@ -434,8 +458,13 @@ def max_statistic(analysis_setup, data, candidate_set, te_max_candidate):
         print('maximum statistic, n_perm: {0}'.format(
                             analysis_setup.settings['n_perm_max_stat']))
 
-    surr_table = _create_surrogate_table(analysis_setup, data, candidate_set,
-                                         n_perm)
+    surr_table = _permutation_test(
+        analysis_setup, 'max_stat',
+        lambda n: _create_surrogate_table(analysis_setup, data, candidate_set,
+                                          n),
+        n_perm,
+        lambda table: _is_non_significant(analysis_setup, te_max_candidate,
+                                          _find_table_max(table), alpha))
     max_distribution = _find_table_max(surr_table)
     [significance, pvalue] = _find_pvalue(statistic=te_max_candidate,
                                           distribution=max_distribution,
@@ -483,6 +512,10 @@ def max_statistic_sequential(analysis_setup, data, conditioning='full'):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - sequential_perm : bool [optional] - create surrogates in
+              blocks and stop as soon as the test is clearly
+              non-significant, see _permutation_test() for further settings
+              (default=False)
 
         data : Data instance
             raw data
@@ -524,13 +557,13 @@ def max_statistic_sequential(analysis_setup, data, conditioning='full'):
         conditional_realisations = np.empty(
             (data.n_realisations(analysis_setup.current_value) *
                 len(analysis_setup.selected_vars_sources),
-             len(idx_conditional) - 1)).astype(data.data_type)
+             len(idx_conditional) - 1), dtype=data.data_type)
     elif conditioning == 'target':
         idx_conditional = analysis_setup.selected_vars_target
         conditional_realisations = np.empty(
             (data.n_realisations(analysis_setup.current_value) *
                 len(analysis_setup.selected_vars_sources),
-             len(idx_conditional))).astype(data.data_type)
+             len(idx_conditional)), dtype=data.data_type)
     elif conditioning == 'none':
         idx_conditional = None
     else:
@@ -539,7 +572,7 @@ def max_statistic_sequential(analysis_setup, data, conditioning='full'):
             ' ''full'', ''target'', or ''none''.'.format(conditioning))
     candidate_realisations = np.empty(
         (data.n_realisations(analysis_setup.current_value) *
-         len(analysis_setup.selected_vars_sources), 1)).astype(data.data_type)
+         len(analysis_setup.selected_vars_sources), 1), dtype=data.data_type)
 
     # Calculate TE for each candidate in the conditional source set, i.e.,
     # calculate the conditional MI between each candidate and the current
@@ -591,13 +624,23 @@ def max_statistic_sequential(analysis_setup, data, conditioning='full'):
             n_permutations <= analysis_setup._min_stats_surr_table.shape[1]):
         surr_table = analysis_setup._min_stats_surr_table[:, :n_permutations]
         assert len(analysis_setup.selected_vars_sources) == surr_table.shape[0]
+        analysis_setup._n_perm_achieved['max_seq'] = n_permutations
     else:
-        surr_table = _create_surrogate_table(
+        # Stop early only if the largest candidate is clearly
+        # non-significant, all remaining candidates are then non-significant
+        # as well.
+        surr_table = _permutation_test(
+            analysis_setup, 'max_seq',
+            lambda n: _create_surrogate_table(
                             analysis_setup=analysis_setup,
                             data=data,
                             idx_test_set=analysis_setup.selected_vars_sources,
-                            n_perm=n_permutations,
-                            conditioning=conditioning)
+                            n_perm=n,
+                            conditioning=conditioning),
+            n_permutations,
+            lambda table: _is_non_significant(
+                analysis_setup, individual_stat_sorted[0],
+                _find_table_max(table), alpha))
     max_distribution = _sort_table_max(surr_table)
 
     # Compare each original value with the distribution of the same rank,
@@ -639,6 +682,10 @@ def min_statistic(analysis_setup, data, candidate_set, te_min_candidate):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - sequential_perm : bool [optional] - create surrogates in
+              blocks and stop as soon as the test is clearly
+              non-significant, see _permutation_test() for further settings
+              (default=False)
 
         data : Data instance
             raw data
@@ -667,8 +714,13 @@ def min_statistic(analysis_setup, data, candidate_set, te_min_candidate):
 
     assert(candidate_set), 'The candidate set is empty.'
 
-    surr_table = _create_surrogate_table(analysis_setup, data, candidate_set,
-                                         n_perm)
+    surr_table = _permutation_test(
+        analysis_setup, 'min_stat',
+        lambda n: _create_surrogate_table(analysis_setup, data, candidate_set,
+                                          n),
+        n_perm,
+        lambda table: _is_non_significant(analysis_setup, te_min_candidate,
+                                          _find_table_min(table), alpha))
     min_distribution = _find_table_min(surr_table)
     [significance, pvalue] = _find_pvalue(statistic=te_min_candidate,
                                           distribution=min_distribution,
@@ -697,6 +749,10 @@ def mi_against_surrogates(analysis_setup, data):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - sequential_perm : bool [optional] - create surrogates in
+              blocks and stop as soon as the test is clearly
+              non-significant, see _permutation_test() for further settings
+              (default=False)
 
         data : Data instance
             raw data
@@ -745,35 +801,39 @@ def mi_against_surrogates(analysis_setup, data):
                                             analysis_setup.current_value,
                                             [analysis_setup.current_value])
         '''
-    if (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
-            permute_in_time):
-        # Generate the surrogates analytically
-        analysis_setup.settings['analytical_surrogates'] = True
-        surr_dist = (analysis_setup._cmi_estimator.
-                     estimate_surrogates_analytic(
-                            n_perm=n_perm,
+    orig_mi = analysis_setup._cmi_estimator.estimate(
                             var1=analysis_setup._current_value_realisations,
                             var2=analysis_setup._selected_vars_realisations,
-                            conditional=None))
-    else:
-        analysis_setup.settings['analytical_surrogates'] = False
+                            conditional=None
+                            )
+    analytic = (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
+                permute_in_time)
+    analysis_setup.settings['analytical_surrogates'] = analytic
+
+    def create_surrogates(n):
+        if analytic:  # generate the surrogates analytically
+            return analysis_setup._cmi_estimator.estimate_surrogates_analytic(
+                            n_perm=n,
+                            var1=analysis_setup._current_value_realisations,
+                            var2=analysis_setup._selected_vars_realisations,
+                            conditional=None)
         surr_realisations = _get_surrogates(data,
                                             analysis_setup.current_value,
                                             [analysis_setup.current_value],
-                                            n_perm,
-                                            analysis_setup.settings)
-
-        surr_dist = analysis_setup._cmi_estimator.estimate_parallel(
-                            n_chunks=n_perm,
+                                            n,
+                                            analysis_setup.settings,
+                                            _spawn_rng(analysis_setup))
+        return analysis_setup._cmi_estimator.estimate_parallel(
+                            n_chunks=n,
                             re_use=['var2', 'conditional'],
                             var1=surr_realisations,
                             var2=analysis_setup._selected_vars_realisations,
                             conditional=None)
-    orig_mi = analysis_setup._cmi_estimator.estimate(
-                            var1=analysis_setup._current_value_realisations,
-                            var2=analysis_setup._selected_vars_realisations,
-                            conditional=None
-                            )
+
+    surr_dist = _permutation_test(
+        analysis_setup, 'mi', create_surrogates, n_perm,
+        lambda surr: _is_non_significant(analysis_setup, orig_mi, surr,
+                                         alpha))
     [significance, p_value] = _find_pvalue(statistic=orig_mi,
                                            distribution=surr_dist,
                                            alpha=alpha,
@@ -843,7 +903,8 @@ def unq_against_surrogates(analysis_setup, data):
                                         analysis_setup.current_value,
                                         [analysis_setup.sources[0]],
                                         n_perm,
-                                        analysis_setup.settings)
+                                        analysis_setup.settings,
+                                        _spawn_rng(analysis_setup))
     # Calculate surrogate distribution for unique information of source 1.
     # Note: calling  .estimate_parallel does not work here because the PID
     # estimator returns a dictionary not a single value. We have to get the
@@ -872,7 +933,8 @@ def unq_against_surrogates(analysis_setup, data):
                                         analysis_setup.current_value,
                                         [analysis_setup.sources[1]],
                                         n_perm,
-                                        analysis_setup.settings)
+                                        analysis_setup.settings,
+                                        _spawn_rng(analysis_setup))
     # Calculate surrogate distribution for unique information of source 2.
     surr_dist_s2 = np.empty(n_perm)
     chunk_size = int(surr_realisations.shape[0] / n_perm)
@@ -964,7 +1026,8 @@ def syn_shd_against_surrogates(analysis_setup, data):
                                         analysis_setup.current_value,
                                         [analysis_setup.current_value],
                                         n_perm,
-                                        analysis_setup.settings)
+                                        analysis_setup.settings,
+                                        _spawn_rng(analysis_setup))
     # Calculate surrogate distribution for shd/syn information of both sources.
     # Note: calling  .estimate_parallel does not work here because the PID
     # estimator returns a dictionary not a single value. We have to get the
@@ -1029,6 +1092,11 @@ def _create_surrogate_table(analysis_setup, data, idx_test_set, n_perm,
     for bivariate TE only the past variables from the target are required (not
     the variables selected from other relevant sources).
 
+    Surrogates for all candidates are created from the same permutations and
+    are estimated in a single call to the estimator. If the surrogates exceed
+    the memory budget set in settings['max_surrogate_bytes'] (default=256 MB),
+    estimation is split into blocks of permutations.
+
     Args:
         analysis_setup : instance of NetworkAnalysis or child class
             information on the current analysis, must contain an attribute
@@ -1070,42 +1138,186 @@ def _create_surrogate_table(analysis_setup, data, idx_test_set, n_perm,
     #     print('\tcand.', end='')
     surr_table = np.zeros((len(idx_test_set), n_perm))
     current_value_realisations = analysis_setup._current_value_realisations
-    idx_c = 0
-    for candidate in idx_test_set:
-        # if analysis_setup.settings['verbose']:
-        #     print('\t{0}'.format(analysis_setup._idx_to_lag([candidate])[0]),
-        #           end='')
-        if (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
-                permute_in_time):
-            # Generate the surrogates analytically
-            analysis_setup.settings['analytical_surrogates'] = True
+    if (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
+            permute_in_time):
+        # Generate the surrogates analytically. Retrieve realisations for all
+        # candidates at once and draw all surrogates for a candidate from its
+        # analytic null distribution in a single call.
+        analysis_setup.settings['analytical_surrogates'] = True
+        candidate_realisations = data.get_realisations(
+                                            analysis_setup.current_value,
+                                            idx_test_set)[0]
+        for idx_c in range(len(idx_test_set)):
             surr_table[idx_c, :] = (
                 analysis_setup._cmi_estimator.estimate_surrogates_analytic(
                     n_perm=n_perm,
-                    var1=data.get_realisations(analysis_setup.current_value,
-                                               [candidate])[0],
+                    var1=candidate_realisations[:, idx_c:idx_c + 1],
                     var2=current_value_realisations,
                     conditional=analysis_setup._selected_vars_realisations))
-        else:
-            analysis_setup.settings['analytical_surrogates'] = False
-            surr_candidate_realisations = _get_surrogates(
-                                                 data,
-                                                 analysis_setup.current_value,
-                                                 [candidate],
-                                                 n_perm,
-                                                 analysis_setup.settings)
-            surr_table[idx_c, :] = (
-                analysis_setup._cmi_estimator.estimate_parallel(
-                    n_chunks=n_perm,
-                    re_use=['var2', 'conditional'],
-                    var1=surr_candidate_realisations,
-                    var2=current_value_realisations,
-                    conditional=conditional))
-        idx_c += 1
+        return surr_table
+
+    analysis_setup.settings['analytical_surrogates'] = False
+    # Create surrogates for all candidates from a single matrix of
+    # permutations and estimate all surrogate values in a single batch of
+    # n_candidates * n_perm chunks. Split the batch into blocks of
+    # permutations if it exceeds the memory budget.
+    n_cand = len(idx_test_set)
+    n_perm_batch = _get_n_perm_batch(analysis_setup, data, n_cand,
+                                     conditional)
+    n_real = current_value_realisations.shape[0]
+    i_1 = 0
+    for surr_realisations in _iter_surrogates(data,
+                                              analysis_setup.current_value,
+                                              idx_test_set,
+                                              n_perm,
+                                              analysis_setup.settings,
+                                              chunk_size=n_perm_batch,
+                                              rng=_spawn_rng(analysis_setup)):
+        # Order surrogates by candidates, such that chunks of one candidate
+        # are consecutive.
+        i_2 = i_1 + surr_realisations.shape[0] // n_real
+        surr_table[:, i_1:i_2] = (
+            analysis_setup._cmi_estimator.estimate_parallel(
+                n_chunks=n_cand * (i_2 - i_1),
+                re_use=['var2', 'conditional'],
+                var1=surr_realisations.T.reshape(surr_realisations.size, 1),
+                var2=current_value_realisations,
+                conditional=conditional).reshape(n_cand, i_2 - i_1))
+        i_1 = i_2
 
     return surr_table
 
 
+def _get_n_perm_batch(analysis_setup, data, n_cand, conditional):
+    """Return max. no. permutations estimated in a single batch.
+
+    Surrogates for all candidates and one permutation are estimated together.
+    The no. permutations per batch is limited by the memory budget in
+    settings['max_surrogate_bytes'] (default=256 MB) for the surrogate
+    realisations. For parallel estimators, which replicate re-used variables
+    for each chunk, the budget also covers the replicated current value and
+    conditional realisations. At least one permutation is estimated per
+    batch.
+    """
+    analysis_setup.settings.setdefault('max_surrogate_bytes', 256 * 2 ** 20)
+    n_real = data.n_realisations(analysis_setup.current_value)
+    n_dim = 1
+    if analysis_setup._cmi_estimator.is_parallel():
+        n_dim += analysis_setup._current_value_realisations.shape[1]
+        if conditional is not None:
+            n_dim += conditional.shape[1]
+    bytes_per_perm = (n_cand * n_real * n_dim *
+                      np.dtype(data.data_type).itemsize)
+    return max(1, analysis_setup.settings['max_surrogate_bytes'] //
+               bytes_per_perm)
+
+
+def _permutation_test(analysis_setup, test, create_surrogates, n_perm,
+                      is_non_significant):
+    """Create surrogates for a permutation test.
+
+    By default, surrogates are created for all n_perm permutations. If
+    settings['sequential_perm'] is True, surrogates are created in blocks of
+    permutations. After each block, the test is stopped if it is clearly
+    non-significant, i.e., if a confidence interval around the p-value
+    estimated from the surrogates created so far lies completely above the
+    critical alpha level (see _is_non_significant()). Tests that may be
+    significant are continued up to n_perm permutations, such that their
+    p-values have the same resolution as without early stopping (Besag &
+    Clifford, 1991). Early stopping hence does not raise the minimum
+    attainable p-value of significant tests, which is required for
+    FDR-correction (see network_fdr() and ais_fdr()).
+
+    The number of permutations actually used is stored for each test in the
+    attribute _n_perm_achieved of the analysis setup, such that minimum
+    attainable p-values can be checked, e.g., during FDR-correction.
+
+    References:
+
+    - Besag, J., & Clifford, P. (1991). Sequential Monte Carlo p-values.
+      Biometrika, 78(2), 301-304.
+
+    Args:
+        analysis_setup : instance of NetworkAnalysis or child class
+            information on the current analysis, can have an optional
+            attribute 'settings', a dictionary with parameters for
+            sequential testing:
+
+            - sequential_perm : bool [optional] - create surrogates in
+              blocks and stop as soon as the test is clearly
+              non-significant (default=False)
+            - perm_block_size : int [optional] - no. permutations per block
+              (default=50)
+            - perm_error_rate : float [optional] - probability that the
+              p-value lies below the confidence interval used for stopping,
+              i.e., the per-block probability of stopping a test that would
+              be significant using all permutations (default=0.001)
+
+        test : str
+            name of the test, e.g., 'omnibus', used as key in _n_perm_achieved
+        create_surrogates : callable
+            create_surrogates(n) returns surrogate values for n new
+            permutations, where the last axis indexes permutations
+        n_perm : int
+            max. number of permutations
+        is_non_significant : callable
+            is_non_significant(surrogates) returns True if the test is
+            clearly non-significant given all surrogates created so far
+
+    Returns:
+        numpy array
+            surrogate values, where the last axis indexes permutations
+    """
+    analysis_setup.settings.setdefault('sequential_perm', False)
+    if analysis_setup.settings['sequential_perm']:
+        analysis_setup.settings.setdefault('perm_block_size', 50)
+        block_size = analysis_setup.settings['perm_block_size']
+        surrogates = create_surrogates(min(block_size, n_perm))
+        while (surrogates.shape[-1] < n_perm and
+               not is_non_significant(surrogates)):
+            n_block = min(block_size, n_perm - surrogates.shape[-1])
+            surrogates = np.concatenate(
+                (surrogates, create_surrogates(n_block)), axis=-1)
+        if analysis_setup.settings['verbose']:
+            print('n_perm used: {0} '.format(surrogates.shape[-1]), end='')
+    else:
+        surrogates = create_surrogates(n_perm)
+    analysis_setup._n_perm_achieved[test] = surrogates.shape[-1]
+    return surrogates
+
+
+def _is_non_significant(analysis_setup, statistic, distribution, alpha):
+    """Test if a permutation test is clearly non-significant.
+
+    Compute the lower bound of a Clopper-Pearson confidence interval for the
+    p-value of a one-tailed test (H1 > H0) from the number of surrogates that
+    are bigger or equal to the statistic. The test is clearly non-significant
+    if the lower bound is not smaller than the critical alpha level.
+
+    Args:
+        analysis_setup : instance of NetworkAnalysis or child class
+            information on the current analysis, see _permutation_test()
+        statistic : float
+            value to be tested against distribution
+        distribution : numpy array
+            1-dimensional distribution of surrogate values
+        alpha : float
+            critical alpha level for statistical significance
+
+    Returns:
+        bool
+            True if the test is clearly non-significant
+    """
+    analysis_setup.settings.setdefault('perm_error_rate', 0.001)
+    n = distribution.shape[0]
+    n_bigger = np.sum(distribution >= statistic)
+    if n_bigger == 0:
+        return False
+    lower = beta.ppf(analysis_setup.settings['perm_error_rate'], n_bigger,
+                     n - n_bigger + 1)
+    return lower >= alpha
+
+
 def _find_table_max(table):
     """Find maximum for each column of a table."""
     return np.max(table, axis=0)
@@ -1180,6 +1392,16 @@ def _find_pvalue(statistic, distribution, alpha, tail):
     return significance, pvalue
 
 
+def _spawn_rng(analysis_setup):
+    """Return random number generator for the next surrogate creation.
+
+    Return a generator drawing from the next child stream of the analysis'
+    seed sequence (see idtxl_utils.seed_sequence()). Return None, i.e., use the
+    global NumPy random state, if no seed was provided.
+    """
+    return utils.spawn_rng(getattr(analysis_setup, '_seed_sequence', None))
+
+
 def _sufficient_replications(data, n_perm):
     """Test if no. replications is high enough for surrogate creation.
 
@@ -1192,7 +1414,8 @@ def _sufficient_replications(data, n_perm):
         return False
 
 
-def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings):
+def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings,
+                    rng=None):
     """Return surrogate data for statistical testing.
 
     Calls surrogate generation methods of the data instance. The method for
@@ -1204,6 +1427,11 @@ def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings):
     order of replications intact). The latter method can be forced by setting
     'permute_in_time' to True in 'perm_settings'.
 
+    Realisations are retrieved from the data only once. All permutations are
+    drawn up front and surrogates for all permutations are created by a single
+    gather from the original realisations. See _iter_surrogates() for
+    creating surrogates in chunks of permutations to bound memory usage.
+
     Args:
         data : Data instance
             raw data for analysis
@@ -1219,46 +1447,106 @@ def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings):
             'permute_in_time' to True to create surrogates by shuffling data
             over time. See Data.permute_samples() for settings for surrogate
             creation.
+        rng : numpy.random.Generator [optional]
+            random number generator, if None, the global NumPy random state is
+            used (default=None)
 
     Returns:
         numpy array
             surrogate data with dimensions
             (realisations * n_perm) x len(idx_list)
     """
-    # Allocate memory for surrogates
-    n_realisations = data.n_realisations(current_value)
-    surrogates = np.empty((n_realisations * n_perm,
-                           len(idx_list))).astype(data.data_type)
+    return next(_iter_surrogates(data, current_value, idx_list, n_perm,
+                                 perm_settings, chunk_size=n_perm, rng=rng))
 
-    # Check if the user requested to permute samples in time and not over
-    # replications
-    permute_in_time = perm_settings['permute_in_time']
 
-    # Generate surrogates by permuting over replications if possible (no.
-    # replications needs to be sufficient); else permute samples over time.
-    i_1 = 0
-    i_2 = n_realisations
-    # permute samples
-    if permute_in_time:
-        for perm in range(n_perm):
-            surrogates[i_1:i_2, ] = data.permute_samples(current_value,
-                                                         idx_list,
-                                                         perm_settings)[0]
-            i_1 = i_2
-            i_2 += n_realisations
+def _iter_surrogates(data, current_value, idx_list, n_perm, perm_settings,
+                     chunk_size=None, rng=None):
+    """Generate surrogate data for statistical testing in chunks.
+
+    Lazily create surrogates as returned by _get_surrogates(), yielding
+    surrogates for at most chunk_size permutations at a time. Realisations are
+    retrieved from the data once and all permutations are drawn before the
+    first chunk is created, such that the concatenated chunks are identical to
+    the output of _get_surrogates() for the same random state. Only the
+    realisations, the permutation indices, and one chunk of surrogates are
+    held in memory at any time.
 
+    Args:
+        data : Data instance
+            raw data for analysis
+        current_value : tuple
+            index of the current value in current analysis, has to have the
+            form (idx process, idx sample)
+        idx_list : list of tuples
+            list of variables, for which surrogates have to be created
+        n_perm : int
+            number of permutations
+        perm_settings : dict
+            settings for surrogate creation, see _get_surrogates()
+        chunk_size : int [optional]
+            max. number of permutations per chunk (default=n_perm)
+        rng : numpy.random.Generator [optional]
+            random number generator, if None, the global NumPy random state is
+            used (default=None)
+
+    Yields:
+        numpy array
+            surrogate data with dimensions
+            (realisations * no. permutations in chunk) x len(idx_list)
+    """
+    if chunk_size is None:
+        chunk_size = n_perm
+    assert chunk_size > 0, 'chunk_size must be positive.'
+    realisations = data.get_realisations(current_value, idx_list)[0]
+    n_real_time = data.n_realisations_samples(current_value)
+    permutations = _get_permutations(data, n_real_time, n_perm,
+                                     perm_settings, rng)
+
+    # Surrogates are created by a gather of rows from the original
+    # realisations, which are ordered by replications and samples within
+    # replications. For each permutation, get the row index of each
+    # surrogate realisation.
+    for i in range(0, n_perm, chunk_size):
+        perm_chunk = permutations[i:i + chunk_size]
+        if perm_settings['permute_in_time']:
+            rows = (np.arange(data.n_replications)[np.newaxis, :, np.newaxis] *
+                    n_real_time + perm_chunk[:, np.newaxis, :])
+        else:
+            rows = (perm_chunk[:, :, np.newaxis] * n_real_time +
+                    np.arange(n_real_time)[np.newaxis, np.newaxis, :])
+        yield realisations[rows.ravel()]
+
+
+def _get_permutations(data, n_real_time, n_perm, perm_settings, rng=None):
+    """Return permutations used for surrogate creation.
+
+    Draw permutations of samples or replications as used by
+    Data.permute_samples() and Data.permute_replications() respectively.
+    Permutations are drawn in the same order as repeated calls to these
+    methods would draw them.
+
+    Returns:
+        numpy array
+            permutation indices with dimensions n_perm x no. samples, if
+            'permute_in_time' is True, or n_perm x no. replications otherwise
+    """
+    if perm_settings['permute_in_time']:
+        permutations = data._get_permutation_samples_batch(
+            n_real_time, n_perm, perm_settings, rng)
     else:  # permute replications
         assert _sufficient_replications(data, n_perm), (
                 'Not enough replications for surrogate creation.')
+        if rng is None:
+            rng = np.random
+        permutations = np.empty((n_perm, data.n_replications), dtype=int)
         for perm in range(n_perm):
-            surrogates[i_1:i_2, ] = data.permute_replications(current_value,
-                                                              idx_list)[0]
-            i_1 = i_2
-            i_2 += n_realisations
-    return surrogates
+            permutations[perm] = rng.permutation(data.n_replications)
+    return permutations
 
 
-def _generate_spectral_surrogates(data, scale, n_perm, perm_settings):
+def _generate_spectral_surrogates(data, scale, n_perm, perm_settings,
+                                  rng=None):
     """Generate surrogate data for statistical testing of spectral TE.
 
     The method for surrogate generation depends on whether sufficient
@@ -1277,6 +1565,9 @@ def _generate_spectral_surrogates(data, scale, n_perm, perm_settings):
             number of permutations
         perm_settings : dict
             settings for surrogate creation by shuffling samples over time
+        rng : numpy.random.Generator [optional]
+            random number generator, if None, the global NumPy random state is
+            used (default=None)
 
     Returns:
         numpy array
@@ -1285,18 +1576,19 @@ def _generate_spectral_surrogates(data, scale, n_perm, perm_settings):
     """
     # Allocate memory for surrogates
     surrogates = np.empty((data.n_samples, data.n_replications,
-                           n_perm)).astype(data.data_type)
+                           n_perm), dtype=data.data_type)
     permute_in_time = perm_settings['permute_in_time']
     # Generate surrogates by permuting over replications if possible (no.
     # replications needs to be sufficient); else permute samples over time.
     if permute_in_time:
         for perm in range(n_perm):
             surrogates[:, :, perm] = data.slice_permute_samples(
-                                                    scale, perm_settings)[0]
+                                                scale, perm_settings, rng)[0]
     else:
         assert(_sufficient_replications(data, n_perm))
         for perm in range(n_perm):
-            surrogates[:, :, perm] = data.slice_permute_replications(scale)[0]
+            surrogates[:, :, perm] = data.slice_permute_replications(
+                                                                scale, rng)[0]
     return surrogates
 
 
@@ -142,6 +142,35 @@ def test_analyse_network():
         ais.analyse_network(settings, data=data, processes=[1.5, 0.7])
 
 
+@jpype_missing
+def test_analyse_network_parallel():
+    """Test parallel AIS estimation in worker processes."""
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_mi': 21,
+        'max_lag': 3,
+        'seed': 1,
+        'verbose': False}
+    data = Data()
+    data.generate_mute_data(100, 5)
+    ais = ActiveInformationStorage()
+    results_serial = ais.analyse_network(settings, data, processes=[0, 2, 4])
+    settings['n_workers'] = 2
+    results_parallel = ais.analyse_network(settings, data,
+                                           processes=[0, 2, 4])
+    assert results_parallel.processes_analysed == [0, 2, 4], (
+        'Parallel analysis did not run on all processes.')
+    for p in [0, 2, 4]:
+        for k in ['ais', 'ais_pval', 'selected_vars']:
+            assert np.array_equal(
+                results_serial.get_single_process(p, fdr=False)[k],
+                results_parallel.get_single_process(p, fdr=False)[k]), (
+                    'Parallel results for {0} differ for process {1}.'.format(
+                        k, p))
+
+
 @jpype_missing
 def test_single_source_storage_gaussian():
     n = 1000
@@ -246,6 +275,7 @@ if __name__ == '__main__':
     test_return_local_values()
     test_discrete_input()
     test_analyse_network()
+    test_analyse_network_parallel()
     test_ActiveInformationStorage_init()
     test_single_source_storage_gaussian()
     test_compare_jidt_open_cl_estimator()
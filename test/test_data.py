@@ -1,7 +1,13 @@
 """Test data class."""
+import gc
+import multiprocessing
+import os
+import pickle
+import tempfile
 import pytest
 import numpy as np
-from idtxl.data import Data
+import h5py
+from idtxl.data import Data, SharedBuffer, SubsetReader
 import idtxl.idtxl_utils as utils
 
 
@@ -58,6 +64,168 @@ def test_set_data():
                                     'of replications wrong.')
 
 
+def test_set_data_nans():
+    """Test if data with nans are rejected."""
+    data = np.random.rand(2, 100, 3)
+    data[1, 50, 2] = np.nan
+    with pytest.raises(AssertionError):
+        Data(data, 'psr', normalise=False)
+    d = Data(np.random.rand(2, 100, 3), 'psr')
+    with pytest.raises(AssertionError):
+        d.set_data(data, 'psr')
+
+
+def test_realisation_cache():
+    """Test caching of realisations."""
+    data = np.random.rand(3, 50, 4)
+    d = Data(data, 'psr', normalise=False)
+    assert d.realisation_cache_info() is None, 'Cache enabled by default.'
+    current_value = (1, 10)
+    idx_list = [(0, 3), (2, 10), (1, 0)]
+    real_ref, repl_ref = d.get_realisations(current_value, idx_list)
+
+    d.enable_realisation_cache()
+    real, repl = d.get_realisations(current_value, idx_list)
+    assert (real == real_ref).all(), 'Wrong realisations on cache miss.'
+    assert (repl == repl_ref).all(), 'Wrong replication index.'
+    info = d.realisation_cache_info()
+    assert info['misses'] == 3 and info['hits'] == 0, (
+        'Wrong cache statistics: {0}.'.format(info))
+    assert info['n_entries'] == 3, 'Wrong number of cached variables.'
+    real, repl = d.get_realisations(current_value, idx_list[::-1])
+    assert (real == real_ref[:, ::-1]).all(), 'Wrong realisations on hit.'
+    assert d.realisation_cache_info()['hits'] == 3, 'No cache hits.'
+    # Returned realisations are copies, modifying them leaves the cache
+    # intact.
+    real[:] = 0
+    real = d.get_realisations(current_value, idx_list)[0]
+    assert (real == real_ref).all(), 'Cached realisations were modified.'
+    # The cache is keyed by the current value.
+    d.get_realisations((1, 11), [(0, 3)])
+    assert d.realisation_cache_info()['n_entries'] == 4, (
+        'Wrong number of cached variables.')
+
+    # Test shuffled realisations are identical to uncached retrieval.
+    np.random.seed(0)
+    real = d.get_realisations(current_value, idx_list, shuffle=True)[0]
+    d.disable_realisation_cache()
+    np.random.seed(0)
+    real_ref = d.get_realisations(current_value, idx_list, shuffle=True)[0]
+    assert (real == real_ref).all(), 'Wrong shuffled realisations.'
+
+    # Test eviction of least recently used entries.
+    d.enable_realisation_cache(max_bytes=2 * 40 * 4 * 8)
+    d.get_realisations(current_value, [(0, 1)])
+    d.get_realisations(current_value, [(0, 2)])
+    d.get_realisations(current_value, [(0, 1)])
+    d.get_realisations(current_value, [(0, 3)])
+    info = d.realisation_cache_info()
+    assert info['n_entries'] == 2, 'Cache exceeds memory budget.'
+    assert info['n_bytes'] <= info['max_bytes'], 'Cache exceeds memory budget.'
+    d.get_realisations(current_value, [(0, 1)])
+    assert d.realisation_cache_info()['hits'] == 2, (
+        'Most recently used entry was evicted.')
+    d.get_realisations(current_value, [(0, 2)])
+    assert d.realisation_cache_info()['misses'] == 4, (
+        'Least recently used entry was not evicted.')
+
+    # Test invalidation when setting new data.
+    d.set_data(data + 1, 'psr')
+    assert d.realisation_cache_info()['n_entries'] == 0, (
+        'Cache was not cleared.')
+    real = d.get_realisations(current_value, [(0, 1)])[0]
+    assert (real[:40, 0] == data[0, 1:41, 0] + 1).all(), (
+        'Cache returned realisations of old data.')
+
+
+def test_data_on_disk():
+    """Test data stored in memory-mapped files and h5py datasets."""
+    raw = np.random.randn(50, 3, 6) * 5 + 2
+    d_ref = Data(raw, 'spr')
+    d_ref_raw = Data(raw, 'spr', normalise=False)
+    tmp_dir = tempfile.mkdtemp()
+    npy_file = os.path.join(tmp_dir, 'data.npy')
+    h5_file = os.path.join(tmp_dir, 'data.h5')
+    np.save(npy_file, raw)
+    with h5py.File(h5_file, 'w') as f:
+        f['data'] = raw
+    f = h5py.File(h5_file, 'r')
+    current_value = (1, 10)
+    idx_list = [(0, 2), (2, 10), (1, 5)]
+    for source in [npy_file, np.load(npy_file, mmap_mode='r'), f['data']]:
+        for d, ref in zip([Data(source, 'spr'),
+                           Data(source, 'spr', normalise=False)],
+                          [d_ref, d_ref_raw]):
+            assert not isinstance(d.data, np.ndarray) or isinstance(
+                d.data, np.memmap), 'Data was loaded into memory.'
+            assert d.data.shape == (3, 50, 6), 'Wrong data shape.'
+            assert np.allclose(d.get_realisations(current_value, idx_list)[0],
+                               ref.get_realisations(current_value, idx_list)[0]
+                               ), 'Wrong realisations for data on disk.'
+            np.random.seed(0)
+            real = d.permute_replications(current_value, idx_list)[0]
+            np.random.seed(0)
+            real_ref = ref.permute_replications(current_value, idx_list)[0]
+            assert np.allclose(real, real_ref), (
+                'Wrong permuted realisations for data on disk.')
+            assert np.allclose(d._get_data_slice(1, 4)[0],
+                               ref._get_data_slice(1, 4)[0]), (
+                'Wrong data slice for data on disk.')
+            # Pickled data on disk reopen their file, e.g., in workers.
+            d_pickled = pickle.loads(pickle.dumps(d))
+            assert np.array_equal(
+                d_pickled.get_realisations(current_value, idx_list)[0],
+                d.get_realisations(current_value, idx_list)[0]), (
+                    'Wrong realisations for pickled data on disk.')
+    f.close()
+
+    raw[1, 2, 3] = np.nan
+    np.save(npy_file, raw)
+    with pytest.raises(AssertionError):
+        Data(npy_file, 'spr')
+
+
+def test_data_precision():
+    """Test storage of data in single precision."""
+    raw = np.random.randn(3, 50, 4) * 10 + 5
+    d_ref = Data(raw, 'psr')
+    current_value = (1, 10)
+    idx_list = [(0, 3), (2, 10)]
+    for normalise in [True, False]:
+        d = Data(raw, 'psr', normalise=normalise, dtype=np.float32)
+        assert d.data.dtype == np.float32, 'Data not stored as float32.'
+        assert d.data_type is np.float32, 'Wrong data type.'
+        real = d.get_realisations(current_value, idx_list)[0]
+        assert real.dtype == np.float32, 'Realisations are not float32.'
+        if normalise:
+            assert np.allclose(
+                real, d_ref.get_realisations(current_value, idx_list)[0],
+                atol=1e-5), 'Wrong normalised realisations.'
+        real = d.permute_samples(current_value, idx_list,
+                                 {'perm_type': 'random'})[0]
+        assert real.dtype == np.float32, 'Permuted samples are not float32.'
+        real = d.permute_replications(current_value, idx_list)[0]
+        assert real.dtype == np.float32, (
+            'Permuted replications are not float32.')
+    d.enable_realisation_cache()
+    assert d.get_realisations(current_value, idx_list)[0].dtype == np.float32
+    assert d.get_realisations(current_value, idx_list)[0].dtype == np.float32
+
+    # Test data on disk.
+    tmp_dir = tempfile.mkdtemp()
+    npy_file = os.path.join(tmp_dir, 'data.npy')
+    np.save(npy_file, raw)
+    d = Data(npy_file, 'psr', dtype=np.float32)
+    real = d.get_realisations(current_value, idx_list)[0]
+    assert real.dtype == np.float32, 'Realisations are not float32.'
+    assert np.allclose(real, d_ref.get_realisations(current_value,
+                                                    idx_list)[0],
+                       atol=1e-5), 'Wrong normalised realisations.'
+
+    with pytest.raises(TypeError):
+        Data(raw, 'psr', dtype=int)
+
+
 def test_data_normalisation():
     """Test if data are normalised correctly when stored in a Data instance."""
     a_1 = 100
@@ -75,6 +243,14 @@ def test_data_normalisation():
     assert (target_std == data.data[1, :, 0]).all(), ('Standardising the '
                                                       'target did not work.')
 
+    # Data objects pickled by earlier versions lack the normalisation
+    # attribute.
+    del data._normalisation
+    data = pickle.loads(pickle.dumps(data))
+    assert np.array_equal(
+        data.get_realisations((1, 5), [(0, 2)])[0][:, 0], source_std[2:997]), (
+            'Realisations of data without normalisation attribute differ.')
+
 
 def test_get_realisations():
     """Test low-level function for data retrieval."""
@@ -113,6 +289,26 @@ def test_get_realisations():
     current_value = (0, n - 1)
     realisations = d.get_realisations(current_value, [current_value])[0]
 
+    # Test retrieval of multiple variables from multiple replications against
+    # slicing the raw data.
+    data = np.random.rand(3, 20, 4)
+    d = Data(data, 'psr', normalise=False)
+    current_value = (1, 12)
+    idx_list = [(0, 3), (2, 12), (1, 0), (0, 11)]
+    for shuffle in [False, True]:
+        realisations, ind = d.get_realisations(current_value, idx_list,
+                                               shuffle=shuffle)
+        assert realisations.shape == (8 * 4, 4), (
+            'Realisations have wrong shape.')
+        for i, idx in enumerate(idx_list):
+            for r in range(4):
+                assert (realisations[ind == r, i] ==
+                        data[idx[0], idx[1]:idx[1] + 8, r]).all(), (
+                    'Wrong realisations for variable {0} in replication '
+                    '{1}.'.format(idx, r))
+    with pytest.raises(IndexError):
+        d.get_realisations(current_value, [(3, 0)])
+
 
 def test_permute_replications():
     """Test surrogate creation by permuting replications."""
@@ -328,7 +524,162 @@ def test_circular_shift():
 
 
 def test_swap_local():
-    pass
+    """Test local swapping of samples."""
+    d = Data()
+    n = 50
+    perm_range = 7
+    perm = d._swap_local(n, perm_range)
+    assert perm.shape[0] == n, 'Incorrect length of permuted indices.'
+    assert np.array_equal(np.sort(perm), np.arange(n)), (
+        'Permuted indices are not a permutation.')
+    assert (np.arange(n) // perm_range == perm // perm_range).all(), (
+        'Samples were permuted outside the permutation range.')
+    with pytest.raises(AssertionError):
+        d._swap_local(n, 1)
+    with pytest.raises(AssertionError):
+        d._swap_local(n, n + 1)
+
+
+def test_permutation_samples_batch():
+    """Test generation of multiple permutations of samples at once."""
+    d = Data()
+    n = 53
+    n_perm = 20
+    settings_list = [
+        {'perm_type': 'random'},
+        {'perm_type': 'circular', 'max_shift': 10},
+        {'perm_type': 'block', 'block_size': 5, 'perm_range': 3},
+        {'perm_type': 'block', 'block_size': 5, 'perm_range': 11},
+        {'perm_type': 'local', 'perm_range': 7},
+        {'perm_type': 'local', 'perm_range': n}]
+    for settings in settings_list:
+        np.random.seed(0)
+        perm = d._get_permutation_samples_batch(n, n_perm, settings)
+        assert perm.shape == (n_perm, n), (
+            'Incorrect shape of permuted indices for {0}.'.format(settings))
+        assert (np.sort(perm, axis=1) == np.arange(n)).all(), (
+            'Permuted indices are not permutations for {0}.'.format(settings))
+        # Permutations are identical to consecutive single permutations.
+        np.random.seed(0)
+        for p in range(n_perm):
+            assert np.array_equal(
+                perm[p], d._get_permutation_samples(n, settings)), (
+                    'Batch permutation {0} differs from single permutation '
+                    'for {1}.'.format(p, settings))
+
+    # Test restrictions of individual permutation types.
+    perm, shift = d._circular_shift_batch(n, 10, n_perm)
+    assert ((shift >= 1) & (shift <= 10)).all(), 'Shift exceeded max_shift.'
+    assert (perm[:, 0] == n - shift).all(), (
+        'First index after circular shift is wrong.')
+    assert (np.diff(perm, axis=1) % n == 1).all(), (
+        'Samples are not shifted circularly.')
+    block_size = 5
+    perm_range = 3
+    perm = d._swap_blocks_batch(n, block_size, perm_range, n_perm)
+    block = perm // block_size
+    # Samples from a block stay together and in order.
+    assert (np.diff(perm, axis=1)[np.diff(block, axis=1) == 0] == 1).all(), (
+        'Order of samples within blocks was not kept intact.')
+    assert (np.arange(n) // block_size // perm_range ==
+            block // perm_range).all(), (
+        'Blocks were permuted outside the permutation range.')
+    perm_range = 7
+    perm = d._swap_local_batch(n, perm_range, n_perm)
+    assert (np.arange(n) // perm_range == perm // perm_range).all(), (
+        'Samples were permuted outside the permutation range.')
+    with pytest.raises(ValueError):
+        d._get_permutation_samples_batch(n, n_perm, {'perm_type': 'foo'})
+    with pytest.raises(TypeError):
+        d._get_permutation_samples_batch(
+            n, n_perm, {'perm_type': 'local', 'perm_range': 2.})
+
+
+def test_generate_var_data():
+    """Test simulation of VAR processes."""
+    coefficient_matrices = np.array([
+        [[0.5, 0, 0], [0.4, 0.5, 0], [0, 0.3, 0.2]],
+        [[0.1, 0, 0], [0, 0, 0], [0, 0.1, 0]]])
+    d = Data()
+    d.generate_var_data(200, 4, coefficient_matrices,
+                        rng=np.random.default_rng(0))
+    assert d.data.shape == (3, 200, 4), 'Wrong shape of VAR data.'
+    d_2 = Data()
+    d_2.generate_var_data(200, 4, coefficient_matrices,
+                          rng=np.random.default_rng(0))
+    assert np.array_equal(d.data, d_2.data), (
+        'VAR data differ for identical seeds.')
+
+    # Compare vectorised simulation to an explicit loop over replications,
+    # samples, and lags, using the same initial conditions and noise.
+    n_samples = 30
+    n_replications = 4
+    order = 2
+    rng = np.random.default_rng(1)
+    x = d._simulate_var(
+        np.reshape(np.transpose(coefficient_matrices, (1, 0, 2)), [3, 6]),
+        order, n_samples, n_replications, 0.1, rng)
+    rng = np.random.default_rng(1)
+    x_loop = np.zeros(x.shape)
+    x_loop[0:order] = rng.random((1, 3, n_replications))
+    noise = rng.normal(0, 0.1, (n_samples, 3, n_replications))
+    for r in range(n_replications):
+        for i in range(order, order + n_samples):
+            for lag in range(1, order + 1):
+                x_loop[i, :, r] += np.dot(coefficient_matrices[lag - 1],
+                                          x_loop[i - lag, :, r])
+            x_loop[i, :, r] += noise[i - order, :, r]
+    assert np.allclose(x, x_loop), 'Vectorised VAR simulation is incorrect.'
+
+    # Logistic maps stay in the [0, 1] range.
+    d.normalise = False
+    d.generate_logistic_maps_data(200, 4, coefficient_matrices)
+    assert d.data.shape == (3, 200, 4), 'Wrong shape of logistic maps data.'
+    assert d.data.min() >= 0 and d.data.max() <= 1, (
+        'Logistic maps data outside [0, 1].')
+
+
+def test_generate_random_var_data():
+    """Test simulation of VAR processes on sparse random networks."""
+    d = Data()
+    n_processes = 30
+    max_lag = 3
+    adjacency = d.generate_random_var_data(
+        n_processes=n_processes, n_samples=300, n_replications=2,
+        edge_probability=0.1, max_lag=max_lag,
+        rng=np.random.default_rng(0))
+    assert d.data.shape == (n_processes, 300, 2), 'Wrong shape of VAR data.'
+    assert adjacency.shape == (n_processes, n_processes), (
+        'Wrong shape of adjacency matrix.')
+    assert not np.diag(adjacency).any(), 'Adjacency contains self-links.'
+    assert adjacency.min() >= 0 and adjacency.max() <= max_lag, (
+        'Link lags out of range.')
+    assert 0 < np.count_nonzero(adjacency) < n_processes**2 / 2, (
+        'Unexpected number of links.')
+    adjacency_2 = Data().generate_random_var_data(
+        n_processes=n_processes, n_samples=300, n_replications=2,
+        edge_probability=0.1, max_lag=max_lag,
+        rng=np.random.default_rng(0))
+    assert np.array_equal(adjacency, adjacency_2), (
+        'Adjacency differs for identical seeds.')
+
+    # Strong links are visible in the lagged cross-correlation.
+    adjacency = d.generate_random_var_data(
+        n_processes=2, n_samples=5000, n_replications=1, edge_probability=1,
+        max_lag=1, coupling=0.45, self_coupling=0.0,
+        rng=np.random.default_rng(1))
+    assert (adjacency == np.array([[0, 1], [1, 0]])).all(), (
+        'Adjacency for a fully connected network is incorrect.')
+    x = d.data[:, :, 0]
+    assert np.corrcoef(x[0, :-1], x[1, 1:])[0, 1] > 0.2, (
+        'Link 0 -> 1 not visible in the data.')
+
+    with pytest.raises(RuntimeError):
+        d.generate_random_var_data(coupling=0.6, self_coupling=0.5)
+    with pytest.raises(RuntimeError):
+        d.generate_random_var_data(max_lag=0)
+    with pytest.raises(RuntimeError):
+        d.generate_random_var_data(edge_probability=1.5)
 
 
 def test_data_type():
@@ -368,15 +719,246 @@ def test_data_type():
         'Permuted samples type is not an int.')
 
 
+def test_append_data():
+    """Test appending samples and replications."""
+    full = np.random.normal(3, 2, size=(3, 40, 9))
+    idx_list = [(0, 3), (2, 5), (1, 0)]
+    for normalise in [True, False]:
+        for dtype in [None, np.float32]:
+            data = Data(full[:, :10, :4], 'psr', normalise=normalise,
+                        dtype=dtype)
+            data.append_replications(full[:, :10, 4:5])
+            data.append_replications(full[:, :10, 5:])
+            data.append_samples(full[:, 10:25, :])
+            data.append_samples(full[:, 25:, :].transpose(1, 0, 2), 'spr')
+            assert data.n_samples == 40, (
+                'Wrong number of samples: {0}.'.format(data.n_samples))
+            assert data.n_replications == 9, (
+                'Wrong number of replications: {0}.'.format(
+                    data.n_replications))
+            data_ref = Data(full, 'psr', normalise=normalise, dtype=dtype)
+            real = data.get_realisations((0, 5), idx_list)[0]
+            real_ref = data_ref.get_realisations((0, 5), idx_list)[0]
+            assert real.dtype == real_ref.dtype, (
+                'Wrong type of realisations: {0}.'.format(real.dtype))
+            assert np.allclose(real, real_ref, atol=1e-5), (
+                'Realisations of appended data are not equal to realisations '
+                'of the full data (normalise={0}, dtype={1}).'.format(
+                    normalise, dtype))
+            assert np.allclose(data._get_data_slice(1)[0],
+                               data_ref._get_data_slice(1)[0], atol=1e-5), (
+                'Data slice of appended data is not equal to data slice of '
+                'the full data.')
+
+    # Appending to an empty Data object sets the data.
+    data = Data(normalise=False)
+    data.append_replications(full[:, :, :2])
+    assert np.array_equal(data.data, full[:, :, :2]), 'Data were not set.'
+
+    # Storage grows geometrically and is not reallocated on each append.
+    data = Data(full[:, :, :1], 'psr', normalise=False)
+    for r in range(1, 9):
+        data.append_replications(full[:, :, r:r + 1])
+    assert data._buffer.capacity[2] == 16, (
+        'Wrong buffer capacity: {0}.'.format(data._buffer.capacity))
+    assert np.array_equal(data.data, full), 'Appended data are wrong.'
+
+    # Cached realisations are invalidated by appends.
+    data = Data(full[:, :, :4], 'psr')
+    data.enable_realisation_cache()
+    data.get_realisations((0, 5), idx_list)
+    data.append_replications(full[:, :, 4:])
+    real = data.get_realisations((0, 5), idx_list)[0]
+    assert real.shape[0] == 35 * 9, 'Cached realisations were returned.'
+
+    # Test wrong input.
+    data = Data(full, 'psr')
+    with pytest.raises(RuntimeError):  # wrong number of samples
+        data.append_replications(full[:, :10, :])
+    with pytest.raises(RuntimeError):  # wrong number of replications
+        data.append_samples(full[:, :, :2])
+    with pytest.raises(RuntimeError):  # wrong number of processes
+        data.append_samples(full[:2, :, :])
+    with pytest.raises(RuntimeError):  # wrong dim_order
+        data.append_samples(full, 'ps')
+    with pytest.raises(AssertionError):
+        data.append_samples(np.full((3, 2, 9), np.nan))
+    data = Data(np.arange(40).reshape(2, 20), 'ps', normalise=False)
+    with pytest.raises(TypeError):
+        data.append_samples(np.random.rand(2, 5), 'ps')
+
+
+def test_subset():
+    """Test subsets of processes, samples, and replications."""
+    full = np.random.normal(3, 2, size=(5, 60, 8))
+    idx_list = [(0, 3), (2, 5), (1, 0)]
+    for normalise in [True, False]:
+        data = Data(full, 'psr', normalise=normalise)
+        for processes, replications, samples in [
+                ([1, 2, 3], range(0, 8, 2), (10, 50)),  # view
+                ([4, 0, 2], [7, 1, 2], None),  # subset reader
+                (None, [5], (0, 30))]:
+            subset = data.subset(processes, replications, samples)
+            p = np.arange(5) if processes is None else np.array(processes)
+            r = np.array(replications)
+            s = (0, 60) if samples is None else samples
+            assert subset.n_processes == len(p), (
+                'Wrong number of processes: {0}.'.format(subset.n_processes))
+            assert subset.n_samples == s[1] - s[0], (
+                'Wrong number of samples: {0}.'.format(subset.n_samples))
+            assert subset.n_replications == len(r), (
+                'Wrong number of replications: {0}.'.format(
+                    subset.n_replications))
+            # Subset returns the realisations of the original data, i.e.,
+            # data are not normalised again.
+            real = subset.get_realisations((0, 5), idx_list)[0]
+            real_ref = data.get_realisations(
+                (0, 5 + s[0]), [(p[i[0]], i[1] + s[0]) for i in idx_list])[0]
+            real_ref = real_ref.reshape(data.n_replications, -1, 3)[r]
+            real_ref = real_ref[:, :subset.n_samples - 5].reshape(-1, 3)
+            assert np.array_equal(real, real_ref), (
+                'Realisations of subset are wrong.')
+            data_slice = subset._get_data_slice(1)[0]
+            slice_ref = data._get_data_slice(p[1])[0][s[0]:s[1], r]
+            assert np.array_equal(data_slice, slice_ref), (
+                'Data slice of subset is wrong.')
+
+    # Subsets share data with the original object.
+    data = Data(full, 'psr', normalise=False)
+    subset = data.subset(processes=[1, 2, 3], replications=range(0, 8, 2))
+    assert np.shares_memory(subset.data, data.data), (
+        'Subset data are not a view on the original data.')
+    subset = data.subset(processes=[3, 1])
+    assert isinstance(subset.data, SubsetReader), (
+        'Subset data are not read from the original data.')
+    assert subset.data.data is data.data, (
+        'Subset reader does not read from the original data.')
+
+    # Subsets of data on disk and of subsets.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, 'data.h5')
+        with h5py.File(file_name, 'w') as f:
+            f.create_dataset('d', data=full.transpose(1, 0, 2))
+        with h5py.File(file_name, 'r') as f:
+            data_disk = Data(f['d'], dim_order='spr')
+            subset = data_disk.subset(processes=[4, 1], samples=(5, 55))
+            subset = subset.subset(processes=[1], replications=[6, 3])
+            data = Data(full, 'psr')
+            real = subset.get_realisations((0, 2), [(0, 0)])[0]
+            real_ref = data.get_realisations((0, 2 + 5), [(1, 5)])[0]
+            real_ref = real_ref.reshape(8, -1)[[6, 3], :48].reshape(-1, 1)
+            assert np.allclose(real, real_ref), (
+                'Realisations of subset of data on disk are wrong.')
+
+    # Subsets can be used to generate surrogates.
+    data = Data(full, 'psr')
+    subset = data.subset(processes=[3, 0], replications=[1, 5, 6])
+    subset.permute_replications((0, 5), [(1, 3)])
+    subset.permute_samples((0, 5), [(1, 3)], {'perm_type': 'random'})
+    subset.slice_permute_samples(1, {'perm_type': 'random'})
+
+    # Test wrong input.
+    with pytest.raises(RuntimeError):
+        data.subset(processes=[5])
+    with pytest.raises(RuntimeError):
+        data.subset(replications=[])
+    with pytest.raises(RuntimeError):
+        data.subset(samples=(10, 61))
+    with pytest.raises(AttributeError):
+        Data().subset(processes=[0])
+
+
+def _sum_realisations(args):
+    """Return sum of realisations, used by worker processes."""
+    data, idx_list = args
+    return data.get_realisations((0, 5), idx_list)[0].sum()
+
+
+def test_share_memory():
+    """Test passing data in shared memory to other processes."""
+    full = np.random.rand(5, 2000, 10)
+    idx_list = [(1, 2), (3, 4)]
+    data = Data(full, 'psr')
+    real = data.get_realisations((0, 5), idx_list)[0]
+    n_bytes = len(pickle.dumps(data))
+    data.share_memory()
+    assert len(pickle.dumps(data)) < n_bytes / 100, (
+        'Data in shared memory are not pickled as a handle.')
+    assert np.array_equal(data.get_realisations((0, 5), idx_list)[0], real), (
+        'Data in shared memory return wrong realisations.')
+
+    # Unpickled objects attach to the shared memory.
+    data_attached = pickle.loads(pickle.dumps(data))
+    assert not data_attached.data.flags.writeable, (
+        'Attached data are writeable.')
+    assert np.array_equal(
+        data_attached.get_realisations((0, 5), idx_list)[0], real), (
+        'Attached data return wrong realisations.')
+    data.data[0, 0, 0] = 2.
+    assert data_attached.data[0, 0, 0] == 2., 'Data were copied.'
+
+    # Subsets of shared data are pickled as handles.
+    for subset in [data.subset(processes=[1, 2, 3]),
+                   data.subset(processes=[3, 1])]:
+        assert len(pickle.dumps(subset)) < n_bytes / 100, (
+            'Subset of data in shared memory is not pickled as a handle.')
+        subset_attached = pickle.loads(pickle.dumps(subset))
+        assert np.array_equal(
+            subset_attached.get_realisations((0, 5), [(0, 2), (1, 4)])[0],
+            subset.get_realisations((0, 5), [(0, 2), (1, 4)])[0]), (
+            'Attached subset returns wrong realisations.')
+
+    # Pass data to worker processes.
+    data = Data(full, 'psr')
+    data.share_memory()
+    with multiprocessing.Pool(2) as pool:
+        res = pool.map(_sum_realisations, [(data, idx_list),
+                                           (data.subset([1, 3]), [(0, 2)])])
+    assert np.isclose(res[0], real.sum()), 'Worker returned wrong result.'
+    assert np.isclose(res[1], real[:, 0].sum()), (
+        'Worker returned wrong result for subset.')
+
+    # Memory block is removed with the Data object.
+    file_name = data._shared.name
+    assert os.path.exists(file_name), 'Shared memory block does not exist.'
+    del data
+    gc.collect()
+    assert not os.path.exists(file_name), (
+        'Shared memory block was not removed.')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, 'data.npy')
+        np.save(file_name, full)
+        data = Data(file_name, 'psr')
+        with pytest.raises(RuntimeError):
+            data.share_memory()
+        del data
+
+    # Blocks exceeding the free space raise an error instead of crashing on
+    # the first write.
+    with pytest.raises(RuntimeError):
+        SharedBuffer(2**62)
+
+
 if __name__ == '__main__':
+    test_share_memory()
+    test_subset()
+    test_append_data()
     test_permute_samples()
     test_data_type()
     test_swap_blocks()
     test_circular_shift()
     test_swap_local()
+    test_permutation_samples_batch()
+    test_generate_var_data()
+    test_generate_random_var_data()
     test_get_data_slice()
+    test_data_precision()
+    test_data_on_disk()
+    test_realisation_cache()
     test_get_realisations()
     test_data_normalisation()
+    test_set_data_nans()
     test_set_data()
     test_permute_replications()
     test_data_properties()
@@ -717,7 +717,115 @@ def test_insufficient_no_points():
     with pytest.raises(RuntimeError): est.estimate(source1)
 
 
+@jpype_missing
+def test_java_array_transfer():
+    """Test transfer of numpy arrays to JAVA and caching of re-used arrays."""
+    n = 1000
+    n_chunks = 4
+    np.random.seed(0)
+    var1 = np.random.randn(n * n_chunks, 2)
+    var2 = np.random.randn(n, 1)
+    cond = np.random.randn(n, 3)
+    est = JidtKraskovCMI({'noise_level': 0})
+
+    # Arrays are copied with the correct shape, type, and values.
+    java_var = est._to_java(var1)
+    assert np.array_equal(np.array(java_var), var1), (
+        'JAVA array differs from numpy array.')
+    java_var = est._to_java(var1[:, 0])
+    assert np.array_equal(np.array(java_var), var1[:, 0]), (
+        'JAVA array differs from non-contiguous numpy array.')
+    discrete = np.random.randint(0, 5, n)
+    java_var = est._to_java(discrete, jpype.JInt)
+    assert np.array_equal(np.array(java_var), discrete), (
+        'JAVA int array differs from numpy array.')
+    # Arrays are not cached outside of chunked estimation.
+    assert est._to_java(var2) is not est._to_java(var2), (
+        'Array was cached outside of chunked estimation.')
+
+    # Re-used arrays are transferred once during chunked estimation.
+    calls = []
+    to_java = est._to_java
+
+    def _count_transfers(var, java_type=None):
+        java_var = to_java(var, java_type)
+        calls.append(java_var)
+        return java_var
+    est._to_java = _count_transfers
+    cmi_chunks = est.estimate_parallel(
+        n_chunks=n_chunks, re_use=['var2', 'conditional'], var1=var1,
+        var2=var2, conditional=cond)
+    assert len(set(id(c) for c in calls)) == n_chunks + 2, (
+        'Re-used arrays were copied to JAVA more than once.')
+    assert est._java_cache == {}, 'Cache was not cleared.'
+    cmi_single = [est.estimate(var1[i * n:(i + 1) * n], var2, cond)
+                  for i in range(n_chunks)]
+    assert np.allclose(cmi_chunks, cmi_single), (
+        'Chunked estimates differ from single estimates.')
+
+
+@jpype_missing
+def test_calculator_pool():
+    """Test re-use of JIDT calculators between calls."""
+    np.random.seed(0)
+    source = np.random.randint(0, 2, 1000)
+    target = np.roll(source, 1)
+    cond = np.random.randint(0, 2, 1000)
+
+    # Discrete calculators are created once per combination of alphabet sizes.
+    est = JidtDiscreteCMI({'alph1': 2, 'alph2': 2, 'alphc': 2})
+    res_1, calc_1 = est.estimate(source, target, cond, return_calc=True)
+    res_2, calc_2 = est.estimate(source, target, cond, return_calc=True)
+    assert calc_1 is calc_2, 'Calculator was not re-used.'
+    assert res_1 == res_2, 'Re-used calculator returns a different estimate.'
+    res_3, calc_3 = est.estimate(
+        source, target, np.vstack((cond, cond)).T, return_calc=True)
+    assert calc_3 is not calc_1, 'Calculator re-used for other alphabet size.'
+    assert len(est._calc_pool) == 2, 'Wrong number of pooled calculators.'
+
+    # MI estimators used when no conditional is provided are created once.
+    mi_1 = est.estimate(source, target)
+    est_mi = est.est_mi
+    mi_2 = est.estimate(source, target)
+    assert est.est_mi is est_mi, 'MI estimator was not re-used.'
+    assert mi_1 == mi_2, 'Re-used MI estimator returns a different estimate.'
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=1000)
+    est = JidtKraskovCMI({'noise_level': 0})
+    mi_1 = est.estimate(source, target)
+    est_mi = est.est_mi
+    mi_2 = est.estimate(source, target)
+    assert est.est_mi is est_mi, 'Kraskov MI estimator was not re-used.'
+    assert mi_1 == mi_2, 'Re-used MI estimator returns a different estimate.'
+    mi_chunks = est.estimate_parallel(n_chunks=2, re_use=['var2'],
+                                      var1=np.vstack((source, source)),
+                                      var2=target, conditional=None)
+    assert np.allclose(mi_chunks, mi_1), 'Wrong chunked MI estimate.'
+
+
+@jpype_missing
+def test_analytic_surrogates():
+    """Test bulk generation of analytic surrogates."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=1000)
+    n_perm = 50
+    for est in [JidtGaussianCMI(), JidtDiscreteCMI({'discretise_method':
+                                                    'equal'})]:
+        data = {'var1': source, 'var2': target, 'conditional': None}
+        np.random.seed(0)
+        surr = est.estimate_surrogates_analytic(n_perm=n_perm, **data)
+        assert surr.shape == (n_perm,), 'Wrong number of surrogates.'
+        # Compare to surrogates drawn individually from the distribution.
+        np.random.seed(0)
+        pvalues = np.random.random(n_perm)
+        dist = est.get_analytic_distribution(**data)
+        surr_single = [dist.computeEstimateForGivenPValue(p) for p in pvalues]
+        assert np.allclose(surr, surr_single), (
+            'Bulk analytic surrogates differ from individual surrogates.')
+
+
 if __name__ == '__main__':
+    test_analytic_surrogates()
+    test_calculator_pool()
+    test_java_array_transfer()
     test_insufficient_no_points()
     test_lagged_mi()
     # test_discretisation()
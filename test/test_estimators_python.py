@@ -0,0 +1,560 @@
+"""Test Python estimators.
+
+This module provides unit tests for the NumPy/SciPy implementation of the
+Kraskov and Gaussian MI and CMI estimators and of the discrete MI, CMI, AIS,
+and TE estimators.
+"""
+import random as rn
+import warnings
+import pytest
+import numpy as np
+from scipy.special import digamma
+from idtxl.estimators_python import (PythonKraskovCMI, PythonKraskovMI,
+                                     PythonGaussianCMI, PythonGaussianMI,
+                                     PythonDiscreteCMI, PythonDiscreteMI,
+                                     PythonDiscreteAIS, PythonDiscreteTE)
+from idtxl.estimator import find_estimator
+from idtxl.idtxl_utils import calculate_mi
+
+package_missing = False
+try:
+    import jpype
+except ImportError as err:
+    package_missing = True
+jpype_missing = pytest.mark.skipif(
+        package_missing,
+        reason="Jpype is missing, JIDT estimators are not available")
+
+
+def _assert_result(results, expected_res, estimator, measure, tol=0.05):
+    # Compare estimates with analytic results and print output.
+    print('{0} - {1} result: {2:.4f} nats; expected to be close to {3:.4f} '
+          'nats.'.format(estimator, measure, results, expected_res))
+    assert np.isclose(results, expected_res, atol=tol), (
+        '{0} calculation failed (error larger than {1}).'.format(measure, tol))
+
+
+def _get_gauss_data(n=10000, covariance=0.4, expand=True):
+    """Generate correlated and uncorrelated Gaussian variables.
+
+    Generate two sets of random normal data, where one set has a given
+    covariance and the second is uncorrelated.
+    """
+    corr_expected = covariance / (1 * np.sqrt(covariance**2 + (1-covariance)**2))
+    expected_mi = calculate_mi(corr_expected)
+    src_corr = [rn.normalvariate(0, 1) for r in range(n)]  # correlated src
+    src_uncorr = [rn.normalvariate(0, 1) for r in range(n)]  # uncorrelated src
+    target = [sum(pair) for pair in zip(
+                    [covariance * y for y in src_corr[0:n]],
+                    [(1-covariance) * y for y in [
+                        rn.normalvariate(0, 1) for r in range(n)]])]
+    if expand:
+        src_corr = np.expand_dims(np.array(src_corr), axis=1)
+        src_uncorr = np.expand_dims(np.array(src_uncorr), axis=1)
+        target = np.expand_dims(np.array(target), axis=1)
+    else:
+        src_corr = np.array(src_corr)
+        src_uncorr = np.array(src_uncorr)
+        target = np.array(target)
+    return expected_mi, src_corr, src_uncorr, target
+
+
+def _ksg_brute_force(var1, var2, conditional=None, k=4, theiler_t=0):
+    """Brute force reference implementation of KSG algorithm 1."""
+    if conditional is None:
+        marginals = [var1, var2]
+    else:
+        marginals = [np.hstack((var1, conditional)),
+                     np.hstack((var2, conditional)),
+                     conditional]
+    joint = np.hstack((var1, var2) if conditional is None else
+                      (var1, var2, conditional))
+    n = joint.shape[0]
+    local = np.zeros(n)
+    for i in range(n):
+        window = np.abs(np.arange(n) - i) > theiler_t
+        dist = np.max(np.abs(joint - joint[i]), axis=1)[window]
+        eps = np.sort(dist)[k - 1]
+        counts = [np.sum(np.max(np.abs(m - m[i]), axis=1)[window] < eps)
+                  for m in marginals]
+        if conditional is None:
+            local[i] = (digamma(k) + digamma(n) - digamma(counts[0] + 1) -
+                        digamma(counts[1] + 1))
+        else:
+            local[i] = (digamma(k) - digamma(counts[0] + 1) -
+                        digamma(counts[1] + 1) + digamma(counts[2] + 1))
+    return local
+
+
+def test_mi_correlated_gaussians():
+    """Test estimators on correlated Gaussian data."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data()
+    mi_est = PythonKraskovMI({'noise_level': 0})
+    cmi_est = PythonKraskovCMI({'noise_level': 0})
+    mi = mi_est.estimate(source, target)
+    cmi = cmi_est.estimate(source, target)
+    _assert_result(mi, expected_mi, 'Python Kraskov', 'MI')
+    _assert_result(cmi, expected_mi, 'Python Kraskov', 'CMI (no cond.)')
+    mi = mi_est.estimate(source_uncorr, target)
+    _assert_result(mi, 0, 'Python Kraskov', 'MI (uncorr.)')
+
+
+def test_cmi_correlated_gaussians():
+    """Test CMI estimator on correlated Gaussian data with a conditional."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data()
+    cmi_est = PythonKraskovCMI({'noise_level': 0})
+    cmi = cmi_est.estimate(source, target, source_uncorr)
+    _assert_result(cmi, expected_mi, 'Python Kraskov', 'CMI (uncorr. cond.)')
+    cmi = cmi_est.estimate(source, target, source)
+    _assert_result(cmi, 0, 'Python Kraskov', 'CMI (corr. cond.)')
+
+
+def test_compare_brute_force():
+    """Compare estimates against a brute force implementation of KSG."""
+    n = 300
+    np.random.seed(0)
+    var1 = np.random.randn(n, 2)
+    var2 = var1[:, :1] + np.random.randn(n, 1)
+    cond = np.random.randn(n, 1) + var1[:, 1:]
+    for theiler_t in [0, 3]:
+        settings = {'noise_level': 0, 'theiler_t': theiler_t,
+                    'local_values': True}
+        mi = PythonKraskovMI(settings).estimate(var1, var2)
+        mi_ref = _ksg_brute_force(var1, var2, theiler_t=theiler_t)
+        assert np.allclose(mi, mi_ref), (
+            'Local MI differs from brute force implementation (theiler_t: '
+            '{0}).'.format(theiler_t))
+        cmi = PythonKraskovCMI(settings).estimate(var1, var2, cond)
+        cmi_ref = _ksg_brute_force(var1, var2, cond, theiler_t=theiler_t)
+        assert np.allclose(cmi, cmi_ref), (
+            'Local CMI differs from brute force implementation (theiler_t: '
+            '{0}).'.format(theiler_t))
+
+
+def test_neighbour_search_backends():
+    """Test estimates are identical for all neighbour search backends."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=2000)
+    source = np.hstack((source, source_uncorr))
+    results = []
+    for backend in ['auto', 'kdtree', 'grid', 'brute_force']:
+        settings = {'noise_level': 0, 'theiler_t': 2, 'local_values': True,
+                    'neighbour_search': backend}
+        results.append((
+            PythonKraskovMI(settings).estimate(source, target),
+            PythonKraskovCMI(settings).estimate(source, target,
+                                                source_uncorr)))
+    for backend_res in results[1:]:
+        assert np.allclose(backend_res[0], results[0][0]), (
+            'MI estimates differ between neighbour search backends.')
+        assert np.allclose(backend_res[1], results[0][1]), (
+            'CMI estimates differ between neighbour search backends.')
+    with pytest.raises(RuntimeError):
+        PythonKraskovMI({'neighbour_search': 'octree'})
+
+
+def test_local_values():
+    """Test estimation of local values."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=2000)
+    settings = {'noise_level': 0, 'local_values': True}
+    mi_local = PythonKraskovMI(settings).estimate(source, target)
+    assert mi_local.shape == (2000,), 'Wrong shape of local MI.'
+    settings['local_values'] = False
+    mi = PythonKraskovMI(settings).estimate(source, target)
+    assert np.isclose(np.mean(mi_local), mi), (
+        'Mean of local MI differs from average MI.')
+
+
+def test_lagged_mi():
+    """Test estimation of lagged MI."""
+    n = 2000
+    np.random.seed(1)
+    source = np.random.randn(n)
+    target = np.hstack((np.random.randn(1), source[:-1]))
+    mi_est = PythonKraskovMI({'noise_level': 1e-8, 'lag_mi': 1})
+    mi = mi_est.estimate(source, target)
+    assert mi > 3, 'Lagged MI too low: {0}.'.format(mi)
+
+
+def test_find_estimator():
+    """Test if Python estimators are found by name."""
+    assert find_estimator('PythonKraskovCMI') is PythonKraskovCMI, (
+        'PythonKraskovCMI was not found.')
+    assert find_estimator('PythonKraskovMI') is PythonKraskovMI, (
+        'PythonKraskovMI was not found.')
+
+
+class _SearchRecordingCMI(PythonKraskovCMI):
+    """Record the no. threads of all neighbour searches."""
+
+    def __init__(self, settings=None):
+        super().__init__(settings)
+        self.search_workers = set()
+
+    def _get_search(self, pointset, workers):
+        self.search_workers.add(workers)
+        return super()._get_search(pointset, workers)
+
+
+def test_estimate_parallel():
+    """Test chunked estimation with re-used variables."""
+    n = 500
+    n_chunks = 6
+    np.random.seed(2)
+    var1 = np.random.randn(n * n_chunks, 1)
+    var2 = np.random.randn(n, 1) + var1[:n]
+    cond = np.random.randn(n, 2)
+    for num_threads in [1, 'USE_ALL']:
+        for executor in ['thread', 'process']:
+            for theiler_t in [0, 2]:
+                settings = {'noise_level': 0, 'num_threads': num_threads,
+                            'chunk_executor': executor,
+                            'theiler_t': theiler_t}
+                # CMI
+                cmi_est = PythonKraskovCMI(settings)
+                cmi_chunks = cmi_est.estimate_parallel(
+                    n_chunks=n_chunks, re_use=['var2', 'conditional'],
+                    var1=var1, var2=var2, conditional=cond)
+                cmi_single = [cmi_est.estimate(var1[i * n:(i + 1) * n],
+                                               var2, cond)
+                              for i in range(n_chunks)]
+                assert cmi_chunks.shape == (n_chunks,), (
+                    'Wrong shape of chunked CMI estimates.')
+                assert np.allclose(cmi_chunks, cmi_single), (
+                    'Chunked CMI estimates differ from single estimates '
+                    '({0}).'.format(settings))
+                # CMI without conditional
+                mi_chunks = cmi_est.estimate_parallel(
+                    n_chunks=n_chunks, re_use=['var2', 'conditional'],
+                    var1=var1, var2=var2, conditional=None)
+                mi_single = [cmi_est.estimate(var1[i * n:(i + 1) * n], var2)
+                             for i in range(n_chunks)]
+                assert np.allclose(mi_chunks, mi_single), (
+                    'Chunked MI estimates differ from single estimates '
+                    '({0}).'.format(settings))
+    assert np.argmax(mi_chunks) == 0, 'Wrong chunk has the maximum MI.'
+
+    # Lagged MI, both variables are sliced into chunks.
+    mi_est = PythonKraskovMI({'noise_level': 0, 'lag_mi': 1})
+    mi_chunks = mi_est.estimate_parallel(
+        n_chunks=n_chunks, var1=var1, var2=np.roll(var1, 1))
+    mi_single = [mi_est.estimate(var1[i * n:(i + 1) * n],
+                                 np.roll(var1, 1)[i * n:(i + 1) * n])
+                 for i in range(n_chunks)]
+    assert np.allclose(mi_chunks, mi_single), (
+        'Chunked lagged MI estimates differ from single estimates.')
+
+    # Chunks estimated in a thread pool use single-threaded searches, also
+    # for searches shared between chunks.
+    cmi_est = _SearchRecordingCMI({'num_threads': 2})
+    cmi_est.estimate_parallel(
+        n_chunks=n_chunks, re_use=['var2', 'conditional'], var1=var1,
+        var2=var2, conditional=cond)
+    assert cmi_est.search_workers == {1}, (
+        'Multi-threaded neighbour searches used in thread pool.')
+
+    with pytest.raises(RuntimeError):
+        PythonKraskovCMI({'chunk_executor': 'cluster'})
+
+
+def test_gaussian_correlated_gaussians():
+    """Test Gaussian estimators on correlated Gaussian data."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data()
+    mi = PythonGaussianMI().estimate(source, target)
+    assert mi.shape == (1,), 'Gaussian MI should return one value per chunk.'
+    _assert_result(mi[0], expected_mi, 'Python Gaussian', 'MI')
+    cmi = PythonGaussianCMI().estimate(source, target)
+    _assert_result(cmi[0], expected_mi, 'Python Gaussian', 'CMI (no cond.)')
+    cmi = PythonGaussianCMI().estimate(source, target, source_uncorr)
+    _assert_result(cmi[0], expected_mi, 'Python Gaussian',
+                   'CMI (uncorr. cond.)')
+    cmi = PythonGaussianCMI().estimate(source, target, source)
+    _assert_result(cmi[0], 0, 'Python Gaussian', 'CMI (corr. cond.)')
+
+
+def test_gaussian_estimate_parallel():
+    """Test parallel estimation with Gaussian estimators."""
+    n = 500
+    n_chunks = 8
+    np.random.seed(3)
+    var1 = np.random.randn(n * n_chunks, 2)
+    var2 = np.random.randn(n, 1) + var1[:n, :1]
+    cond = np.random.randn(n, 1)
+    for settings in [{}, {'local_values': True}]:
+        cmi_est = PythonGaussianCMI(settings)
+        assert cmi_est.is_parallel(), 'Gaussian CMI should be parallel.'
+        cmi_chunks = cmi_est.estimate_parallel(
+            n_chunks=n_chunks, re_use=['var2', 'conditional'],
+            var1=var1, var2=var2, conditional=cond)
+        cmi_single = np.hstack([
+            cmi_est.estimate(var1[i * n:(i + 1) * n], var2, cond)
+            for i in range(n_chunks)])
+        assert np.allclose(cmi_chunks, cmi_single), (
+            'Parallel CMI estimates differ from single estimates.')
+        mi_chunks = cmi_est.estimate_parallel(
+            n_chunks=n_chunks, re_use=['var2', 'conditional'],
+            var1=var1, var2=var2, conditional=None)
+        mi_single = np.hstack([
+            cmi_est.estimate(var1[i * n:(i + 1) * n], var2)
+            for i in range(n_chunks)])
+        assert np.allclose(mi_chunks, mi_single), (
+            'Parallel MI estimates differ from single estimates.')
+    assert np.argmax(PythonGaussianCMI().estimate_parallel(
+        n_chunks=n_chunks, re_use=['var2', 'conditional'], var1=var1,
+        var2=var2, conditional=cond)) == 0, 'Wrong chunk has maximum CMI.'
+
+    # Chunks with linearly redundant variables return zero without warnings
+    # about invalid values.
+    var1 = var1[:2 * n, :1].copy()
+    var1[:n] = cond
+    for settings in [{}, {'local_values': True}]:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            cmi = PythonGaussianCMI(settings).estimate_parallel(
+                n_chunks=2, re_use=['var2', 'conditional'], var1=var1,
+                var2=var2, conditional=cond)
+        assert (cmi[:cmi.shape[0] // 2] == 0).all(), (
+            'Estimate for chunk with redundant variables is not zero.')
+        assert (cmi[cmi.shape[0] // 2:] != 0).any(), (
+            'Estimate for chunk without redundant variables is zero.')
+
+
+def test_gaussian_local_values():
+    """Test estimation of local values with Gaussian estimators."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=2000)
+    cmi_local = PythonGaussianCMI({'local_values': True}).estimate(
+        source, target, source_uncorr)
+    cmi = PythonGaussianCMI().estimate(source, target, source_uncorr)
+    assert cmi_local.shape == (2000,), 'Wrong shape of local CMI.'
+    assert np.isclose(np.mean(cmi_local), cmi[0]), (
+        'Mean of local CMI differs from average CMI.')
+
+
+def test_gaussian_lagged_mi():
+    """Test estimation of lagged MI with Gaussian estimators."""
+    n = 2000
+    np.random.seed(1)
+    source = np.random.randn(n)
+    target = np.hstack((np.random.randn(1), 0.5 * source[:-1])) + (
+        0.5 * np.random.randn(n))
+    mi = PythonGaussianMI({'lag_mi': 1}).estimate(source, target)
+    _assert_result(mi[0], calculate_mi(1 / np.sqrt(2)), 'Python Gaussian',
+                   'lagged MI')
+
+
+def _get_discrete_data(n=5000, error_rate=0.1):
+    """Generate a binary source and a noisy, delayed copy as target."""
+    source = np.random.randint(0, 2, n)
+    noise = (np.random.rand(n) < error_rate).astype(int)
+    target = np.roll(source, 1) ^ noise
+    target[0] = 0
+    return source, target
+
+
+def test_discrete_mi_cmi():
+    """Test discrete MI and CMI estimators on binary data."""
+    np.random.seed(4)
+    source, target = _get_discrete_data()
+    expected_mi = 1 + 0.1 * np.log2(0.1) + 0.9 * np.log2(0.9)  # in bits
+    mi = PythonDiscreteMI({'lag_mi': 1}).estimate(source, target)
+    _assert_result(mi[0], expected_mi, 'Python discrete', 'lagged MI')
+    mi = PythonDiscreteMI().estimate(source, target)
+    _assert_result(mi[0], 0, 'Python discrete', 'MI (no lag)')
+
+    # Conditioning on the target itself removes all information, conditioning
+    # on a random variable does not.
+    cond = np.random.randint(0, 4, (source.shape[0], 2))
+    cmi_est = PythonDiscreteCMI({'alph1': 2, 'alph2': 2, 'alphc': 4})
+    cmi = cmi_est.estimate(source[:-1], target[1:], cond[1:])
+    _assert_result(cmi[0], expected_mi, 'Python discrete', 'CMI', tol=0.1)
+    cmi = cmi_est.estimate(source[:-1], target[1:], target[1:])
+    _assert_result(cmi[0], 0, 'Python discrete', 'CMI (cond. on target)')
+    cmi = cmi_est.estimate(source[:-1], target[1:])
+    _assert_result(cmi[0], expected_mi, 'Python discrete', 'CMI (no cond.)')
+
+    # Local values average to the mean.
+    cmi_local = PythonDiscreteCMI(
+        {'alph1': 2, 'alph2': 2, 'alphc': 4, 'local_values': True}).estimate(
+            source[:-1], target[1:], cond[1:])
+    assert cmi_local.shape == (source.shape[0] - 1,), (
+        'Wrong shape of local CMI.')
+    assert np.isclose(np.mean(cmi_local), cmi_est.estimate(
+        source[:-1], target[1:], cond[1:])[0]), (
+            'Mean of local CMI differs from average CMI.')
+
+    # Discretise continuous data.
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=5000)
+    mi = PythonDiscreteMI({'discretise_method': 'max_ent',
+                           'n_discrete_bins': 5}).estimate(source, target)
+    assert mi[0] > 0.1, 'MI of discretised correlated data is too low.'
+    with pytest.raises(AssertionError):
+        PythonDiscreteMI().estimate(source, target)
+    with pytest.raises(ValueError):
+        PythonDiscreteMI({'discretise_method': 'unknown'}).estimate(
+            source, target)
+
+
+def test_discrete_ais_te():
+    """Test discrete AIS and TE estimators on binary data."""
+    np.random.seed(5)
+    source, target = _get_discrete_data()
+    expected_te = 1 + 0.1 * np.log2(0.1) + 0.9 * np.log2(0.9)  # in bits
+    te = PythonDiscreteTE({'history_target': 1}).estimate(source, target)
+    _assert_result(te[0], expected_te, 'Python discrete', 'TE')
+    te = PythonDiscreteTE({'history_target': 1}).estimate(target, source)
+    _assert_result(te[0], 0, 'Python discrete', 'TE (reverse)')
+    te_local = PythonDiscreteTE(
+        {'history_target': 2, 'source_target_delay': 1, 'tau_source': 2,
+         'history_source': 2, 'local_values': True}).estimate(source, target)
+    assert te_local.shape == source.shape, 'Wrong shape of local TE.'
+    assert (te_local[:3] == 0).all(), (
+        'Local TE not zero for samples without a full embedding.')
+
+    ais = PythonDiscreteAIS({'history': 2}).estimate(source)
+    _assert_result(ais[0], 0, 'Python discrete', 'AIS (random process)')
+    process = np.tile([0, 0, 1, 1], 1000)
+    ais = PythonDiscreteAIS({'history': 2}).estimate(process)
+    _assert_result(ais[0], 1, 'Python discrete', 'AIS (periodic process)')
+    with pytest.raises(RuntimeError):
+        PythonDiscreteAIS({})
+    with pytest.raises(RuntimeError):
+        PythonDiscreteTE({})
+
+
+def test_discrete_estimate_parallel():
+    """Test parallel estimation with discrete estimators."""
+    n = 1000
+    n_chunks = 5
+    np.random.seed(6)
+    var1 = np.random.randint(0, 3, (n * n_chunks, 2))
+    var2 = np.random.randint(0, 2, (n, 1))
+    var2[var1[:n, 0] == 2] = 1
+    cond = np.random.randint(0, 2, (n, 1))
+    for settings in [{}, {'local_values': True}]:
+        settings['alph1'] = 3
+        cmi_est = PythonDiscreteCMI(settings)
+        assert cmi_est.is_parallel(), 'Discrete CMI should be parallel.'
+        for c in [cond, None]:
+            cmi_chunks = cmi_est.estimate_parallel(
+                n_chunks=n_chunks, re_use=['var2', 'conditional'],
+                var1=var1, var2=var2, conditional=c)
+            cmi_single = np.hstack([
+                cmi_est.estimate(var1[i * n:(i + 1) * n], var2, c)
+                for i in range(n_chunks)])
+            assert np.allclose(cmi_chunks, cmi_single), (
+                'Parallel CMI estimates differ from single estimates.')
+    assert np.argmax(PythonDiscreteCMI({'alph1': 3}).estimate_parallel(
+        n_chunks=n_chunks, re_use=['var2', 'conditional'], var1=var1,
+        var2=var2, conditional=cond)) == 0, 'Wrong chunk has maximum CMI.'
+
+    source = np.random.randint(0, 2, n * n_chunks)
+    target = np.roll(source, 1)
+    te_est = PythonDiscreteTE({'history_target': 2})
+    te_chunks = te_est.estimate(source, target, n_chunks=n_chunks)
+    te_single = np.hstack([
+        te_est.estimate(source[i * n:(i + 1) * n], target[i * n:(i + 1) * n])
+        for i in range(n_chunks)])
+    assert np.allclose(te_chunks, te_single), (
+        'Parallel TE estimates differ from single estimates.')
+    ais_est = PythonDiscreteAIS({'history': 3})
+    ais_chunks = ais_est.estimate(source, n_chunks=n_chunks)
+    ais_single = np.hstack([ais_est.estimate(source[i * n:(i + 1) * n])
+                            for i in range(n_chunks)])
+    assert np.allclose(ais_chunks, ais_single), (
+        'Parallel AIS estimates differ from single estimates.')
+
+
+def test_discrete_analytic_surrogates():
+    """Test analytic surrogate distributions of discrete estimators."""
+    np.random.seed(7)
+    n = 2000
+    n_perm = 500
+    var1 = np.random.randint(0, 2, (n, 1))
+    var2 = np.random.randint(0, 2, (n, 1))
+    cond = np.random.randint(0, 2, (n, 1))
+    cmi_est = PythonDiscreteCMI()
+    assert cmi_est.is_analytic_null_estimator(), (
+        'Discrete CMI should provide analytic surrogates.')
+    surr = cmi_est.estimate_surrogates_analytic(
+        n_perm=n_perm, var1=var1, var2=var2, conditional=cond)
+    assert surr.shape == (n_perm,), 'Wrong number of surrogates.'
+    assert (surr >= 0).all(), 'Negative surrogate estimates.'
+    # Compare analytic surrogates with surrogates from permuted data.
+    surr_perm = cmi_est.estimate_parallel(
+        n_chunks=n_perm, re_use=['var2', 'conditional'],
+        var1=np.vstack([np.random.permutation(var1) for p in range(n_perm)]),
+        var2=var2, conditional=cond)
+    _assert_result(np.mean(surr), np.mean(surr_perm), 'Python discrete',
+                   'mean analytic surrogate', tol=0.0005)
+    # Degrees of freedom of the chi-square distribution: (2-1)*(2-1)*2.
+    dist = cmi_est.get_analytic_distribution(var1, var2, cond)
+    assert dist.degrees_of_freedom == 2, 'Wrong degrees of freedom.'
+    assert np.isclose(dist.estimate_for_pvalue(0.5), 2 * np.log(2) / (
+        2 * n * np.log(2)), rtol=0.1), 'Wrong median of the null distribution.'
+
+    te_est = PythonDiscreteTE({'history_target': 2})
+    surr = te_est.estimate_surrogates_analytic(
+        n_perm=n_perm, source=var1, target=var2)
+    assert surr.shape == (n_perm,), 'Wrong number of TE surrogates.'
+    ais_est = PythonDiscreteAIS({'history': 2})
+    surr = ais_est.estimate_surrogates_analytic(n_perm=n_perm, process=var1)
+    assert surr.shape == (n_perm,), 'Wrong number of AIS surrogates.'
+
+
+@jpype_missing
+def test_compare_jidt():
+    """Compare estimates against JIDT Kraskov estimators."""
+    from idtxl.estimators_jidt import JidtKraskovMI, JidtKraskovCMI
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=2000)
+    settings = {'noise_level': 0}
+    mi_py = PythonKraskovMI(settings).estimate(source, target)
+    mi_jidt = JidtKraskovMI(settings).estimate(source, target)
+    assert np.isclose(mi_py, mi_jidt, atol=1e-6), (
+        'MI differs from JIDT estimate ({0:.6f} vs. {1:.6f}).'.format(
+            mi_py, mi_jidt))
+    cmi_py = PythonKraskovCMI(settings).estimate(source, target,
+                                                 source_uncorr)
+    cmi_jidt = JidtKraskovCMI(settings).estimate(source, target,
+                                                 source_uncorr)
+    assert np.isclose(cmi_py, cmi_jidt, atol=1e-6), (
+        'CMI differs from JIDT estimate ({0:.6f} vs. {1:.6f}).'.format(
+            cmi_py, cmi_jidt))
+    from idtxl.estimators_jidt import JidtGaussianCMI
+    cmi_py = PythonGaussianCMI().estimate(source, target, source_uncorr)
+    cmi_jidt = JidtGaussianCMI().estimate(source, target, source_uncorr)
+    assert np.isclose(cmi_py[0], cmi_jidt, atol=1e-6), (
+        'Gaussian CMI differs from JIDT estimate ({0:.6f} vs. '
+        '{1:.6f}).'.format(cmi_py[0], cmi_jidt))
+
+    from idtxl.estimators_jidt import JidtDiscreteCMI, JidtDiscreteTE
+    source, target = _get_discrete_data()
+    cond = np.random.randint(0, 2, source.shape[0])
+    settings = {'local_values': True}
+    cmi_py = PythonDiscreteCMI(settings).estimate(source, target, cond)
+    cmi_jidt = JidtDiscreteCMI(settings).estimate(source, target, cond)
+    assert np.allclose(cmi_py, cmi_jidt), (
+        'Local discrete CMI differs from JIDT estimate.')
+    settings = {'history_target': 2, 'local_values': True}
+    te_py = PythonDiscreteTE(settings).estimate(source, target)
+    te_jidt = JidtDiscreteTE(settings).estimate(source, target)
+    assert np.allclose(te_py, te_jidt), (
+        'Local discrete TE differs from JIDT estimate.')
+
+
+if __name__ == '__main__':
+    test_compare_jidt()
+    test_discrete_analytic_surrogates()
+    test_discrete_estimate_parallel()
+    test_discrete_ais_te()
+    test_discrete_mi_cmi()
+    test_gaussian_lagged_mi()
+    test_gaussian_local_values()
+    test_gaussian_estimate_parallel()
+    test_gaussian_correlated_gaussians()
+    test_estimate_parallel()
+    test_find_estimator()
+    test_lagged_mi()
+    test_local_values()
+    test_neighbour_search_backends()
+    test_compare_brute_force()
+    test_cmi_correlated_gaussians()
+    test_mi_correlated_gaussians()
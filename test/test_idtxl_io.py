@@ -1,6 +1,8 @@
 """Unit tests for IDTxl I/O functions."""
 import os
 import pickle
+import tempfile
+import h5py
 import pytest
 import numpy as np
 from pkg_resources import resource_filename
@@ -148,6 +150,111 @@ def test_import_fieldtrip():
     print(timestamps)  # TODO add assertion for this
 
 
+def _write_fieldtrip_file(file_name, trial_data, labels, fsample):
+    """Write a FieldTrip structure to a MATLAB v7.3 (hdf5) file.
+
+    trial_data has dimensions (samples, channels, trials), datasets are stored
+    transposed compared to MATLAB, as done by MATLAB when saving hdf5 files.
+    """
+    n_samples, n_channels, n_trials = trial_data.shape
+    with h5py.File(file_name, 'w') as f:
+        refs = f.create_group('#refs#')
+        ref_dtype = h5py.special_dtype(ref=h5py.Reference)
+        ft_struct = f.create_group('data')
+        trial = ft_struct.create_dataset('trial', (n_trials, 1),
+                                         dtype=ref_dtype)
+        time = ft_struct.create_dataset('time', (n_trials, 1),
+                                        dtype=ref_dtype)
+        for t in range(n_trials):
+            trial[t, 0] = refs.create_dataset(
+                'trial_{0}'.format(t), data=trial_data[:, :, t]).ref
+            time[t, 0] = refs.create_dataset(
+                'time_{0}'.format(t),
+                data=np.arange(n_samples)[:, np.newaxis] / fsample).ref
+        label = ft_struct.create_dataset('label', (n_channels, 1),
+                                         dtype=ref_dtype)
+        for c, l in enumerate(labels):
+            label[c, 0] = refs.create_dataset(
+                'label_{0}'.format(c),
+                data=np.array([ord(s) for s in l], dtype=np.uint16)).ref
+        ft_struct.create_dataset('fsample', data=np.array([[fsample]]))
+
+
+def _get_all_realisations(data):
+    """Return all samples of all processes as realisations."""
+    return data.get_realisations(
+        (0, 0), [(p, 0) for p in range(data.n_processes)])[0]
+
+
+def test_import_fieldtrip_subset():
+    """Test import of a subset of FieldTrip data and lazy import."""
+    n_samples = 50
+    n_channels = 4
+    n_trials = 6
+    fsample = 100
+    trial_data = np.random.rand(n_samples, n_channels, n_trials)
+    labels = ['chan_{0}'.format(c) for c in range(n_channels)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, 'ft_data.mat')
+        _write_fieldtrip_file(file_name, trial_data, labels, fsample)
+
+        data, label, timestamps, fs = io.import_fieldtrip(
+            file_name, 'data', 'v7.3', normalise=False)
+        assert np.array_equal(data.data,
+                              np.transpose(trial_data, (1, 0, 2))), (
+            'Full import returned wrong data.')
+        assert label == labels, 'Wrong labels: {0}.'.format(label)
+        assert timestamps.shape == (n_samples, 1, n_trials), (
+            'Wrong shape of time stamps: {0}.'.format(timestamps.shape))
+        assert fs == fsample, 'Wrong sampling frequency: {0}.'.format(fs)
+
+        # Import subset, select channels by label and index.
+        channels = ['chan_3', 1]
+        trials = [4, 0, 2]
+        samples = (10, 40)
+        expected = trial_data[10:40][:, [3, 1]][:, :, trials]
+        data, label, timestamps, fs = io.import_fieldtrip(
+            file_name, 'data', 'v7.3', normalise=False, channels=channels,
+            trials=trials, samples=samples)
+        assert np.array_equal(data.data, np.transpose(expected, (1, 0, 2))), (
+            'Subset import returned wrong data.')
+        assert label == ['chan_3', 'chan_1'], (
+            'Wrong labels: {0}.'.format(label))
+        assert np.allclose(timestamps[:, 0, :],
+                           np.arange(10, 40)[:, np.newaxis] / fsample), (
+            'Wrong time stamps for subset.')
+
+        # Lazy import returns the same realisations as reading into memory.
+        for normalise in [False, True]:
+            data = io.import_fieldtrip(
+                file_name, 'data', 'v7.3', normalise=normalise,
+                channels=channels, trials=trials, samples=samples)[0]
+            data_lazy = io.import_fieldtrip(
+                file_name, 'data', 'v7.3', normalise=normalise,
+                channels=channels, trials=trials, samples=samples,
+                lazy=True)[0]
+            assert isinstance(data_lazy.data.dataset, io.FieldTripTrials), (
+                'Lazy import read data into memory.')
+            assert np.allclose(_get_all_realisations(data),
+                               _get_all_realisations(data_lazy)), (
+                'Lazy import returned wrong realisations.')
+            data_pickled = pickle.loads(pickle.dumps(data_lazy))
+            assert np.array_equal(_get_all_realisations(data_lazy),
+                                  _get_all_realisations(data_pickled)), (
+                'Pickled lazy import returned wrong realisations.')
+            data_lazy.data.dataset.close()
+            data_pickled.data.dataset.close()
+
+        with pytest.raises(RuntimeError):
+            io.import_fieldtrip(file_name, 'data', 'v7.3',
+                                channels=['chan_9'])
+        with pytest.raises(RuntimeError):
+            io.import_fieldtrip(file_name, 'data', 'v7.3', trials=[n_trials])
+        with pytest.raises(RuntimeError):
+            io.import_fieldtrip(file_name, 'data', 'v7.3',
+                                samples=(0, n_samples + 1))
+
+
 def test_import_matarray():
     """Test MATLAB importer."""
     n_samples = 20  # no. samples in the example data
@@ -194,6 +301,37 @@ def test_import_matarray():
     assert data.n_replications == n_replications, (
             'Wrong number of replications: {0}.'.format(data.n_replications))
 
+    # Lazy import of hdf5 files.
+    data = io.import_matarray(
+            file_name=resource_filename(__name__, 'data/three_dim_v7_3.mat'),
+            array_name='c',
+            dim_order='rsp',
+            file_version='v7.3',
+            normalise=False)
+    data_lazy = io.import_matarray(
+            file_name=resource_filename(__name__, 'data/three_dim_v7_3.mat'),
+            array_name='c',
+            dim_order='rsp',
+            file_version='v7.3',
+            normalise=False,
+            lazy=True)
+    assert not isinstance(data_lazy.data, np.ndarray), (
+        'Lazy import read data into memory.')
+    assert np.array_equal(_get_all_realisations(data),
+                          _get_all_realisations(data_lazy)), (
+        'Lazy import returned wrong realisations.')
+    assert np.array_equal(
+        _get_all_realisations(data),
+        _get_all_realisations(pickle.loads(pickle.dumps(data_lazy)))), (
+            'Pickled lazy import returned wrong realisations.')
+    with pytest.raises(RuntimeError):
+        io.import_matarray(
+            file_name=resource_filename(__name__, 'data/two_dim_v7.mat'),
+            array_name='b',
+            dim_order='sp',
+            file_version='v7',
+            lazy=True)
+
     # Load matlab versions 4, 6, 7.
     file_path = [
         resource_filename(__name__, 'data/two_dim_v4.mat'),
@@ -254,3 +392,4 @@ if __name__ == '__main__':
     test_export_networkx()
     test_import_matarray()
     test_import_fieldtrip()
+    test_import_fieldtrip_subset()
@@ -1,6 +1,8 @@
 """Unit tests for IDTxl utilities module."""
 import numpy as np
 from idtxl import idtxl_utils as utils
+from idtxl.data import Data
+from idtxl.estimators_python import PythonKraskovCMI, PythonDiscreteCMI
 
 
 def test_swap_chars():
@@ -98,7 +100,77 @@ def check_all_bools_true_2d(bool_array):
     return True
 
 
+def test_check_precision():
+    """Test check of data precision against estimator precision."""
+    raw = np.random.randn(2, 50)
+    est = PythonKraskovCMI()
+    assert est.preferred_dtype() == np.float64, 'Wrong preferred dtype.'
+    assert utils.check_precision(est, Data(raw, 'ps')), (
+        'Precision mismatch for float64 data.')
+    assert not utils.check_precision(est, Data(raw, 'ps', dtype=np.float32)), (
+        'No precision mismatch for float32 data.')
+    # Estimators without preference and discrete data are accepted.
+    est = PythonDiscreteCMI()
+    assert est.preferred_dtype() is None, 'Wrong preferred dtype.'
+    assert utils.check_precision(est, Data(raw, 'ps', dtype=np.float32))
+    est = PythonKraskovCMI()
+    assert utils.check_precision(
+        est, Data(np.random.randint(0, 3, size=(2, 50)), 'ps',
+                  normalise=False))
+
+
+def test_seed_sequence():
+    """Test creation of random streams from a seed."""
+    assert utils.seed_sequence(None, 1) is None, 'Expected None for no seed.'
+    assert utils.spawn_rng(None) is None, 'Expected None for no seed.'
+    assert utils.spawn_rng(None, default=np.random) is np.random, (
+        'Expected default for no seed.')
+
+    def _draw(seed_seq):
+        return utils.spawn_rng(seed_seq).random(5)
+
+    # Streams depend only on the seed and keys.
+    assert np.array_equal(_draw(utils.seed_sequence(1, 3)),
+                          _draw(utils.seed_sequence(1, 3))), (
+        'Streams differ for identical seeds and keys.')
+    assert not np.array_equal(_draw(utils.seed_sequence(1, 3)),
+                              _draw(utils.seed_sequence(1, 4))), (
+        'Streams are identical for different keys.')
+    assert not np.array_equal(_draw(utils.seed_sequence(1, 3)),
+                              _draw(utils.seed_sequence(2, 3))), (
+        'Streams are identical for different seeds.')
+    # Keys select the children spawned from a SeedSequence.
+    root = np.random.SeedSequence(5)
+    children = root.spawn(3)
+    assert np.array_equal(
+        _draw(utils.seed_sequence(root, 2)),
+        np.random.default_rng(children[2].spawn(1)[0]).random(5)), (
+            'Keys do not select spawned children.')
+    # Consecutive generators draw from different streams.
+    seed_seq = utils.seed_sequence(1, 3)
+    assert not np.array_equal(_draw(seed_seq), _draw(seed_seq)), (
+        'Consecutive streams are identical.')
+
+    # Draw random integers from the global random state or a generator.
+    np.random.seed(0)
+    a = utils.random_integers(None, 1, 5, size=100)
+    np.random.seed(0)
+    assert np.array_equal(a, np.random.randint(1, 5, size=100)), (
+        'Integers not drawn from the global random state.')
+    np.random.seed(0)
+    assert np.array_equal(utils.random_integers(np.random, 1, 5, size=100),
+                          a), (
+        'Integers not drawn from the global random state.')
+    a = utils.random_integers(np.random.default_rng(0), 1, 5, size=100)
+    assert np.array_equal(
+        a, np.random.default_rng(0).integers(1, 5, size=100)), (
+            'Integers not drawn from the generator.')
+    assert a.min() >= 1 and a.max() < 5, 'Integers out of range.'
+
+
 if __name__ == '__main__':
+    test_seed_sequence()
+    test_check_precision()
     test_swap_chars()
     test_combine_discrete_dimensions()
     test_discretise()
@@ -1,6 +1,9 @@
 """Provide unit tests for multivariate TE estimation."""
+import os
+import tempfile
 import pytest
 import itertools as it
+import h5py
 import numpy as np
 from idtxl.multivariate_te import MultivariateTE
 from idtxl.data import Data
@@ -391,6 +394,206 @@ def test_permute_time():
         'Perm type was not set to default.')
 
 
+@jpype_missing
+def test_seed():
+    """Test reproducible surrogate creation from a seed."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 3,
+        'min_lag_sources': 1,
+        'max_lag_target': 3,
+        'seed': 12345}
+    nw = MultivariateTE()
+    results_network = nw.analyse_network(settings, data, targets=[0, 1, 3])
+    # Surrogates for a target do not depend on the other targets analysed or
+    # on the order of analysis. Changing the global random state has no
+    # effect.
+    np.random.seed(0)
+    results_single = nw.analyse_single_target(settings, data, target=1)
+    np.random.seed(1)
+    results_reverse = nw.analyse_network(settings, data, targets=[3, 1])
+    keys = ['selected_vars_sources', 'selected_sources_pval', 'omnibus_pval']
+    for res in [results_single, results_reverse]:
+        for k in keys:
+            assert np.array_equal(
+                res.get_single_target(1, fdr=False)[k],
+                results_network.get_single_target(1, fdr=False)[k]), (
+                    'Results for {0} differ between seeded runs.'.format(k))
+    assert results_single.settings['seed'] == 12345, 'Seed not in settings.'
+
+
+@jpype_missing
+def test_analyse_network_parallel():
+    """Test parallel analysis of targets in worker processes."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 3,
+        'min_lag_sources': 1,
+        'max_lag_target': 3,
+        'seed': 12345,
+        'verbose': False}
+    nw = MultivariateTE()
+    results_serial = nw.analyse_network(settings, data, targets=[0, 1, 3])
+    settings['n_workers'] = 2
+    results_parallel = nw.analyse_network(settings, data, targets=[0, 1, 3])
+    assert results_parallel.targets_analysed == [0, 1, 3], (
+        'Parallel analysis did not run on all targets.')
+    # Workers share the available CPUs, the user's settings are not changed.
+    assert results_parallel.settings['num_threads'] == max(
+        1, os.cpu_count() // 2), 'Wrong no. threads in worker processes.'
+    assert 'num_threads' not in settings, 'Settings were modified.'
+    # Seeded analyses return the same results independent of the process
+    # a target is analysed in.
+    keys = ['selected_vars_sources', 'selected_sources_pval', 'omnibus_pval']
+    for t in [0, 1, 3]:
+        for k in keys:
+            assert np.array_equal(
+                results_serial.get_single_target(t, fdr=False)[k],
+                results_parallel.get_single_target(t, fdr=False)[k]), (
+                    'Parallel results for {0} differ for target {1}.'.format(
+                        k, t))
+    assert np.array_equal(
+        results_serial.get_adjacency_matrix('binary', fdr=False),
+        results_parallel.get_adjacency_matrix('binary', fdr=False)), (
+        'Adjacency matrix differs between serial and parallel analysis.')
+
+    # Data in HDF5 files are reopened by workers.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        h5_file = os.path.join(tmp_dir, 'data.h5')
+        with h5py.File(h5_file, 'w') as f:
+            f['data'] = data.data
+        with h5py.File(h5_file, 'r') as f:
+            data_h5 = Data(f['data'], dim_order='psr', normalise=False)
+            results_h5 = nw.analyse_network(settings, data_h5,
+                                             targets=[0, 1, 3])
+    for t in [0, 1, 3]:
+        for k in keys:
+            assert np.array_equal(
+                results_serial.get_single_target(t, fdr=False)[k],
+                results_h5.get_single_target(t, fdr=False)[k]), (
+                    'Results for HDF5 data for {0} differ for target '
+                    '{1}.'.format(k, t))
+    with pytest.raises(RuntimeError):
+        settings['n_workers'] = 0
+        nw.analyse_network(settings, data, targets=[0, 1])
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class _InterruptedMultivariateTE(MultivariateTE):
+    """Interrupt the analysis after a number of saved selection states."""
+
+    n_saves = 1
+
+    def _save_state(self, stage):
+        super()._save_state(stage)
+        _InterruptedMultivariateTE.n_saves -= 1
+        if _InterruptedMultivariateTE.n_saves == 0:
+            raise _Interrupted()
+
+
+@jpype_missing
+def test_checkpoint_resume():
+    """Test resuming an interrupted analysis from checkpoints."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 3,
+        'min_lag_sources': 1,
+        'max_lag_target': 3,
+        'seed': 12345,
+        'verbose': False}
+    targets = [0, 1, 3]
+    results_ref = MultivariateTE().analyse_network(
+        settings.copy(), data, targets=targets)
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        settings['checkpoint_dir'] = checkpoint_dir
+        # Finish the first target, then interrupt the second target after its
+        # first saved state and again after two further saved states.
+        MultivariateTE().analyse_network(settings.copy(), data, targets=[0])
+        result_file = os.path.join(checkpoint_dir, 'result_0.p')
+        mtime = os.path.getmtime(result_file)
+        settings['resume'] = True
+        for n_saves in [1, 2]:
+            _InterruptedMultivariateTE.n_saves = n_saves
+            with pytest.raises(_Interrupted):
+                _InterruptedMultivariateTE().analyse_network(
+                    settings.copy(), data, targets=targets)
+            assert os.path.isfile(os.path.join(
+                checkpoint_dir, 'state_1.p')), 'No selection state was saved.'
+        results = MultivariateTE().analyse_network(
+            settings.copy(), data, targets=targets)
+        assert os.path.getmtime(result_file) == mtime, (
+            'Finished target was analysed again.')
+        for t in targets:
+            assert os.path.isfile(os.path.join(
+                checkpoint_dir, 'result_{0}.p'.format(t))), (
+                    'No result saved for target {0}.'.format(t))
+            assert not os.path.isfile(os.path.join(
+                checkpoint_dir, 'state_{0}.p'.format(t))), (
+                    'Selection state not removed for target {0}.'.format(t))
+
+        # Resuming with different analysis settings is not possible.
+        with pytest.raises(RuntimeError):
+            settings['n_perm_max_stat'] = 30
+            MultivariateTE().analyse_network(
+                settings.copy(), data, targets=targets)
+
+    # Checkpoints of analyses seeded with a SeedSequence are resumed if the
+    # seed defines the same random streams.
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        settings['n_perm_max_stat'] = 21
+        settings['checkpoint_dir'] = checkpoint_dir
+        settings['resume'] = False
+        settings['seed'] = np.random.SeedSequence(5)
+        MultivariateTE().analyse_network(settings.copy(), data, targets=[0])
+        result_file = os.path.join(checkpoint_dir, 'result_0.p')
+        mtime = os.path.getmtime(result_file)
+        settings['resume'] = True
+        settings['seed'] = np.random.SeedSequence(5)
+        MultivariateTE().analyse_network(settings.copy(), data, targets=[0])
+        assert os.path.getmtime(result_file) == mtime, (
+            'Checkpoint seeded with a SeedSequence was not resumed.')
+        with pytest.raises(RuntimeError):
+            settings['seed'] = np.random.SeedSequence(6)
+            MultivariateTE().analyse_network(
+                settings.copy(), data, targets=[0])
+
+    # Seeded resumed analyses return the same results as an uninterrupted
+    # analysis.
+    assert results.targets_analysed == targets, (
+        'Resumed analysis did not run on all targets.')
+    keys = ['selected_vars_target', 'selected_vars_sources',
+            'selected_sources_pval', 'omnibus_pval']
+    for t in targets:
+        for k in keys:
+            assert np.array_equal(
+                results_ref.get_single_target(t, fdr=False)[k],
+                results.get_single_target(t, fdr=False)[k]), (
+                    'Resumed results for {0} differ for target {1}.'.format(
+                        k, t))
+
+
 def test_discrete_input():
     """Test multivariate TE estimation from discrete data."""
     # Generate Gaussian test data
@@ -459,6 +662,9 @@ if __name__ == '__main__':
     test_return_local_values()
     test_discrete_input()
     test_analyse_network()
+    test_seed()
+    test_analyse_network_parallel()
+    test_checkpoint_resume()
     test_check_source_set()
     test_multivariate_te_init()  # test init function of the Class
     test_multivariate_te_one_realisation_per_replication()
@@ -0,0 +1,87 @@
+"""Test neighbour search backends.
+
+This module provides unit tests for the neighbour searches used by the Python
+Kraskov estimators.
+"""
+import pytest
+import numpy as np
+from idtxl.neighbour_search import (KDTreeSearch, GridSearch,
+                                    BruteForceSearch, get_neighbour_search,
+                                    select_backend)
+
+
+def _get_data(n, dim, seed=0):
+    np.random.seed(seed)
+    return np.random.randn(n, dim)
+
+
+def test_compare_backends():
+    """Compare results of all backends against the brute force search."""
+    k = 5
+    for n, dim in [(300, 1), (1000, 1), (1000, 2), (1000, 4)]:
+        pointset = _get_data(n, dim)
+        ref = BruteForceSearch(pointset)
+        dist_ref, idx_ref = ref.knn(k)
+        radius = dist_ref[:, -1]
+        count_ref = ref.count_within(radius)
+        for search in [KDTreeSearch(pointset), GridSearch(pointset),
+                       GridSearch(pointset, n_grid_dims=1, box_occupancy=4)]:
+            dist, idx = search.knn(k)
+            assert np.array_equal(dist, dist_ref), (
+                'KNN distances of {0} differ from brute force search (n: {1}, '
+                'dim: {2}).'.format(type(search).__name__, n, dim))
+            assert np.array_equal(idx, idx_ref), (
+                'KNN indices of {0} differ from brute force search (n: {1}, '
+                'dim: {2}).'.format(type(search).__name__, n, dim))
+            count = search.count_within(radius)
+            assert np.array_equal(count, count_ref), (
+                'Range counts of {0} differ from brute force search (n: {1}, '
+                'dim: {2}).'.format(type(search).__name__, n, dim))
+            # Points at exactly the radius are counted, use next smaller float
+            # to exclude them.
+            count = search.count_within(np.nextafter(radius, 0))
+            assert np.array_equal(count, count_ref - 1), (
+                'Points at the search radius were counted by {0}.'.format(
+                    type(search).__name__))
+
+
+def test_discrete_values():
+    """Test searches on data with many identical points."""
+    np.random.seed(0)
+    pointset = np.random.randint(0, 3, size=(500, 2)).astype(float)
+    radius = np.random.choice([0, 0.5, 1, 2], size=500)
+    count_ref = BruteForceSearch(pointset).count_within(radius)
+    for search in [KDTreeSearch(pointset), GridSearch(pointset)]:
+        assert np.array_equal(search.count_within(radius), count_ref), (
+            'Range counts of {0} differ from brute force search.'.format(
+                type(search).__name__))
+        dist = search.knn(10)[0]
+        dist_ref = BruteForceSearch(pointset).knn(10)[0]
+        assert np.array_equal(dist, dist_ref), (
+            'KNN distances of {0} differ from brute force search.'.format(
+                type(search).__name__))
+
+
+def test_backend_selection():
+    """Test automatic and manual selection of search backends."""
+    assert select_backend(100, 3) == 'brute_force', (
+        'Brute force not selected for small point set.')
+    assert select_backend(10000, 1) == 'grid', (
+        'Grid search not selected for 1D point set.')
+    assert select_backend(10000, 3) == 'kdtree', (
+        'KD-tree not selected for 3D point set.')
+    pointset = _get_data(1000, 1)
+    assert isinstance(get_neighbour_search(pointset), GridSearch), (
+        'Wrong automatic backend.')
+    assert isinstance(get_neighbour_search(pointset, 'kdtree'),
+                      KDTreeSearch), 'Wrong backend.'
+    assert isinstance(get_neighbour_search(pointset[:, 0], 'brute_force'),
+                      BruteForceSearch), 'Wrong backend for 1D array.'
+    with pytest.raises(RuntimeError):
+        get_neighbour_search(pointset, 'octree')
+
+
+if __name__ == '__main__':
+    test_backend_selection()
+    test_discrete_values()
+    test_compare_backends()
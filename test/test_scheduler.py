@@ -0,0 +1,115 @@
+"""Unit tests for distributing network analyses via a file-based queue."""
+import os
+import pickle
+import tempfile
+import pytest
+import numpy as np
+from idtxl.data import Data
+from idtxl.multivariate_te import MultivariateTE
+from idtxl.active_information_storage import ActiveInformationStorage
+from idtxl.scheduler import (submit_network, run_worker, requeue_tasks,
+                             collect_results)
+from test_estimators_jidt import jpype_missing
+
+SETTINGS = {
+    'cmi_estimator': 'JidtGaussianCMI',
+    'n_perm_max_stat': 21,
+    'n_perm_min_stat': 21,
+    'n_perm_max_seq': 21,
+    'n_perm_omnibus': 21,
+    'max_lag_sources': 3,
+    'min_lag_sources': 1,
+    'max_lag_target': 3,
+    'seed': 12345,
+    'verbose': False}
+
+
+@jpype_missing
+def test_network_inference_queue():
+    """Test analysis of network inference tasks from a queue."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    targets = [0, 1, 3]
+    results_ref = MultivariateTE().analyse_network(
+        SETTINGS.copy(), data, targets=targets)
+
+    with tempfile.TemporaryDirectory() as queue_dir:
+        assert submit_network(queue_dir, MultivariateTE, SETTINGS, data,
+                              targets=targets) == targets, (
+            'Wrong targets submitted.')
+        assert len(os.listdir(os.path.join(queue_dir, 'tasks'))) == 3, (
+            'Wrong number of tasks in queue.')
+        with pytest.raises(RuntimeError):  # queue already holds a job
+            submit_network(queue_dir, MultivariateTE, SETTINGS, data)
+        with pytest.raises(RuntimeError):  # tasks are not finished
+            collect_results(queue_dir)
+
+        assert run_worker(queue_dir, max_tasks=1) == 1, (
+            'Worker did not stop after max. no. tasks.')
+        assert run_worker(queue_dir) == 2, 'Worker did not analyse all tasks.'
+        assert run_worker(queue_dir) == 0, 'Worker analysed finished tasks.'
+        for d in ['tasks', 'claimed', 'failed']:
+            assert not os.listdir(os.path.join(queue_dir, d)), (
+                'Queue directory {0} is not empty.'.format(d))
+        results = collect_results(queue_dir)
+
+    # Seeded analyses from the queue return the same results as analyses in
+    # a single process.
+    assert results.targets_analysed == targets, (
+        'Collected results do not contain all targets.')
+    keys = ['selected_vars_target', 'selected_vars_sources',
+            'selected_sources_pval', 'omnibus_pval']
+    for t in targets:
+        for k in keys:
+            assert np.array_equal(
+                results_ref.get_single_target(t, fdr=False)[k],
+                results.get_single_target(t, fdr=False)[k]), (
+                    'Results for {0} differ for target {1}.'.format(k, t))
+
+
+@jpype_missing
+def test_ais_queue():
+    """Test analysis of AIS tasks from a queue and requeuing of tasks."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_mi': 21,
+        'max_lag': 3,
+        'tau': 1,
+        'verbose': False}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Store the data on disk and pass a reference to the data file.
+        data_file = os.path.join(tmp_dir, 'data.p')
+        with open(data_file, 'wb') as f:
+            pickle.dump(data, f)
+        queue_dir = os.path.join(tmp_dir, 'queue')
+        submit_network(queue_dir, ActiveInformationStorage, settings,
+                       data_file, targets=[1, 2])
+        assert not os.path.isfile(os.path.join(queue_dir, 'data.p')), (
+            'Data were copied to the queue.')
+        assert run_worker(queue_dir) == 2, 'Worker did not analyse all tasks.'
+        results = collect_results(queue_dir)
+        assert results.processes_analysed == [1, 2], (
+            'Collected results do not contain all processes.')
+
+        # Failing tasks are moved to the 'failed' directory and can be
+        # requeued.
+        queue_dir = os.path.join(tmp_dir, 'queue_fail')
+        settings['tau'] = 5  # tau larger than max_lag raises an error
+        submit_network(queue_dir, ActiveInformationStorage, settings,
+                       data, targets=[1, 2])
+        assert run_worker(queue_dir) == 0, 'Failing tasks were not detected.'
+        failed = os.listdir(os.path.join(queue_dir, 'failed'))
+        assert len(failed) == 4, 'Failed tasks or logs are missing.'
+        assert requeue_tasks(queue_dir) == 2, 'Wrong no. requeued tasks.'
+        assert sorted(os.listdir(os.path.join(queue_dir, 'tasks'))) == [
+            'task_1.p', 'task_2.p'], 'Tasks were not requeued.'
+
+
+if __name__ == '__main__':
+    test_network_inference_queue()
+    test_ais_queue()
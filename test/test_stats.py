@@ -293,6 +293,192 @@ def test_data_type():
     assert issubclass(type(surr[0, 0, 0]), np.float), ('Realisations type is '
                                                        'not a float.')
 
+    # Test single precision data.
+    data = Data(d_float, dim_order='ps', dtype=np.float32)
+    assert data.data_type is np.float32, 'Data type is not float32.'
+    for perm_type in ['random', 'circular']:
+        settings = {'permute_in_time': True, 'perm_type': perm_type,
+                    'max_shift': 10}
+        surr = stats._get_surrogates(data=data,
+                                     current_value=(0, 5),
+                                     idx_list=[(1, 3), (2, 4)],
+                                     n_perm=20,
+                                     perm_settings=settings)
+        assert surr.dtype == np.float32, (
+            'Surrogates type is not float32 for permutation {0}.'.format(
+                perm_type))
+    data_repl = Data(np.random.randn(3, 20, 10), dim_order='psr',
+                     dtype=np.float32)
+    surr = stats._get_surrogates(data=data_repl,
+                                 current_value=(0, 5),
+                                 idx_list=[(1, 3), (2, 4)],
+                                 n_perm=20,
+                                 perm_settings={'permute_in_time': False})
+    assert surr.dtype == np.float32, (
+        'Surrogates type is not float32 for permuted replications.')
+
+
+def test_get_surrogates():
+    """Test batched surrogate creation against permuting data repeatedly."""
+    data = Data(np.random.randn(3, 30, 8), dim_order='psr')
+    current_value = (0, 5)
+    idx_list = [(1, 3), (2, 4), (0, 1)]
+    n_perm = 15
+    n_realisations = data.n_realisations(current_value)
+    settings_list = [
+        {'permute_in_time': False},
+        {'permute_in_time': True, 'perm_type': 'random'},
+        {'permute_in_time': True, 'perm_type': 'circular', 'max_shift': 10},
+        {'permute_in_time': True, 'perm_type': 'block', 'block_size': 3,
+         'perm_range': 4},
+        {'permute_in_time': True, 'perm_type': 'local', 'perm_range': 5}]
+    for settings in settings_list:
+        np.random.seed(42)
+        surr = stats._get_surrogates(data, current_value, idx_list, n_perm,
+                                     settings)
+        assert surr.shape == (n_realisations * n_perm, len(idx_list)), (
+            'Surrogates have wrong shape.')
+        # Create surrogates by permuting data once per permutation.
+        np.random.seed(42)
+        for perm in range(n_perm):
+            if settings['permute_in_time']:
+                expected = data.permute_samples(current_value, idx_list,
+                                                settings)[0]
+            else:
+                expected = data.permute_replications(current_value,
+                                                     idx_list)[0]
+            i_1 = perm * n_realisations
+            assert np.array_equal(
+                surr[i_1:i_1 + n_realisations], expected), (
+                    'Surrogates for permutation {0} ({1}) differ from '
+                    'permuted data.'.format(perm, settings))
+
+        # Surrogates created in chunks are identical to surrogates created in
+        # a single gather.
+        for chunk_size in [1, 4, n_perm]:
+            np.random.seed(42)
+            chunks = list(stats._iter_surrogates(
+                data, current_value, idx_list, n_perm, settings, chunk_size))
+            assert len(chunks) == np.ceil(n_perm / chunk_size), (
+                'Wrong number of chunks.')
+            assert np.array_equal(np.vstack(chunks), surr), (
+                'Surrogates created in chunks differ.')
+
+    # Test that permuting replications fails if there are too few
+    # replications.
+    data = Data(np.random.randn(3, 30, 3), dim_order='psr')
+    with pytest.raises(AssertionError):
+        stats._get_surrogates(data, current_value, idx_list, n_perm,
+                              {'permute_in_time': False})
+
+
+def test_seed():
+    """Test reproducible surrogate creation from a seed."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'max_lag_sources': 5,
+        'min_lag_sources': 1,
+        'max_lag_target': 5,
+        'permute_in_time': False,
+        'seed': 42}
+    candidates = [(0, 1), (0, 2), (1, 3)]
+
+    def _surrogate_table(settings, target):
+        setup = MultivariateTE()
+        setup._initialise(settings, data, sources=[0, 1], target=target)
+        setup.selected_vars_full = [(target, 4)]
+        setup._selected_vars_realisations = data.get_realisations(
+            setup.current_value, setup.selected_vars_full)[0]
+        # Draw two tables to test that streams are spawned in order.
+        return np.vstack([
+            stats._create_surrogate_table(setup, data, candidates, n_perm=21)
+            for i in range(2)])
+
+    np.random.seed(0)
+    table_1 = _surrogate_table(settings, target=2)
+    np.random.seed(1)
+    table_2 = _surrogate_table(settings, target=2)
+    assert np.array_equal(table_1, table_2), (
+        'Surrogate tables differ for identical seeds.')
+    assert not np.array_equal(table_1[:3], table_1[3:]), (
+        'Consecutive surrogate tables are identical.')
+    assert not np.array_equal(table_1, _surrogate_table(settings, target=3)), (
+        'Surrogate tables are identical for different targets.')
+    settings['seed'] = 43
+    assert not np.array_equal(table_1, _surrogate_table(settings, target=2)), (
+        'Surrogate tables are identical for different seeds.')
+
+    # Test seeding of surrogate creation for all permutation types.
+    idx_list = [(1, 3), (2, 4)]
+    for perm_settings in [
+            {'permute_in_time': False},
+            {'permute_in_time': True, 'perm_type': 'random'},
+            {'permute_in_time': True, 'perm_type': 'circular',
+             'max_shift': 10},
+            {'permute_in_time': True, 'perm_type': 'block', 'block_size': 3,
+             'perm_range': 4},
+            {'permute_in_time': True, 'perm_type': 'local', 'perm_range': 5}]:
+        surr = [stats._get_surrogates(data, (0, 5), idx_list, 21,
+                                      perm_settings,
+                                      np.random.default_rng(seed))
+                for seed in [1, 1, 2]]
+        assert np.array_equal(surr[0], surr[1]), (
+            'Surrogates differ for identical seeds ({0}).'.format(
+                perm_settings))
+        assert not np.array_equal(surr[0], surr[2]), (
+            'Surrogates are identical for different seeds ({0}).'.format(
+                perm_settings))
+
+
+def test_create_surrogate_table():
+    """Test batched estimation of surrogate tables."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'max_lag_sources': 5,
+        'min_lag_sources': 1,
+        'max_lag_target': 5,
+        'permute_in_time': False,
+        'seed': 42}
+    candidates = [(0, 1), (0, 2), (1, 3)]
+
+    def _setup(settings):
+        setup = MultivariateTE()
+        setup._initialise(settings, data, sources=[0, 1], target=2)
+        setup.selected_vars_full = [(2, 4)]
+        setup._selected_vars_realisations = data.get_realisations(
+            setup.current_value, setup.selected_vars_full)[0]
+        return setup
+
+    setup = _setup(settings)
+    table = stats._create_surrogate_table(setup, data, candidates, n_perm=21)
+    assert table.shape == (3, 21), 'Surrogate table has wrong dimensions.'
+
+    # Surrogates of all candidates are created from the same permutations.
+    setup = _setup(settings)
+    surr = stats._get_surrogates(data, setup.current_value, candidates, 21,
+                                 settings, stats._spawn_rng(setup))
+    for c in range(len(candidates)):
+        surr_cand = setup._cmi_estimator.estimate_parallel(
+            n_chunks=21,
+            re_use=['var2', 'conditional'],
+            var1=surr[:, c:c + 1],
+            var2=setup._current_value_realisations,
+            conditional=setup._selected_vars_realisations)
+        assert np.allclose(table[c, :], surr_cand), (
+            'Surrogates differ from estimation for individual candidates.')
+
+    # Splitting the batch to stay within the memory budget does not change
+    # the surrogate table.
+    for max_surrogate_bytes in [1, 2 * 3 * 500 * 8]:
+        settings['max_surrogate_bytes'] = max_surrogate_bytes
+        assert np.allclose(table, stats._create_surrogate_table(
+            _setup(settings), data, candidates, n_perm=21)), (
+                'Surrogate table changed when splitting the batch.')
+
 
 def test_analytical_surrogates():
     # Generate discrete test data.
@@ -327,10 +513,103 @@ def test_analytical_surrogates():
         'Surrogates were not created analytically.')
 
 
+def test_sequential_permutation_test():
+    """Test early stopping of permutation tests."""
+    setup = MultivariateTE()
+    setup.settings = {'verbose': False, 'perm_error_rate': 0.001}
+    alpha = 0.05
+    # The test is decided if the p-value's confidence interval excludes
+    # alpha, but never if 1 / no. surrogates is not smaller than alpha.
+    distribution = np.random.rand(200)
+    # Tests are stopped only if the lower bound of the p-value's confidence
+    # interval is not smaller than alpha, never if a test may be significant.
+    assert stats._is_non_significant(setup, -1, distribution[:50], alpha), (
+        'Clearly non-significant test is not stopped.')
+    assert stats._is_non_significant(setup, 0.5, distribution, alpha), (
+        'Clearly non-significant test is not stopped.')
+    assert not stats._is_non_significant(setup, 2, distribution, alpha), (
+        'Significant test is stopped.')
+    assert not stats._is_non_significant(
+        setup, np.percentile(distribution, 95), distribution, alpha), (
+            'Test is stopped for a p-value close to alpha.')
+
+    # Surrogates are created in blocks until the test is clearly
+    # non-significant, tests that may be significant use all permutations.
+    n_created = []
+
+    def create_surrogates(n):
+        n_created.append(n)
+        return np.random.rand(n)
+
+    setup.settings['sequential_perm'] = True
+    setup.settings['perm_block_size'] = 40
+    surr = stats._permutation_test(
+        setup, 'test', create_surrogates, 500,
+        lambda d: stats._is_non_significant(setup, -1, d, alpha))
+    assert n_created == [40], 'Non-significant test was not stopped.'
+    assert surr.shape[0] == 40, 'Wrong no. surrogates returned.'
+    assert setup._n_perm_achieved['test'] == 40, (
+        'Achieved no. permutations not recorded.')
+    n_created = []
+    surr = stats._permutation_test(
+        setup, 'test', create_surrogates, 500,
+        lambda d: stats._is_non_significant(setup, 2, d, alpha))
+    assert n_created == [40] * 12 + [20], 'Wrong no. surrogates per block.'
+    assert setup._n_perm_achieved['test'] == 500, (
+        'Significant test did not use all permutations.')
+    setup.settings['sequential_perm'] = False
+    n_created = []
+    stats._permutation_test(setup, 'test', create_surrogates, 500,
+                            lambda d: True)
+    assert n_created == [500], 'Non-sequential test did not create n_perm.'
+
+    # Achieved no. permutations are reported in the results and used to check
+    # the min. attainable p-value during FDR-correction.
+    data = Data()
+    data.generate_mute_data(500, 5)
+    settings = {
+        'cmi_estimator': 'JidtGaussianCMI',
+        'max_lag_sources': 3,
+        'min_lag_sources': 1,
+        'max_lag_target': 3,
+        'sequential_perm': True,
+        'perm_block_size': 50,
+        'seed': 12345,
+        'verbose': False}
+    res = MultivariateTE().analyse_single_target(settings, data, target=1)
+    n_perm = res.get_single_target(1, fdr=False)['omnibus_n_perm']
+    assert n_perm % 50 == 0 and n_perm <= 500, (
+        'Wrong no. permutations reported for omnibus test.')
+    res._single_target[1].omnibus_sign = True
+    res._single_target[1].omnibus_pval = 0.001
+    res._single_target[1].omnibus_n_perm = 2
+    res_fdr = stats.network_fdr({'alpha_fdr': 0.05}, res)
+    with pytest.raises(RuntimeError):
+        res_fdr.get_adjacency_matrix('binary', fdr=True)
+
+    # Significant targets use all permutations, such that early stopping does
+    # not prevent FDR-correction on the network level.
+    res = MultivariateTE().analyse_network(settings, data)
+    n_sign = 0
+    for t in res.targets_analysed:
+        res_target = res.get_single_target(t, fdr=False)
+        if res_target['omnibus_sign']:
+            n_sign += 1
+            assert res_target['omnibus_n_perm'] == 500, (
+                'Significant omnibus test stopped early.')
+    assert n_sign >= 4, 'Too few significant targets to test FDR-correction.'
+    adj_matrix = res.get_adjacency_matrix('binary', fdr=True)
+    assert adj_matrix.any(), 'No links after FDR-correction.'
+
+
 if __name__ == '__main__':
     test_ais_fdr()
     test_analytical_surrogates()
     test_data_type()
+    test_get_surrogates()
+    test_seed()
+    test_create_surrogate_table()
+    test_sequential_permutation_test()
     test_network_fdr()
     test_find_pvalue()
     test_find_table_max()